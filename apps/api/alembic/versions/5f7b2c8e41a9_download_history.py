@@ -0,0 +1,72 @@
+"""download history table
+
+Revision ID: 5f7b2c8e41a9  # pragma: allowlist secret
+Revises: 8c3e5a91d2f4  # pragma: allowlist secret
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5f7b2c8e41a9"  # pragma: allowlist secret
+down_revision = "8c3e5a91d2f4"  # pragma: allowlist secret
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows count as finished now, so the archive job waits a full
+    # DOWNLOAD_ARCHIVE_AFTER before moving them.
+    updated_at = sa.Column(
+        "updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()
+    )
+    if op.get_context().dialect.name == "sqlite":
+        # SQLite cannot ALTER in a column with a non-constant default, so the
+        # table is rebuilt there.
+        with op.batch_alter_table("downloads", recreate="always") as batch_op:
+            batch_op.add_column(updated_at)
+    else:
+        op.add_column("downloads", updated_at)
+    op.create_table(
+        "download_history",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("download_id", sa.Integer(), nullable=False),
+        sa.Column("hash", sa.String(length=64), nullable=True),
+        sa.Column("name", sa.String(length=512), nullable=True),
+        sa.Column("magnet", sa.Text(), nullable=False),
+        sa.Column("save_path", sa.String(length=1024), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("progress", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_download_history_download_id",
+        "download_history",
+        ["download_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_download_history_hash", "download_history", ["hash"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_download_history_hash", table_name="download_history")
+    op.drop_index("ix_download_history_download_id", table_name="download_history")
+    op.drop_table("download_history")
+    if op.get_context().dialect.name == "sqlite":
+        with op.batch_alter_table("downloads") as batch_op:
+            batch_op.drop_column("updated_at")
+    else:
+        op.drop_column("downloads", "updated_at")
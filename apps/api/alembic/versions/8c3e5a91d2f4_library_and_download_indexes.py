@@ -0,0 +1,76 @@
+"""library and active-download indexes
+
+Revision ID: 8c3e5a91d2f4  # pragma: allowlist secret
+Revises: 4d1c4bb7f0fe  # pragma: allowlist secret
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8c3e5a91d2f4"  # pragma: allowlist secret
+down_revision = "4d1c4bb7f0fe"  # pragma: allowlist secret
+branch_labels = None
+depends_on = None
+
+
+# Keep in sync with app.db.models.ACTIVE_DOWNLOAD_STATUSES.
+_ACTIVE_STATUSES = (
+    "queued",
+    "submitted",
+    "downloading",
+    "stalled",
+    "checking",
+    "metaDL",
+    "allocating",
+    "moving",
+    "uploading",
+    "stalledUP",
+    "pausedUP",
+    "forcedUP",
+)
+_ACTIVE_PREDICATE = "status IN ({})".format(
+    ", ".join(f"'{status}'" for status in _ACTIVE_STATUSES)
+)
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_downloads_active_status",
+        "downloads",
+        ["status"],
+        unique=False,
+        postgresql_where=sa.text(_ACTIVE_PREDICATE),
+        sqlite_where=sa.text(_ACTIVE_PREDICATE),
+    )
+    op.create_index(
+        "ix_library_entries_list_order",
+        "library_entries",
+        ["list_type", "playlist_slug", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_library_entries_item_recent",
+        "library_entries",
+        ["item_kind", "item_id", sa.text("created_at DESC")],
+        unique=False,
+    )
+    # Both are leading columns of the composite indexes above.
+    op.drop_index("ix_library_entries_item_kind", table_name="library_entries")
+    op.drop_index("ix_library_entries_list_type", table_name="library_entries")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_library_entries_list_type", "library_entries", ["list_type"], unique=False
+    )
+    op.create_index(
+        "ix_library_entries_item_kind", "library_entries", ["item_kind"], unique=False
+    )
+    op.drop_index("ix_library_entries_item_recent", table_name="library_entries")
+    op.drop_index("ix_library_entries_list_order", table_name="library_entries")
+    op.drop_index("ix_downloads_active_status", table_name="downloads")
@@ -0,0 +1,106 @@
+"""catalog items behind library snapshots
+
+Revision ID: 9a4d6e2b7c13  # pragma: allowlist secret
+Revises: 5f7b2c8e41a9  # pragma: allowlist secret
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9a4d6e2b7c13"  # pragma: allowlist secret
+down_revision = "5f7b2c8e41a9"  # pragma: allowlist secret
+branch_labels = None
+depends_on = None
+
+
+def _restore_sorted_indexes() -> None:
+    """Re-create the DESC indexes of 8c3e5a91d2f4 after a SQLite rebuild.
+
+    The batch rebuild copies indexes from reflection, which drops their
+    sort order.
+    """
+
+    if op.get_context().dialect.name != "sqlite":
+        return
+    op.drop_index("ix_library_entries_list_order", table_name="library_entries")
+    op.drop_index("ix_library_entries_item_recent", table_name="library_entries")
+    op.create_index(
+        "ix_library_entries_list_order",
+        "library_entries",
+        ["list_type", "playlist_slug", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_library_entries_item_recent",
+        "library_entries",
+        ["item_kind", "item_id", sa.text("created_at DESC")],
+        unique=False,
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_items",
+        sa.Column("kind", sa.String(length=16), primary_key=True),
+        sa.Column("id", sa.String(length=256), primary_key=True),
+        sa.Column("snapshot", sa.JSON(), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    # One row per item, keeping the most recently written snapshot.
+    op.execute(
+        """
+        INSERT INTO catalog_items (kind, id, snapshot, updated_at)
+        SELECT item_kind, item_id, snapshot, updated_at
+        FROM (
+            SELECT
+                item_kind,
+                item_id,
+                snapshot,
+                updated_at,
+                row_number() OVER (
+                    PARTITION BY item_kind, item_id
+                    ORDER BY updated_at DESC, id DESC
+                ) AS item_rank
+            FROM library_entries
+        ) AS ranked
+        WHERE item_rank = 1
+        """
+    )
+    with op.batch_alter_table("library_entries") as batch_op:
+        batch_op.create_foreign_key(
+            "fk_library_entries_catalog_item",
+            "catalog_items",
+            ["item_kind", "item_id"],
+            ["kind", "id"],
+        )
+        batch_op.drop_column("snapshot")
+    _restore_sorted_indexes()
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("library_entries") as batch_op:
+        batch_op.add_column(sa.Column("snapshot", sa.JSON(), nullable=True))
+        batch_op.drop_constraint("fk_library_entries_catalog_item", type_="foreignkey")
+    _restore_sorted_indexes()
+    op.execute(
+        """
+        UPDATE library_entries
+        SET snapshot = (
+            SELECT catalog_items.snapshot
+            FROM catalog_items
+            WHERE catalog_items.kind = library_entries.item_kind
+              AND catalog_items.id = library_entries.item_id
+        )
+        """
+    )
+    op.drop_table("catalog_items")
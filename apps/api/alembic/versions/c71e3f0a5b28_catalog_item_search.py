@@ -0,0 +1,91 @@
+"""catalog item search indexes
+
+Revision ID: c71e3f0a5b28  # pragma: allowlist secret
+Revises: 9a4d6e2b7c13  # pragma: allowlist secret
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c71e3f0a5b28"  # pragma: allowlist secret
+down_revision = "9a4d6e2b7c13"  # pragma: allowlist secret
+branch_labels = None
+depends_on = None
+
+
+_BATCH = 500
+
+_catalog = sa.table(
+    "catalog_items",
+    sa.column("kind", sa.String),
+    sa.column("id", sa.String),
+    sa.column("snapshot", sa.JSON),
+    sa.column("search_text", sa.Text),
+)
+
+
+# Keep in sync with app.services.library._search_text.
+def _search_text(snapshot: dict | None) -> str:
+    snapshot = snapshot or {}
+    parts = [snapshot.get("title"), snapshot.get("subtitle")]
+    parts.extend(snapshot.get("genres") or [])
+    return " ".join(str(part) for part in parts if part).lower()
+
+
+def upgrade() -> None:
+    op.add_column(
+        "catalog_items",
+        sa.Column("search_text", sa.Text(), nullable=False, server_default=""),
+    )
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(_catalog.c.kind, _catalog.c.id, _catalog.c.snapshot)
+    ).all()
+    update = (
+        _catalog.update()
+        .where(_catalog.c.kind == sa.bindparam("b_kind"))
+        .where(_catalog.c.id == sa.bindparam("b_id"))
+        .values(search_text=sa.bindparam("b_search_text"))
+    )
+    for start in range(0, len(rows), _BATCH):
+        bind.execute(
+            update,
+            [
+                {
+                    "b_kind": row.kind,
+                    "b_id": row.id,
+                    "b_search_text": _search_text(row.snapshot),
+                }
+                for row in rows[start : start + _BATCH]
+            ],
+        )
+
+    if bind.dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_catalog_items_search_tsv",
+            "catalog_items",
+            [sa.text("to_tsvector('simple', search_text)")],
+            postgresql_using="gin",
+        )
+        op.create_index(
+            "ix_catalog_items_search_trgm",
+            "catalog_items",
+            ["search_text"],
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_catalog_items_search_trgm", table_name="catalog_items")
+        op.drop_index("ix_catalog_items_search_tsv", table_name="catalog_items")
+    with op.batch_alter_table("catalog_items") as batch_op:
+        batch_op.drop_column("search_text")
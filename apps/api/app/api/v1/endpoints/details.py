@@ -5,15 +5,16 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.schemas.media import Classification
 from app.schemas.ui import DetailLinks, DetailResponse, DiscoverItem, MusicBrainzInfo
 from app.services import library as library_service
 from app.services.metadata import get_metadata_router
 from app.services.metadata.constants import TMDB_IMAGE_BASE
+from app.services.metadata.router import normalise_sections
 
 
 logger = logging.getLogger(__name__)
@@ -33,6 +34,15 @@ def _normalise_kind(kind: str) -> tuple[str, str]:
     return ("album" if mapping[kind] == "music" else kind, mapping[kind])
 
 
+def _parse_include(include: str | None) -> tuple[str, ...] | None:
+    if include is None:
+        return None
+    try:
+        return normalise_sections(include.split(","))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail="invalid_include") from exc
+
+
 def _safe_float(value: Any) -> float | None:
     try:
         if value is None:
@@ -275,12 +285,25 @@ def _build_detail(
 
 @router.get("/{kind}/{item_id}", response_model=DetailResponse)
 async def read_detail(
-    kind: str, item_id: str, db: Session = Depends(get_db)
+    kind: str,
+    item_id: str,
+    include: str | None = Query(
+        None,
+        description=(
+            "Comma-separated TMDb sections to load (credits, recommendations, "
+            "similar). Omit for all of them; pass an empty value for the base "
+            "record only and fetch the rest in a follow-up call."
+        ),
+    ),
+    db: AsyncSession = Depends(get_async_db),
 ) -> DetailResponse:
     response_kind, classification_kind = _normalise_kind(kind)
+    sections = _parse_include(include)
 
-    entry = library_service.get_entry(db, response_kind, item_id)
-    snapshot = entry.snapshot if entry else None
+    catalog_item = await library_service.get_catalog_item_async(
+        db, response_kind, item_id
+    )
+    snapshot = catalog_item.snapshot if catalog_item else None
     title = None
     if snapshot:
         title = snapshot.get("title") or snapshot.get("name")
@@ -297,7 +320,7 @@ async def read_detail(
 
     router = get_metadata_router()
     try:
-        card = await router.enrich(classification, title)
+        card = await router.enrich(classification, title, sections=sections)
     except Exception as exc:  # pragma: no cover - logged for visibility
         logger.exception("metadata enrichment failed for %s:%s", kind, item_id)
         raise HTTPException(status_code=502, detail="metadata_error") from exc
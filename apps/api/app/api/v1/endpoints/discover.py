@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from functools import lru_cache
 from typing import Any, Literal
@@ -15,7 +16,16 @@ from app.services.metadata.metadata_client import (
     MetadataProxyError,
     get_metadata_client,
 )
-from app.services.metadata.providers.musicbrainz import MusicBrainzClient
+from app.services.metadata.providers.musicbrainz import (
+    MusicBrainzClient,
+    MusicBrainzUnavailableError,
+)
+from app.services.metadata.release_groups import (
+    AlbumKey,
+    album_key,
+    compact_release_group,
+    release_group_cache,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -24,6 +34,10 @@ router = APIRouter(prefix="/discover", tags=["discover"])
 
 SortOption = Literal["trending", "popular", "new", "az"]
 
+# MusicBrainz lookups that outlived a response deadline.  Later requests for
+# the same albums join these tasks instead of issuing duplicate lookups.
+_INFLIGHT_LOOKUPS: dict[AlbumKey, asyncio.Task[dict[str, Any] | None]] = {}
+
 
 @lru_cache
 def _musicbrainz_client() -> MusicBrainzClient:
@@ -258,9 +272,22 @@ async def _discover_albums(
     if sort == "az":
         raw_items = sorted(raw_items, key=lambda item: _slug_fragment(item.get("name")))
 
+    albums: dict[AlbumKey, tuple[str | None, str]] = {}
+    for raw in raw_items:
+        parsed = _album_artist_title(raw)
+        if parsed is not None:
+            artist_name, title = parsed
+            albums.setdefault(album_key(artist_name, title), (artist_name, title))
+
+    release_groups, pending = await _resolve_release_groups(albums, musicbrainz)
+
     items: list[DiscoverItem] = []
     for raw in raw_items:
-        mapped = await _map_album_item(raw, musicbrainz)
+        parsed = _album_artist_title(raw)
+        if parsed is None:
+            continue
+        key = album_key(*parsed)
+        mapped = _map_album_item(raw, release_groups.get(key), pending=key in pending)
         if mapped is not None:
             items.append(mapped)
 
@@ -344,9 +371,83 @@ def _map_tmdb_item(
     )
 
 
-async def _map_album_item(
-    raw: Any, musicbrainz: MusicBrainzClient
-) -> DiscoverItem | None:
+async def _lookup_release_group(
+    musicbrainz: MusicBrainzClient,
+    key: AlbumKey,
+    artist: str | None,
+    album: str,
+    semaphore: asyncio.Semaphore,
+) -> dict[str, Any] | None:
+    async with semaphore:
+        try:
+            data = await musicbrainz.lookup_release_group(artist=artist, album=album)
+        except MusicBrainzUnavailableError:
+            # Not a miss: leave it uncached so the next request retries.
+            return None
+        except Exception:
+            logger.exception("discover: musicbrainz lookup failed album=%s", album)
+            return None
+    value = compact_release_group(data)
+    await release_group_cache.set(key, value)
+    return value
+
+
+async def _resolve_release_groups(
+    albums: dict[AlbumKey, tuple[str | None, str]],
+    musicbrainz: MusicBrainzClient | None,
+) -> tuple[dict[AlbumKey, dict[str, Any]], set[AlbumKey]]:
+    """Resolve release groups for ``albums`` within the response deadline.
+
+    Cached entries are read in one round-trip; the rest are looked up
+    concurrently (MusicBrainz pacing is left to the shared rate limiter).
+    Returns the resolved entries and the keys still being looked up when
+    the deadline passed.  Those lookups are not cancelled: they finish in
+    the background and fill the cache for the next request.
+    """
+
+    resolved = await release_group_cache.get_many(albums)
+    if musicbrainz is None:
+        return resolved, set()
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max(1, settings.DISCOVER_MB_CONCURRENCY))
+    tasks: dict[AlbumKey, asyncio.Task[dict[str, Any] | None]] = {}
+    for key, (artist, album) in albums.items():
+        if key in resolved:
+            continue
+        task = _INFLIGHT_LOOKUPS.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(
+                _lookup_release_group(musicbrainz, key, artist, album, semaphore)
+            )
+            _INFLIGHT_LOOKUPS[key] = task
+            task.add_done_callback(
+                lambda _done, key=key: _INFLIGHT_LOOKUPS.pop(key, None)
+            )
+        tasks[key] = task
+
+    if tasks:
+        await asyncio.wait(
+            tasks.values(), timeout=max(0.0, settings.DISCOVER_ALBUM_DEADLINE)
+        )
+
+    pending: set[AlbumKey] = set()
+    for key, task in tasks.items():
+        if not task.done():
+            pending.add(key)
+        elif not task.cancelled() and task.exception() is None:
+            result = task.result()
+            if result is not None:
+                resolved[key] = result
+    if pending:
+        logger.info(
+            "discover: %d musicbrainz lookups still running after deadline",
+            len(pending),
+        )
+    return resolved, pending
+
+
+def _album_artist_title(raw: Any) -> tuple[str | None, str] | None:
     if not isinstance(raw, dict):
         return None
     title = raw.get("name")
@@ -355,10 +456,20 @@ async def _map_album_item(
     artist_info = raw.get("artist")
     if isinstance(artist_info, dict):
         artist_name = artist_info.get("name")
-        artist_mbid = artist_info.get("mbid")
     else:
         artist_name = artist_info if isinstance(artist_info, str) else None
-        artist_mbid = None
+    return artist_name, title
+
+
+def _map_album_item(
+    raw: Any, mb_data: dict[str, Any] | None, *, pending: bool = False
+) -> DiscoverItem | None:
+    parsed = _album_artist_title(raw)
+    if parsed is None:
+        return None
+    artist_name, title = parsed
+    artist_info = raw.get("artist")
+    artist_mbid = artist_info.get("mbid") if isinstance(artist_info, dict) else None
 
     attrs = raw.get("@attr") if isinstance(raw.get("@attr"), dict) else {}
     meta: dict[str, Any] = {
@@ -375,27 +486,23 @@ async def _map_album_item(
 
     year = None
     mb_meta: dict[str, Any] | None = None
-    if musicbrainz is not None:
-        try:
-            mb_data = await musicbrainz.lookup_release_group(
-                artist=artist_name, album=title
-            )
-        except Exception:
-            logger.exception("discover: musicbrainz lookup failed album=%s", title)
-            mb_data = None
-        if isinstance(mb_data, dict):
-            release_group = mb_data.get("release_group") or {}
-            release_date = release_group.get("first_release_date")
-            year = _year_from_date(release_date)
-            mb_meta = {
-                "release_group_id": release_group.get("id"),
-                "primary_type": release_group.get("primary_type"),
-            }
-            artist_data = mb_data.get("artist") or {}
-            if isinstance(artist_data, dict) and artist_data.get("id"):
-                mb_meta["artist_id"] = artist_data.get("id")
+    if mb_data:
+        release_group = mb_data.get("release_group") or {}
+        release_date = release_group.get("first_release_date")
+        year = _year_from_date(release_date)
+        mb_meta = {
+            "release_group_id": release_group.get("id"),
+            "primary_type": release_group.get("primary_type"),
+        }
+        artist_data = mb_data.get("artist") or {}
+        if isinstance(artist_data, dict) and artist_data.get("id"):
+            mb_meta["artist_id"] = artist_data.get("id")
     if mb_meta:
         meta["musicbrainz"] = mb_meta
+    if pending:
+        # Year not known yet; re-requesting the page picks it up once the
+        # background lookup has finished.
+        meta["musicbrainz_pending"] = True
     if artist_mbid:
         meta["artist_mbid"] = artist_mbid
 
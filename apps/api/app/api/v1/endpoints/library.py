@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.schemas.ui import LibrarySummary, ListMutationInput
+from app.db.session import get_async_db
+from app.schemas.ui import (
+    LibraryListPage,
+    LibrarySearchPage,
+    LibrarySummary,
+    ListBatchInput,
+    ListBatchResult,
+    ListMutationInput,
+)
 from app.services import library as library_service
 
 
@@ -14,18 +21,74 @@ router = APIRouter(prefix="/library", tags=["library"])
 
 
 @router.get("", response_model=LibrarySummary)
-def read_library(db: Session = Depends(get_db)) -> LibrarySummary:
-    return library_service.build_summary(db)
+async def read_library(
+    limit: int | None = Query(None, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+) -> LibrarySummary:
+    return await library_service.build_summary_async(db, limit=limit)
+
+
+@router.get("/list", response_model=LibraryListPage)
+async def read_list(
+    list_name: str = Query(..., alias="list"),
+    playlist_id: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> LibraryListPage:
+    try:
+        return await library_service.list_page_async(
+            db,
+            list_name,
+            playlist_slug=playlist_id,
+            limit=limit,
+            cursor=cursor,
+        )
+    except library_service.PlaylistRequiredError as exc:
+        raise HTTPException(status_code=400, detail="playlist_id_required") from exc
+    except library_service.UnknownListError as exc:
+        raise HTTPException(status_code=400, detail="invalid_list") from exc
+    except library_service.InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail="invalid_cursor") from exc
+
+
+@router.get("/search", response_model=LibrarySearchPage)
+async def search_library(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> LibrarySearchPage:
+    try:
+        return await library_service.search_async(
+            db, q, kind=kind, limit=limit, cursor=cursor
+        )
+    except library_service.InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail="invalid_cursor") from exc
 
 
 @router.post("/list")
-def mutate_list(
-    payload: ListMutationInput, db: Session = Depends(get_db)
+async def mutate_list(
+    payload: ListMutationInput, db: AsyncSession = Depends(get_async_db)
 ) -> dict[str, bool]:
     try:
-        library_service.apply_mutation(db, payload)
+        await library_service.apply_mutations_async(db, [payload])
     except library_service.PlaylistRequiredError as exc:
         raise HTTPException(status_code=400, detail="playlist_id_required") from exc
     except library_service.UnknownListError as exc:
         raise HTTPException(status_code=400, detail="invalid_list") from exc
     return {"success": True}
+
+
+@router.post("/list/batch", response_model=ListBatchResult)
+async def mutate_list_batch(
+    payload: ListBatchInput, db: AsyncSession = Depends(get_async_db)
+) -> ListBatchResult:
+    try:
+        counts = await library_service.apply_mutations_async(db, payload.mutations)
+    except library_service.PlaylistRequiredError as exc:
+        raise HTTPException(status_code=400, detail="playlist_id_required") from exc
+    except library_service.UnknownListError as exc:
+        raise HTTPException(status_code=400, detail="invalid_list") from exc
+    return ListBatchResult(**counts)
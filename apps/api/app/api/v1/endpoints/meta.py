@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import os
+from collections.abc import AsyncIterator
 from typing import Any, Iterable, Literal
 
 from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from app.core.circuit_breaker import breaker_status
 from app.core.config import settings
 from app.core.runtime_settings import runtime_settings
 from app.schemas.media import Classification
@@ -33,6 +37,7 @@ from app.services.metadata import (
 from app.services.metadata.metadata_client import MetadataProxyError
 from app.services.metadata.constants import TMDB_IMAGE_BASE
 from app.services.metadata.providers.discogs import DiscogsClient
+from app.services.metadata.router import LOOKUP_SECTIONS
 
 
 public_router = APIRouter(tags=["metadata"])
@@ -406,10 +411,8 @@ async def _tmdb_detail(
     except (TypeError, ValueError):
         raise HTTPException(status_code=422, detail="invalid_id") from None
 
-    params = {
-        "language": "en-US",
-        "append_to_response": "external_ids,credits,recommendations,similar",
-    }
+    # MetaDetail only renders the cast; recommendations/similar are not used.
+    params = {"language": "en-US", "append_to_response": "credits"}
     request_id = request.headers.get("x-request-id")
     try:
         payload = await (
@@ -784,6 +787,18 @@ class LookupRequest(BaseModel):
     hint: Literal["music", "movie", "tv", "other", "auto"] = "auto"
 
 
+class BatchLookupRequest(BaseModel):
+    items: list[LookupRequest] = Field(..., min_length=1, max_length=100)
+
+
+def _hint_classification(hint: str) -> Classification:
+    return Classification(
+        type=hint if hint != "auto" else "other",
+        confidence=0.99,
+        reasons=[f"hint:{hint}"],
+    )
+
+
 @public_router.post("/lookup")
 async def lookup(body: LookupRequest) -> dict[str, Any]:
     classifier = get_classifier()
@@ -792,15 +807,50 @@ async def lookup(body: LookupRequest) -> dict[str, Any]:
     if body.hint == "auto":
         classification = classifier.classify_torrent(body.title)
     else:
-        classification = Classification(
-            type=body.hint if body.hint != "auto" else "other",
-            confidence=0.99,
-            reasons=[f"hint:{body.hint}"],
-        )
-    card = await router_service.enrich(classification, body.title)
+        classification = _hint_classification(body.hint)
+    card = await router_service.enrich(
+        classification, body.title, sections=LOOKUP_SECTIONS
+    )
     return card.model_dump()
 
 
+@public_router.post("/lookup/batch")
+async def lookup_batch(body: BatchLookupRequest) -> StreamingResponse:
+    """Enrich many titles at once, streaming NDJSON lines as each finishes.
+
+    Every line is ``{"index", "title", "card"}`` (or ``"error"`` in place of
+    ``"card"``) where ``index`` points back into the request's ``items``.
+    """
+
+    classifier = get_classifier()
+    router_service = get_metadata_router()
+
+    auto_titles = [item.title for item in body.items if item.hint == "auto"]
+    classified = iter(classifier.classify_many(auto_titles))
+    jobs = [
+        (
+            next(classified) if item.hint == "auto" else _hint_classification(item.hint),
+            item.title,
+        )
+        for item in body.items
+    ]
+
+    async def _stream() -> AsyncIterator[str]:
+        async for index, result in router_service.enrich_many(
+            jobs,
+            concurrency=settings.METADATA_BATCH_CONCURRENCY,
+            sections=LOOKUP_SECTIONS,
+        ):
+            line: dict[str, Any] = {"index": index, "title": jobs[index][1]}
+            if isinstance(result, Exception):
+                line["error"] = "metadata_error"
+            else:
+                line["card"] = result.model_dump()
+            yield json.dumps(line) + "\n"
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+
 @public_router.get("/providers/status")
 def providers_status() -> dict[str, Any]:
     discovery = {
@@ -821,6 +871,7 @@ def providers_status() -> dict[str, Any]:
         "lastfm": True,
         "musicbrainz": bool(settings.MB_USER_AGENT),
         "discovery": discovery,
+        "health": breaker_status([*discovery, "apple_rss"]),
     }
 
 
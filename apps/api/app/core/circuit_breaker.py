@@ -0,0 +1,190 @@
+"""Per-provider circuit breakers for optional upstream APIs.
+
+Discovery falls back between several providers, so a provider that is down
+should be skipped at once rather than costing every request its full timeout
+and retries.  After ``CIRCUIT_BREAKER_THRESHOLD`` consecutive failures a
+breaker opens and rejects calls for ``CIRCUIT_BREAKER_COOLDOWN`` seconds.  It
+then half-opens: a single probe call is let through, and its outcome closes
+the breaker again or re-opens it for another cooldown.
+
+Breakers also keep the latencies of recent calls so the provider status
+endpoints can report percentiles.  State is per process.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from app.core.config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_LATENCY_WINDOW = 200
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose breaker is open."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(f"circuit open for {name}")
+        self.name = name
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a half-open probe and latency window."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        threshold: int | None = None,
+        cooldown: float | None = None,
+    ) -> None:
+        self.name = name
+        self.threshold = (
+            settings.CIRCUIT_BREAKER_THRESHOLD if threshold is None else threshold
+        )
+        self.cooldown = settings.CIRCUIT_BREAKER_COOLDOWN if cooldown is None else cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_until = 0.0
+        self._probing = False
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return whether a call may go out now (claims the probe if half-open)."""
+
+        with self._lock:
+            if self.threshold <= 0 or self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() < self.opened_until:
+                    return False
+                self.state = HALF_OPEN
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self, latency: float | None = None) -> None:
+        with self._lock:
+            if latency is not None:
+                self._latencies.append(latency)
+            self.failures += 1
+            self._probing = False
+            if self.threshold > 0 and (
+                self.state == HALF_OPEN or self.failures >= self.threshold
+            ):
+                self.state = OPEN
+                self.opened_until = time.monotonic() + self.cooldown
+
+    def release(self) -> None:
+        """Give up a half-open probe that ended without an outcome."""
+
+        with self._lock:
+            self._probing = False
+
+    @contextmanager
+    def call(self) -> Iterator[None]:
+        """Guard one provider call, recording its outcome and latency.
+
+        Raises :class:`CircuitOpenError` when the breaker rejects the call.
+        ``NotImplementedError`` and cancellation are not counted as failures.
+        """
+
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+        started = time.monotonic()
+        try:
+            yield
+        except NotImplementedError:
+            self.release()
+            raise
+        except Exception:
+            self.record_failure(time.monotonic() - started)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success(time.monotonic() - started)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            state = self.state
+            if state == OPEN and time.monotonic() >= self.opened_until:
+                state = HALF_OPEN
+            ordered = sorted(self._latencies)
+            latency: dict[str, Any] = {"samples": len(ordered)}
+            if ordered:
+                for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+                    latency[f"{label}_ms"] = round(
+                        _percentile(ordered, fraction) * 1000, 1
+                    )
+            return {
+                "state": state,
+                "consecutive_failures": self.failures,
+                "retry_in": (
+                    round(max(0.0, self.opened_until - time.monotonic()), 1)
+                    if state == OPEN
+                    else 0.0
+                ),
+                "latency": latency,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def breaker_status(names: list[str] | None = None) -> dict[str, dict[str, Any]]:
+    """Snapshot ``names`` (default: every breaker created so far)."""
+
+    if names is None:
+        with _registry_lock:
+            names = sorted(_breakers)
+    return {name: get_breaker(name).snapshot() for name in names}
+
+
+def reset_breakers() -> None:
+    with _registry_lock:
+        _breakers.clear()
+
+
+__all__ = [
+    "CLOSED",
+    "HALF_OPEN",
+    "OPEN",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "breaker_status",
+    "get_breaker",
+    "reset_breakers",
+]
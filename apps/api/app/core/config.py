@@ -59,6 +59,11 @@ class Settings(BaseSettings):
     )
     DOWNLOAD_STAGING_DIR: str = "/downloads"
     DOWNLOAD_FINAL_DIR: str = "/music"
+    # Completed/failed downloads move to download_history this long after
+    # they finish; Celery beat runs the archive job every
+    # DOWNLOAD_ARCHIVE_INTERVAL seconds (0 disables it).
+    DOWNLOAD_ARCHIVE_AFTER: int = 86_400
+    DOWNLOAD_ARCHIVE_INTERVAL: int = 600
 
     PROWLARR_URL: AnyHttpUrl = Field(
         default="http://prowlarr:9696",
@@ -100,10 +105,51 @@ class Settings(BaseSettings):
     # Default cache TTL for discovery endpoints (seconds).
     DISCOVERY_CACHE_TTL: int = 86_400
 
+    # Celery beat refreshes the discovery new-release and tag rails of the
+    # curated genres (new releases per DISCOVERY_PREWARM_MARKETS) this often,
+    # which should be shorter than DISCOVERY_CACHE_TTL.  0 disables the job.
+    DISCOVERY_PREWARM_INTERVAL: int = 1800
+
     # MusicBrainz encourages clients to send an informative user agent.
     # We ship a sensible default that complies with their etiquette.
     MB_USER_AGENT: str = "Phelia/0.1 (https://example.local)"
 
+    # Maximum number of titles enriched in parallel by the batch lookup
+    # endpoint (POST /meta/lookup/batch).
+    METADATA_BATCH_CONCURRENCY: int = 4
+
+    # TMDb / Last.fm responses are kept in-process with their ETag and
+    # Last-Modified validators.  After the TTL (capped by the upstream
+    # Cache-Control max-age) entries are revalidated with a conditional
+    # request, and a 304 extends them without downloading the body again.
+    METADATA_HTTP_CACHE_TTL: int = 900
+    METADATA_HTTP_CACHE_SIZE: int = 256
+
+    # /discover/album resolves release years through MusicBrainz.  Lookups
+    # run concurrently (still paced by the MusicBrainz rate limit) and the
+    # chart is returned once the deadline passes; unfinished lookups keep
+    # running in the background and land in the release-group cache, so the
+    # next request for the page carries their years.
+    DISCOVER_ALBUM_DEADLINE: float = 2.0
+    DISCOVER_MB_CONCURRENCY: int = 4
+    RELEASE_GROUP_CACHE_TTL: int = 30 * 86_400
+    RELEASE_GROUP_NEGATIVE_TTL: int = 86_400
+
+    # Outbound request budgets (requests per second) shared through Redis
+    # by every API worker and Celery process.  A rate of 0 disables the
+    # limit for that provider.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_MUSICBRAINZ_RPS: float = 1.0
+    RATE_LIMIT_DISCOGS_RPS: float = 1.0
+    RATE_LIMIT_LASTFM_RPS: float = 5.0
+    RATE_LIMIT_TMDB_RPS: float = 20.0
+
+    # Optional providers (discovery, Apple RSS) are skipped for the cooldown
+    # after this many consecutive failures, then probed with a single call.
+    # A threshold of 0 disables the breakers.
+    CIRCUIT_BREAKER_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_COOLDOWN: float = 30.0
+
     def finalize(self) -> None:
         return None
 
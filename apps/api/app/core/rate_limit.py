@@ -0,0 +1,332 @@
+"""Distributed token-bucket rate limiting for outbound provider requests.
+
+Every process (gunicorn workers, Celery workers, beat) draws from the same
+per-host token bucket stored in Redis, so the combined request rate towards
+an upstream such as MusicBrainz stays within its published budget.  When
+Redis is unreachable the limiter degrades to an in-process bucket instead of
+failing the request.
+
+Within a process, callers waiting for the same host are served in priority
+order (lower values first), so interactive lookups overtake background
+enrichment queued behind them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+from app.core.redis import OptionalRedis
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 10
+PRIORITY_BACKGROUND = 20
+
+_KEY_PREFIX = "ratelimit"
+
+# Atomically refill and take one token.  Returns the number of seconds the
+# caller has to wait before retrying ("0" when a token was granted).  Redis
+# server time is used so that every process agrees on the clock.
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+return tostring(wait)
+"""
+
+# Drain the bucket so that no process is granted a token for ``seconds``.
+_BACKOFF_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local seconds = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+tokens = math.min(tokens, -seconds * rate)
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+return tostring(tokens)
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitBudget:
+    """Request budget for a single upstream host."""
+
+    host: str
+    rate: float
+    burst: int = 1
+
+    @property
+    def key(self) -> str:
+        return f"{_KEY_PREFIX}:{self.host}"
+
+
+def default_budgets() -> dict[str, RateLimitBudget]:
+    """Return the configured per-host budgets keyed by host name."""
+
+    budgets = (
+        RateLimitBudget("musicbrainz.org", settings.RATE_LIMIT_MUSICBRAINZ_RPS),
+        RateLimitBudget("api.discogs.com", settings.RATE_LIMIT_DISCOGS_RPS),
+        RateLimitBudget("ws.audioscrobbler.com", settings.RATE_LIMIT_LASTFM_RPS, burst=5),
+        RateLimitBudget("api.themoviedb.org", settings.RATE_LIMIT_TMDB_RPS, burst=20),
+    )
+    return {budget.host: budget for budget in budgets if budget.rate > 0}
+
+
+@dataclass
+class _LocalBucket:
+    """In-process token bucket used when Redis is unavailable."""
+
+    budget: RateLimitBudget
+    tokens: float = field(init=False)
+    updated: float = field(default_factory=time.monotonic)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        self.tokens = float(self.budget.burst)
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(float(self.budget.burst), self.tokens + elapsed * self.budget.rate)
+        self.updated = now
+
+    def take(self) -> float:
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.budget.rate
+
+    def backoff(self, seconds: float) -> None:
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, -seconds * self.budget.rate)
+
+
+class _PriorityGate:
+    """Async mutex that hands the next turn to the lowest priority value."""
+
+    def __init__(self) -> None:
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._locked = False
+        self._counter = itertools.count()
+
+    @asynccontextmanager
+    async def turn(self, priority: int) -> AsyncIterator[None]:
+        if self._locked or self._waiters:
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._counter), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+        else:
+            self._locked = True
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._locked = False
+
+
+class RateLimiter:
+    """Shared per-host rate limiter for async and sync callers."""
+
+    def __init__(
+        self,
+        budgets: dict[str, RateLimitBudget] | None = None,
+        *,
+        redis_url: str | None = None,
+        enabled: bool | None = None,
+    ) -> None:
+        self._budgets = budgets if budgets is not None else default_budgets()
+        self._redis = OptionalRedis("rate limiter (using in-process buckets)", redis_url)
+        self.enabled = settings.RATE_LIMIT_ENABLED if enabled is None else enabled
+        self._local: dict[str, _LocalBucket] = {}
+        self._gates: dict[str, _PriorityGate] = {}
+        self._sync_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Budget helpers
+    # ------------------------------------------------------------------
+    def budget_for(self, target: str) -> RateLimitBudget | None:
+        """Return the budget for ``target`` (a URL or bare host name)."""
+
+        host = target
+        if "://" in target:
+            try:
+                host = httpx.URL(target).host
+            except Exception:  # pragma: no cover - defensive
+                return None
+        return self._budgets.get(host.lower())
+
+    def _local_bucket(self, budget: RateLimitBudget) -> _LocalBucket:
+        with self._lock:
+            bucket = self._local.get(budget.host)
+            if bucket is None:
+                bucket = self._local[budget.host] = _LocalBucket(budget)
+            return bucket
+
+    # ------------------------------------------------------------------
+    # Token acquisition
+    # ------------------------------------------------------------------
+    async def _take(self, budget: RateLimitBudget) -> float:
+        if self._redis.available:
+            try:
+                client = self._redis.async_client()
+                wait = await client.eval(
+                    _TAKE_SCRIPT, 1, budget.key, budget.rate, budget.burst
+                )
+                return float(wait)
+            except Exception as exc:  # noqa: BLE001 - any Redis failure falls back
+                self._redis.mark_down(exc)
+        return self._local_bucket(budget).take()
+
+    def _take_sync(self, budget: RateLimitBudget) -> float:
+        if self._redis.available:
+            try:
+                client = self._redis.sync_client()
+                wait = client.eval(_TAKE_SCRIPT, 1, budget.key, budget.rate, budget.burst)
+                return float(wait)
+            except Exception as exc:  # noqa: BLE001 - any Redis failure falls back
+                self._redis.mark_down(exc)
+        return self._local_bucket(budget).take()
+
+    async def acquire(self, target: str, *, priority: int = PRIORITY_DEFAULT) -> None:
+        """Wait until a request to ``target`` fits within its host budget."""
+
+        budget = self.budget_for(target) if self.enabled else None
+        if budget is None:
+            return
+        gate = self._gates.setdefault(budget.host, _PriorityGate())
+        async with gate.turn(priority):
+            while True:
+                wait = await self._take(budget)
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+
+    def acquire_sync(self, target: str) -> None:
+        """Blocking variant of :meth:`acquire` for sync code and Celery tasks."""
+
+        budget = self.budget_for(target) if self.enabled else None
+        if budget is None:
+            return
+        with self._lock:
+            lock = self._sync_locks.setdefault(budget.host, threading.Lock())
+        with lock:
+            while True:
+                wait = self._take_sync(budget)
+                if wait <= 0:
+                    return
+                time.sleep(wait)
+
+    # ------------------------------------------------------------------
+    # Upstream back-pressure
+    # ------------------------------------------------------------------
+    async def backoff(self, target: str, seconds: float) -> None:
+        """Pause every process's requests to ``target`` for ``seconds``."""
+
+        budget = self.budget_for(target) if self.enabled else None
+        if budget is None or seconds <= 0:
+            return
+        if self._redis.available:
+            try:
+                client = self._redis.async_client()
+                await client.eval(
+                    _BACKOFF_SCRIPT, 1, budget.key, budget.rate, budget.burst, seconds
+                )
+                return
+            except Exception as exc:  # noqa: BLE001 - any Redis failure falls back
+                self._redis.mark_down(exc)
+        self._local_bucket(budget).backoff(seconds)
+
+    def backoff_sync(self, target: str, seconds: float) -> None:
+        """Blocking variant of :meth:`backoff`."""
+
+        budget = self.budget_for(target) if self.enabled else None
+        if budget is None or seconds <= 0:
+            return
+        if self._redis.available:
+            try:
+                self._redis.sync_client().eval(
+                    _BACKOFF_SCRIPT, 1, budget.key, budget.rate, budget.burst, seconds
+                )
+                return
+            except Exception as exc:  # noqa: BLE001 - any Redis failure falls back
+                self._redis.mark_down(exc)
+        self._local_bucket(budget).backoff(seconds)
+
+
+def retry_after_seconds(response: Any, default: float) -> float:
+    """Parse a numeric ``Retry-After`` header, falling back to ``default``."""
+
+    headers = getattr(response, "headers", None) or {}
+    raw = headers.get("Retry-After") if hasattr(headers, "get") else None
+    if raw:
+        try:
+            return max(0.0, float(raw))
+        except (TypeError, ValueError):
+            pass
+    return default
+
+
+rate_limiter = RateLimiter()
+
+
+__all__ = [
+    "PRIORITY_BACKGROUND",
+    "PRIORITY_DEFAULT",
+    "PRIORITY_INTERACTIVE",
+    "RateLimitBudget",
+    "RateLimiter",
+    "default_budgets",
+    "rate_limiter",
+    "retry_after_seconds",
+]
@@ -1,10 +1,31 @@
+"""Redis clients for the API and workers.
+
+Most uses of Redis are best effort (caches, rate limit buckets, settings
+notifications): when it is unreachable the caller falls back to something
+local.  :class:`OptionalRedis` gives those callers clients that fail fast and
+a shared back-off, so an outage costs one connect timeout every
+``REDIS_RETRY_SECONDS`` instead of one per call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
 from collections.abc import Generator
 from functools import lru_cache
+from typing import Any
 
 import redis
+import redis.asyncio as redis_async
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+REDIS_RETRY_SECONDS = 5.0
+_SOCKET_TIMEOUT = 0.5
+
 
 @lru_cache(maxsize=1)
 def _redis_client() -> redis.Redis:
@@ -19,4 +40,92 @@ def get_redis() -> Generator[redis.Redis, None, None]:
         pass
 
 
-__all__ = ["get_redis"]
+def connect(
+    url: str | None = None, *, socket_timeout: float | None = _SOCKET_TIMEOUT
+) -> redis.Redis:
+    """Return a sync client that gives up quickly on an unreachable server.
+
+    Pass ``socket_timeout=None`` for connections that block on reads, such as
+    pub/sub subscriptions.
+    """
+
+    return redis.Redis.from_url(
+        url or settings.REDIS_URL,
+        socket_connect_timeout=_SOCKET_TIMEOUT,
+        socket_timeout=socket_timeout,
+    )
+
+
+class OptionalRedis:
+    """Lazily created clients for a use of Redis that can do without it.
+
+    Callers check :attr:`available` before talking to Redis and call
+    :meth:`mark_down` when a command fails; Redis is then skipped for
+    ``retry_seconds``.
+    """
+
+    def __init__(
+        self,
+        purpose: str,
+        url: str | None = None,
+        *,
+        retry_seconds: float = REDIS_RETRY_SECONDS,
+    ) -> None:
+        self.purpose = purpose
+        self.url = url or settings.REDIS_URL
+        self.retry_seconds = retry_seconds
+        self.down_until = 0.0
+        self._sync_client: redis.Redis | None = None
+        self._async_client: redis_async.Redis | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def mark_down(self, exc: BaseException) -> None:
+        """Skip Redis for ``retry_seconds``; logs once per outage."""
+
+        if self.available:
+            logger.warning(
+                "%s: redis unavailable, retrying in %.0fs: %s",
+                self.purpose,
+                self.retry_seconds,
+                exc,
+            )
+        self.down_until = time.monotonic() + self.retry_seconds
+
+    def sync_client(self) -> redis.Redis:
+        if self._sync_client is None:
+            self._sync_client = connect(self.url)
+        return self._sync_client
+
+    def async_client(self) -> redis_async.Redis:
+        """Return the async client, recreated when the event loop changes."""
+
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = redis_async.Redis.from_url(
+                self.url,
+                socket_connect_timeout=_SOCKET_TIMEOUT,
+                socket_timeout=_SOCKET_TIMEOUT,
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    def owns(self, client: Any) -> bool:
+        """Return whether ``client`` was handed out by this instance."""
+
+        return client is not None and (
+            client is self._async_client or client is self._sync_client
+        )
+
+    async def aclose(self) -> None:
+        """Close the async client, e.g. before its event loop goes away."""
+
+        client, self._async_client, self._async_loop = self._async_client, None, None
+        if client is not None:
+            await client.aclose()
+
+
+__all__ = ["REDIS_RETRY_SECONDS", "OptionalRedis", "connect", "get_redis"]
@@ -5,6 +5,7 @@ import re
 from dataclasses import dataclass
 from threading import RLock
 
+from app.core import settings_version
 from app.core.config import settings
 from app.core.secure_store import SecretsStore, get_secrets_store
 
@@ -168,21 +169,25 @@ class RuntimeIntegrationSettings:
             return self._values.get(key)
 
     def set(self, key: str, value: str | None) -> bool:
-        spec = FIELD_BY_KEY.get(key)
-        if spec is None:
-            raise KeyError(key)
-        validated = _validate(spec, value)
-        with self._lock:
-            if self._values.get(key) == validated:
-                return False
-            self._values[key] = validated
-            self._persist()
-            return True
+        return self.update_many({key: value})
 
     def update_many(self, values: dict[str, str | None]) -> bool:
-        changed = False
+        validated: dict[str, str | None] = {}
         for key, value in values.items():
-            changed |= self.set(key, value)
+            spec = FIELD_BY_KEY.get(key)
+            if spec is None:
+                raise KeyError(key)
+            validated[key] = _validate(spec, value)
+        with self._lock:
+            changed = False
+            for key, value in validated.items():
+                if self._values.get(key) != value:
+                    self._values[key] = value
+                    changed = True
+            if changed:
+                self._persist()
+        if changed:
+            settings_version.publish_change()
         return changed
 
     def provider_enabled(self, provider_id: str) -> bool:
@@ -197,7 +202,8 @@ class RuntimeIntegrationSettings:
                 return False
             self._enabled[provider_id] = enabled
             self._persist()
-            return True
+        settings_version.publish_change()
+        return True
 
     def describe(self, *, include_secrets: bool = False) -> dict[str, dict[str, str | bool | None]]:
         with self._lock:
@@ -236,6 +242,7 @@ class RuntimeIntegrationSettings:
 
 
 runtime_integration_settings = RuntimeIntegrationSettings()
+settings_version.register_reloader(runtime_integration_settings.reset_to_defaults)
 
 __all__ = [
     "IntegrationFieldSpec",
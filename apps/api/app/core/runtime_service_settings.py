@@ -12,6 +12,7 @@ from threading import RLock
 from typing import Optional
 import xml.etree.ElementTree as ET
 
+from app.core import settings_version
 from app.core.config import settings
 from app.core.secure_store import SecretsStore, get_secrets_store
 from app.services.search.prowlarr.settings import ProwlarrSettings
@@ -169,7 +170,7 @@ class RuntimeServiceSettings:
         self.reset_to_env()
 
     def reset_to_env(self) -> None:
-        with self._lock:
+        with self._lock, self._store.batch():
             prowlarr_url = _normalize_url(str(settings.PROWLARR_URL))
             qb_url = _normalize_url(str(settings.QB_URL))
             qb_username = getattr(settings, "QB_USER", "") or ""
@@ -280,7 +281,8 @@ class RuntimeServiceSettings:
     def prowlarr_settings(self) -> ProwlarrSettings:
         with self._lock:
             snapshot = self._prowlarr
-            self._refresh_qbittorrent_from_store()
+            if not settings_version.is_listening():
+                self._refresh_qbittorrent_from_store()
             qb = self._qbittorrent
         return ProwlarrSettings(
             prowlarr_url=snapshot.url,
@@ -300,7 +302,8 @@ class RuntimeServiceSettings:
 
     def qbittorrent_snapshot(self) -> QbittorrentRuntimeSnapshot:
         with self._lock:
-            self._refresh_qbittorrent_from_store()
+            if not settings_version.is_listening():
+                self._refresh_qbittorrent_from_store()
             return self._qbittorrent
 
     def download_snapshot(self) -> DownloadRuntimeSnapshot:
@@ -308,7 +311,13 @@ class RuntimeServiceSettings:
             return self._downloads
 
     def update_prowlarr(self, *, url: Optional[str] = None, api_key: Optional[str] = None) -> bool:
-        with self._lock:
+        changed = self._update_prowlarr(url=url, api_key=api_key)
+        if changed:
+            settings_version.publish_change()
+        return changed
+
+    def _update_prowlarr(self, *, url: Optional[str], api_key: Optional[str]) -> bool:
+        with self._lock, self._store.batch():
             snapshot = self._prowlarr
             updated = ProwlarrRuntimeSnapshot(
                 url=_normalize_url(url) if isinstance(url, str) and url.strip() else snapshot.url,
@@ -336,7 +345,19 @@ class RuntimeServiceSettings:
         username: Optional[str] = None,
         password: Optional[str] = None,
     ) -> bool:
-        with self._lock:
+        changed = self._update_qbittorrent(url=url, username=username, password=password)
+        if changed:
+            settings_version.publish_change()
+        return changed
+
+    def _update_qbittorrent(
+        self,
+        *,
+        url: Optional[str],
+        username: Optional[str],
+        password: Optional[str],
+    ) -> bool:
+        with self._lock, self._store.batch():
             snapshot = self._qbittorrent
             updated = QbittorrentRuntimeSnapshot(
                 url=_normalize_url(url) if isinstance(url, str) and url.strip() else snapshot.url,
@@ -383,6 +404,31 @@ class RuntimeServiceSettings:
                 "downloads_default_dir": self._downloads.default_dir,
             }
 
+    def reload_from_store(self) -> None:
+        """Pick up credentials another process saved (see ``settings_version``)."""
+
+        with self._lock:
+            prowlarr_url = self._store.get("prowlarr_url")
+            prowlarr_key = self._store.get("prowlarr_api_key")
+            snapshot = self._prowlarr
+            self._prowlarr = ProwlarrRuntimeSnapshot(
+                url=(
+                    _normalize_url(prowlarr_url)
+                    if isinstance(prowlarr_url, str) and prowlarr_url.strip()
+                    else snapshot.url
+                ),
+                api_key=(
+                    prowlarr_key
+                    if isinstance(prowlarr_key, str) and prowlarr_key.strip()
+                    else snapshot.api_key
+                ),
+                allowlist=snapshot.allowlist,
+                blocklist=snapshot.blocklist,
+                category_filters=snapshot.category_filters,
+                minimum_seeders=snapshot.minimum_seeders,
+            )
+            self._refresh_qbittorrent_from_store()
+
     def _refresh_qbittorrent_from_store(self) -> None:
         qb_url_store = self._store.get("qbittorrent_url")
         qb_username_store = self._store.get("qbittorrent_username")
@@ -404,3 +450,4 @@ class RuntimeServiceSettings:
 
 
 runtime_service_settings = RuntimeServiceSettings(get_secrets_store())
+settings_version.register_reloader(runtime_service_settings.reload_from_store)
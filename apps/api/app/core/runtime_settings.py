@@ -7,6 +7,7 @@ from collections.abc import Callable
 from threading import RLock
 from typing import Optional
 
+from app.core import settings_version
 from app.core.config import settings
 from app.core.secure_store import SecretsStore, get_secrets_store
 
@@ -58,6 +59,20 @@ class RuntimeProviderSettings:
             if store_updates:
                 self._store.set_many(store_updates)
 
+    def reload_from_store(self) -> None:
+        """Pick up keys another process saved (see ``settings_version``)."""
+
+        with self._lock:
+            values = dict(self._values)
+            for slug in SUPPORTED_PROVIDER_SLUGS:
+                stored_value = self._store.get(slug)
+                values[slug] = (
+                    stored_value
+                    if isinstance(stored_value, str) and stored_value.strip()
+                    else None
+                )
+            self._values = values
+
     def get(self, slug: str) -> Optional[str]:
         normalized = normalize_provider(slug)
         with self._lock:
@@ -66,22 +81,23 @@ class RuntimeProviderSettings:
     def set(self, slug: str, value: Optional[str]) -> bool:
         """Update ``slug`` with ``value`` and return ``True`` when it changed."""
 
-        normalized = normalize_provider(slug)
-        new_value = value or None
-        with self._lock:
-            current = self._values.get(normalized)
-            if current == new_value:
-                return False
-            self._values[normalized] = new_value
-            self._persist()
-            return True
+        return self.update_many({slug: value})
 
     def update_many(self, values: dict[str, Optional[str]]) -> bool:
         """Bulk update providers returning ``True`` when any value changes."""
 
-        mutated = False
-        for slug, value in values.items():
-            mutated |= self.set(slug, value)
+        with self._lock:
+            mutated = False
+            for slug, value in values.items():
+                normalized = normalize_provider(slug)
+                new_value = value or None
+                if self._values.get(normalized) != new_value:
+                    self._values[normalized] = new_value
+                    mutated = True
+            if mutated:
+                self._persist()
+        if mutated:
+            settings_version.publish_change()
         return mutated
 
     def _persist(self) -> None:
@@ -123,6 +139,7 @@ class RuntimeProviderSettings:
 
 
 runtime_settings = RuntimeProviderSettings()
+settings_version.register_reloader(runtime_settings.reload_from_store)
 
 __all__ = [
     "normalize_provider",
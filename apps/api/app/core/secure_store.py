@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 import base64
+import copy
 import hashlib
 import json
 import logging
 import os
 import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from threading import RLock
+from threading import Lock, RLock
 from typing import Any
 
 from cryptography.fernet import Fernet, InvalidToken
@@ -27,6 +30,14 @@ MASTER_KEY_FILE_ENV = "APP_SECRET_KEY_FILE"
 
 LEGACY_PLAINTEXT_SUFFIXES = (".json", ".api_keys.json", ".api_keys")
 
+# Bumped on every save from this process, so cached snapshots notice writes
+# even when the file's mtime does not change (coarse filesystem clocks).
+_write_versions: dict[Path, int] = {}
+_write_versions_lock = Lock()
+
+# (in-process write version, mtime_ns, size, inode) of a store file.
+StoreSignature = tuple[int, int, int, int] | tuple[int, None]
+
 
 def _default_store_path() -> Path:
     override = os.environ.get(STORE_ENV_VAR) or os.environ.get(STORE_ENV_FALLBACK)
@@ -89,6 +100,21 @@ class EncryptedKeyStore:
                 logger.warning("Failed to remove legacy plaintext key store: %s", exc)
             return
 
+    def signature(self) -> StoreSignature:
+        """Cheap fingerprint of the file that changes whenever it is rewritten.
+
+        Saves replace the file, so another process's write shows up as a new
+        inode/mtime; writes from this process also bump a version counter.
+        """
+
+        with _write_versions_lock:
+            version = _write_versions.get(self.path, 0)
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return (version, None)
+        return (version, stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
     def _fernet(self) -> Fernet | None:
         if not self.secret:
             return None
@@ -130,6 +156,8 @@ class EncryptedKeyStore:
                 os.fsync(tmp_file.fileno())
             os.chmod(temp_path, 0o600)
             os.replace(temp_path, self.path)
+            with _write_versions_lock:
+                _write_versions[self.path] = _write_versions.get(self.path, 0) + 1
         finally:
             if temp_path.exists():
                 temp_path.unlink(missing_ok=True)
@@ -146,15 +174,78 @@ class EncryptedKeyStore:
 
 
 class SecretsStore:
-    """Shared secrets store with convenience helpers."""
+    """Shared secrets store with convenience helpers.
+
+    The decrypted contents are kept in memory and only re-read when the
+    file's :meth:`~EncryptedKeyStore.signature` changes.  Writes made inside
+    :meth:`batch` are applied to the snapshot and saved with a single atomic
+    replace when the outermost batch exits; writes that change nothing are
+    not saved at all.
+    """
 
     def __init__(self, store: EncryptedKeyStore | None = None) -> None:
         self._lock = RLock()
         self._store = store or EncryptedKeyStore(secret=_resolve_master_secret())
+        self._snapshot: dict[str, Any] | None = None
+        self._signature: StoreSignature | None = None
+        self._batch_depth = 0
+        self._dirty = False
+
+    def _data(self) -> dict[str, Any]:
+        """Return the current contents (callers must hold ``self._lock``)."""
+
+        if self._batch_depth and self._snapshot is not None:
+            return self._snapshot
+        signature = self._store.signature()
+        if self._snapshot is None or signature != self._signature:
+            self._snapshot = self._store.load()
+            # Loading may migrate a legacy plaintext store, which saves.
+            self._signature = self._store.signature()
+        return self._snapshot
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group writes into one save when the outermost batch exits."""
+
+        with self._lock:
+            if not self._batch_depth:
+                # Start from the latest file and work on a private copy, so
+                # a failed save leaves the snapshot untouched.
+                self._snapshot = copy.deepcopy(self._data())
+            self._batch_depth += 1
+            try:
+                yield
+            except BaseException:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._dirty = False
+                    self._snapshot = None
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth or not self._dirty:
+                return
+            self._dirty = False
+            data = self._snapshot
+            try:
+                self._store.save(data)
+            except BaseException:
+                self._snapshot = None
+                raise
+            self._signature = self._store.signature()
+
+    def _update(self, key: str, value: Any, *, remove: bool = False) -> None:
+        data = self._data()
+        if remove:
+            if key in data:
+                del data[key]
+                self._dirty = True
+        elif key not in data or data[key] != value:
+            data[key] = copy.deepcopy(value)
+            self._dirty = True
 
     def get(self, key: str) -> Any:
         with self._lock:
-            return self._store.load().get(key)
+            return copy.deepcopy(self._data().get(key))
 
     def set(self, key: str, value: Any) -> None:
         self.set_many({key: value})
@@ -162,33 +253,31 @@ class SecretsStore:
     def set_many(
         self, values: dict[str, Any], allow_empty_keys: set[str] | None = None
     ) -> None:
-        with self._lock:
-            data = self._store.load()
+        with self.batch():
             for key, value in values.items():
-                if value is None or (value == "" and key not in (allow_empty_keys or set())):
-                    data.pop(key, None)
-                else:
-                    data[key] = value
-            self._store.save(data)
-
+                remove = value is None or (
+                    value == "" and key not in (allow_empty_keys or set())
+                )
+                self._update(key, value, remove=remove)
 
     def load_section(self, section: str) -> dict[str, Any]:
         with self._lock:
-            return self._store.load_section(section)
+            section_data = self._data().get(section)
+            return copy.deepcopy(section_data) if isinstance(section_data, dict) else {}
 
     def save_section(self, section: str, values: dict[str, Any]) -> None:
-        with self._lock:
-            self._store.save_section(section, values)
+        with self.batch():
+            self._update(section, values)
 
     def list_configured(self) -> list[str]:
         with self._lock:
-            return [key for key, value in self._store.load().items() if value]
+            return [key for key, value in self._data().items() if value]
 
     def export_redacted(self) -> dict[str, str | None]:
         with self._lock:
             return {
                 key: ("configured" if value else None)
-                for key, value in self._store.load().items()
+                for key, value in self._data().items()
             }
 
 
@@ -0,0 +1,221 @@
+"""Cross-process settings change notifications over Redis pub/sub.
+
+Runtime settings (provider keys, integrations, Prowlarr/qBittorrent
+credentials) are cached in memory by every API worker and Celery process.
+Whoever changes them calls :func:`publish_change`, which increments a shared
+version counter in Redis and publishes the new value on a channel.  Every
+process runs a :class:`SettingsVersionListener` thread that reloads its
+snapshots from the secrets store once per bump, so hot paths can read from
+memory without touching the store.
+
+While the listener is not subscribed (Redis unreachable, or not started, as
+in tests and one-off scripts) :func:`is_listening` is false; the Prowlarr and
+qBittorrent snapshots are then refreshed from the store on read, while the
+provider and integration settings keep their last loaded values.  Each
+(re)subscribe therefore reloads everything regardless of the version, and a
+bump that could not be published stays pending until Redis is reachable
+again, so a change made during an outage still reaches every process.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+
+from app.core.redis import REDIS_RETRY_SECONDS, OptionalRedis, connect
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "phelia:settings:changed"
+VERSION_KEY = "phelia:settings:version"
+
+_POLL_SECONDS = 1.0
+
+_reloaders: list[Callable[[], None]] = []
+_reloaders_lock = threading.Lock()
+
+
+def register_reloader(callback: Callable[[], None]) -> None:
+    """Run ``callback`` whenever another writer bumps the settings version."""
+
+    with _reloaders_lock:
+        if callback not in _reloaders:
+            _reloaders.append(callback)
+
+
+def _run_reloaders() -> None:
+    with _reloaders_lock:
+        callbacks = list(_reloaders)
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception:  # noqa: BLE001 - one bad reloader must not stop the rest
+            logger.exception("settings reload failed in %r", callback)
+
+
+def _parse_version(raw: object) -> int | None:
+    if isinstance(raw, bytes):
+        raw = raw.decode("ascii", "ignore")
+    try:
+        return int(raw)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+class SettingsVersionListener:
+    """Background subscriber that applies settings version bumps."""
+
+    def __init__(self, redis_url: str | None = None) -> None:
+        self._redis_url = redis_url
+        self._version: int | None = None
+        self._subscribed = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def subscribed(self) -> bool:
+        return self._subscribed
+
+    def handle_version(self, raw: object, *, force: bool = False) -> bool:
+        """Reload once if ``raw`` is a version this process has not applied.
+
+        ``force`` reloads even when the version is unchanged, for catching up
+        after a period without a subscription.
+        """
+
+        version = _parse_version(raw)
+        with self._lock:
+            if version is None and not force:
+                return False
+            if version == self._version and not force:
+                return False
+            # Versions only grow; a lower one means the counter was reset.
+            if version is not None:
+                self._version = version
+        _run_reloaders()
+        return True
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="settings-version", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+        self._subscribed = False
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception as exc:  # noqa: BLE001 - reconnect on any failure
+                if self._subscribed:
+                    logger.warning("settings version channel lost: %s", exc)
+                else:
+                    logger.debug("settings version channel unavailable: %s", exc)
+            self._subscribed = False
+            self._stop.wait(REDIS_RETRY_SECONDS)
+
+    def _listen(self) -> None:
+        # No read timeout: the subscription idles between messages.
+        client = connect(self._redis_url, socket_timeout=None)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(CHANNEL)
+            self._subscribed = True
+            # Catch up on changes made while this process was not subscribed
+            # (including before it started).  The version alone cannot tell:
+            # a write whose bump was never published leaves it unchanged.
+            _flush_pending_publish()
+            self.handle_version(client.get(VERSION_KEY) or 0, force=True)
+            while not self._stop.is_set():
+                _flush_pending_publish()
+                message = pubsub.get_message(timeout=_POLL_SECONDS)
+                if message and message.get("type") == "message":
+                    self.handle_version(message.get("data"))
+        finally:
+            pubsub.close()
+            client.close()
+
+
+listener = SettingsVersionListener()
+
+_publisher = OptionalRedis("settings publisher (change kept pending)")
+_publisher_lock = threading.Lock()
+_pending_publish = False
+
+
+def publish_change() -> int | None:
+    """Bump the shared settings version and notify every process.
+
+    Best effort: returns the new version, or ``None`` when Redis is down.  The
+    bump is then kept pending and sent by the next successful attempt (a
+    later write, or this process's listener once it reconnects).
+    """
+
+    global _pending_publish
+    with _publisher_lock:
+        _pending_publish = True
+        return _publish_locked()
+
+
+def _flush_pending_publish() -> int | None:
+    if not _pending_publish:
+        return None
+    with _publisher_lock:
+        if not _pending_publish:
+            return None
+        return _publish_locked()
+
+
+def _publish_locked() -> int | None:
+    global _pending_publish
+    if not _publisher.available:
+        return None
+    try:
+        client = _publisher.sync_client()
+        version = int(client.incr(VERSION_KEY))
+        client.publish(CHANNEL, version)
+    except Exception as exc:  # noqa: BLE001 - any Redis failure is non-fatal
+        _publisher.mark_down(exc)
+        return None
+    _pending_publish = False
+    return version
+
+
+def is_listening() -> bool:
+    """Return whether in-memory settings are kept current by the listener."""
+
+    return listener.subscribed
+
+
+def start_listener() -> None:
+    listener.start()
+
+
+def stop_listener() -> None:
+    listener.stop()
+
+
+__all__ = [
+    "CHANNEL",
+    "VERSION_KEY",
+    "SettingsVersionListener",
+    "is_listening",
+    "listener",
+    "publish_change",
+    "register_reloader",
+    "start_listener",
+    "stop_listener",
+]
@@ -11,6 +11,10 @@ from sqlalchemy import (
     func,
     JSON,
     UniqueConstraint,
+    Index,
+    bindparam,
+    or_,
+    ForeignKeyConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.session import Base
@@ -24,8 +28,37 @@ class User(Base):
     role: Mapped[str] = mapped_column(String(32), default="user")
 
 
+# Statuses polled by ``poll_status``.  ``ix_downloads_active_status`` only
+# covers these rows; query them through ``ACTIVE_DOWNLOAD_FILTER``.
+ACTIVE_DOWNLOAD_STATUSES = (
+    "queued",
+    "submitted",
+    "downloading",
+    "stalled",
+    "checking",
+    "metaDL",
+    "allocating",
+    "moving",
+    "uploading",
+    "stalledUP",
+    "pausedUP",
+    "forcedUP",
+)
+_ACTIVE_DOWNLOAD_PREDICATE = text(
+    "status IN ({})".format(", ".join(f"'{status}'" for status in ACTIVE_DOWNLOAD_STATUSES))
+)
+
+
 class Download(Base):
     __tablename__ = "downloads"
+    __table_args__ = (
+        Index(
+            "ix_downloads_active_status",
+            "status",
+            postgresql_where=_ACTIVE_DOWNLOAD_PREDICATE,
+            sqlite_where=_ACTIVE_DOWNLOAD_PREDICATE,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True, index=True
@@ -49,6 +82,53 @@ class Download(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, default=datetime.utcnow, server_default=func.now()
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        server_default=func.now(),
+    )
+
+
+# Rendered as literals: planners only use the partial index when they can
+# see that the query's IN list matches its predicate.
+ACTIVE_DOWNLOAD_FILTER = Download.status.in_(
+    bindparam(
+        "active_statuses",
+        ACTIVE_DOWNLOAD_STATUSES,
+        expanding=True,
+        literal_execute=True,
+    )
+)
+
+
+# Completed or failed downloads, kept out of the hot ``downloads`` table.
+FINISHED_DOWNLOAD_FILTER = or_(
+    Download.status == "completed", Download.status.like("error%")
+)
+
+
+class DownloadHistory(Base):
+    """Finished download moved out of ``downloads`` by ``archive_downloads``."""
+
+    __tablename__ = "download_history"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # Id the row had in ``downloads``; SQLite may hand it out again once the
+    # row is gone, so it is not unique here.
+    download_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    name: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    magnet: Mapped[str] = mapped_column(Text, nullable=False)
+    save_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    status: Mapped[str] = mapped_column(String(32), nullable=False)
+    progress: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    finished_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow, server_default=func.now()
+    )
 
 
 class Tracker(Base):
@@ -72,17 +152,59 @@ class Tracker(Base):
     )
 
 
+# Text search configuration of ``ix_catalog_items_search_tsv``; ``simple``
+# skips stemming, which suits titles in any language.
+SEARCH_CONFIG = "simple"
+
+
+class CatalogItem(Base):
+    """One ``DiscoverItem`` snapshot per (kind, id), shared by every list."""
+
+    __tablename__ = "catalog_items"
+
+    kind: Mapped[str] = mapped_column(String(16), primary_key=True)
+    id: Mapped[str] = mapped_column(String(256), primary_key=True)
+    snapshot: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # Lower-cased title, subtitle and genres of the snapshot, for search.
+    search_text: Mapped[str] = mapped_column(
+        Text, nullable=False, default="", server_default=""
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        server_default=func.now(),
+    )
+
+    # ``library.search`` on Postgres: full-text matches through the
+    # ``tsvector`` index, typo-tolerant ones through the trigram index.
+    # SQLite falls back to ``LIKE`` and gets neither.
+    __table_args__ = (
+        Index(
+            "ix_catalog_items_search_tsv",
+            text(f"to_tsvector('{SEARCH_CONFIG}', search_text)"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_catalog_items_search_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
 class LibraryEntry(Base):
     __tablename__ = "library_entries"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    list_type: Mapped[str] = mapped_column(String(32), index=True)
-    item_kind: Mapped[str] = mapped_column(String(16), index=True)
+    list_type: Mapped[str] = mapped_column(String(32))
+    item_kind: Mapped[str] = mapped_column(String(16))
     item_id: Mapped[str] = mapped_column(String(256), index=True)
     playlist_slug: Mapped[str | None] = mapped_column(
         String(64), nullable=True, index=True
     )
-    snapshot: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, default=datetime.utcnow, server_default=func.now()
     )
@@ -95,6 +217,12 @@ class LibraryEntry(Base):
     )
 
     __table_args__ = (
+        # The item's snapshot lives in ``catalog_items``.
+        ForeignKeyConstraint(
+            ["item_kind", "item_id"],
+            ["catalog_items.kind", "catalog_items.id"],
+            name="fk_library_entries_catalog_item",
+        ),
         UniqueConstraint(
             "list_type",
             "item_kind",
@@ -102,6 +230,22 @@ class LibraryEntry(Base):
             "playlist_slug",
             name="uq_library_entry",
         ),
+        # Summary grouping and per-list keyset pagination.
+        Index(
+            "ix_library_entries_list_order",
+            "list_type",
+            "playlist_slug",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        # Entries of an item across lists: the catalog foreign key and the
+        # orphan check when entries are removed.
+        Index(
+            "ix_library_entries_item_recent",
+            "item_kind",
+            "item_id",
+            text("created_at DESC"),
+        ),
     )
 
 
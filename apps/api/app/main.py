@@ -9,11 +9,13 @@ import redis.asyncio as redis
 from sqlalchemy.exc import IntegrityError
 
 from app.core.config import settings
+from app.core import settings_version
 from app.core.runtime_service_settings import runtime_service_settings
 from app.db.init_db import init_db
-from app.db.session import session_scope
+from app.db.session import async_engine, session_scope
 from app.routers import health, auth, downloads
 from app.routes import discovery as discovery_routes
+from phelia.discovery.providers import http as discovery_http
 from phelia.routers import discovery as discovery_router
 from app.api.v1.endpoints import discover as discover_endpoints
 from app.api.v1.endpoints import meta as meta_endpoints
@@ -22,6 +24,7 @@ from app.api.v1.endpoints import capabilities as capabilities_endpoints
 from app.api.v1.endpoints import library as library_endpoints
 from app.api.v1.endpoints import details as details_endpoints
 from app.api.v1.endpoints import settings as settings_endpoints
+from app.services import discovery_rails
 from app.services.qbittorrent.health import qb_login_ok
 from app.services.search.prowlarr.provider import ProwlarrProvider
 from app.services.search.registry import search_registry
@@ -83,6 +86,11 @@ async def startup_event():
     except Exception:
         logger.exception("Error initializing Prowlarr search provider")
 
+    # Reload settings changed by other workers; the Prowlarr provider holds
+    # its own copy, so it is rebuilt after the runtime snapshots reload.
+    settings_version.register_reloader(settings_endpoints._refresh_prowlarr_provider)
+    settings_version.start_listener()
+
     try:
         login_ok = await asyncio.to_thread(qb_login_ok)
         if login_ok is False:
@@ -93,6 +101,14 @@ async def startup_event():
         logger.exception("Error checking qBittorrent connectivity")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    settings_version.stop_listener()
+    await discovery_http.close_clients()
+    await discovery_rails.close_redis()
+    await async_engine.dispose()
+
+
 @app.websocket("/ws/downloads/{download_id}")
 async def download_ws(websocket: WebSocket, download_id: int):
     await websocket.accept()
@@ -1,16 +1,19 @@
 from __future__ import annotations
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 import logging
 import time
+from datetime import datetime
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, model_validator
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.db import models
 from app.core.runtime_service_settings import runtime_service_settings
+from app.services import download_history
 from app.services.jobs.tasks import celery_app
 from app.services.bt.qbittorrent import QbClient
 
@@ -61,6 +64,26 @@ class DownloadOut(BaseModel):
         from_attributes = True
 
 
+class DownloadHistoryOut(BaseModel):
+    id: int
+    download_id: int
+    name: Optional[str] = None
+    hash: Optional[str] = None
+    status: str
+    progress: float
+    save_path: str
+    created_at: datetime
+    finished_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class DownloadHistoryPage(BaseModel):
+    items: List[DownloadHistoryOut]
+    next_cursor: Optional[str] = None
+
+
 def _qb() -> QbClient:
     qb = runtime_service_settings.qbittorrent_snapshot()
     return QbClient(qb.url, qb.username, qb.password)
@@ -72,6 +95,19 @@ def list_downloads(db: Session = Depends(get_db)):
     return q
 
 
+@router.get("/history", response_model=DownloadHistoryPage)
+def list_download_history(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    try:
+        items, next_cursor = download_history.history_page(db, limit=limit, cursor=cursor)
+    except download_history.InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail="invalid_cursor") from exc
+    return DownloadHistoryPage(items=items, next_cursor=next_cursor)
+
+
 @router.post("", response_model=dict, status_code=201)
 def create_download(body: DownloadCreate, db: Session = Depends(get_db)):
     downloads = runtime_service_settings.download_snapshot()
@@ -134,8 +170,8 @@ def create_download(body: DownloadCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/{download_id}/pause", status_code=204)
-async def pause_download(download_id: int, db: Session = Depends(get_db)):
-    dl = db.get(models.Download, download_id)
+async def pause_download(download_id: int, db: AsyncSession = Depends(get_async_db)):
+    dl = await db.get(models.Download, download_id)
     if not dl:
         raise HTTPException(404, "Not found")
     if not dl.hash:
@@ -149,8 +185,8 @@ async def pause_download(download_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/{download_id}/resume", status_code=204)
-async def resume_download(download_id: int, db: Session = Depends(get_db)):
-    dl = db.get(models.Download, download_id)
+async def resume_download(download_id: int, db: AsyncSession = Depends(get_async_db)):
+    dl = await db.get(models.Download, download_id)
     if not dl:
         raise HTTPException(404, "Not found")
     if not dl.hash:
@@ -165,9 +201,9 @@ async def resume_download(download_id: int, db: Session = Depends(get_db)):
 
 @router.delete("/{download_id}", status_code=204)
 async def delete_download(
-    download_id: int, withFiles: bool = False, db: Session = Depends(get_db)
+    download_id: int, withFiles: bool = False, db: AsyncSession = Depends(get_async_db)
 ):
-    dl = db.get(models.Download, download_id)
+    dl = await db.get(models.Download, download_id)
     if not dl:
         raise HTTPException(404, "Not found")
     if dl.hash:
@@ -176,6 +212,6 @@ async def delete_download(
             logger.info("Deleting torrent %s (files=%s)", dl.hash, withFiles)
             await qb.delete_torrent(dl.hash, withFiles)
             logger.info("Deleted torrent %s", dl.hash)
-    db.delete(dl)
-    db.commit()
+    await db.delete(dl)
+    await db.commit()
     return JSONResponse(status_code=204, content={})
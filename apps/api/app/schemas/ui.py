@@ -40,14 +40,35 @@ class LibraryPlaylist(BaseModel):
     id: str
     title: str
     items: list[DiscoverItem] = Field(default_factory=list)
+    next_cursor: str | None = None
 
 
 class LibrarySummary(BaseModel):
-    """Aggregated lists rendered on the Library route."""
+    """Aggregated lists rendered on the Library route.
+
+    When the summary is limited per list, a ``*_next_cursor`` is set for
+    every truncated list; pass it to ``GET /library/list`` for more items.
+    """
 
     watchlist: list[DiscoverItem] = Field(default_factory=list)
     favorites: list[DiscoverItem] = Field(default_factory=list)
     playlists: list[LibraryPlaylist] = Field(default_factory=list)
+    watchlist_next_cursor: str | None = None
+    favorites_next_cursor: str | None = None
+
+
+class LibraryListPage(BaseModel):
+    """One page of a single library list, newest first."""
+
+    items: list[DiscoverItem] = Field(default_factory=list)
+    next_cursor: str | None = None
+
+
+class LibrarySearchPage(BaseModel):
+    """One page of library items matching a search, best match first."""
+
+    items: list[DiscoverItem] = Field(default_factory=list)
+    next_cursor: str | None = None
 
 
 class ListMutationItem(BaseModel):
@@ -83,6 +104,20 @@ class ListMutationInput(BaseModel):
     )
 
 
+class ListBatchInput(BaseModel):
+    """Several list mutations applied together in one transaction."""
+
+    mutations: list[ListMutationInput] = Field(min_length=1, max_length=1000)
+
+
+class ListBatchResult(BaseModel):
+    """Outcome of a batch mutation."""
+
+    success: bool = True
+    added: int = 0
+    removed: int = 0
+
+
 class CastMember(BaseModel):
     name: str
     role: str | None = None
@@ -1,79 +1,117 @@
-from typing import Dict, List
+"""Apple Music / iTunes RSS feeds used by the discovery rails."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Dict, List, Optional
 import logging
 
 import httpx
 
+from app.core.circuit_breaker import CircuitOpenError, get_breaker
+
 logger = logging.getLogger(__name__)
 
 # iTunes RSS API endpoints
 ITUNES_RSS_BASE = "https://rss.applemarketingtools.com/api/v2"
 ITUNES_RSS_FALLBACK = "https://rss.itunes.apple.com/api/v1"
 
+FEED_TIMEOUT = 10.0
+
+Parser = Callable[[dict], List[Dict[str, object]]]
 
-def apple_feed(
+
+async def apple_feed(
     storefront: str,
     genre_id: int,
     feed: str = "most-recent",
     kind: str = "albums",
     limit: int = 50,
 ) -> List[Dict[str, object]]:
-    """Fetch Apple Music RSS feed data with fallback support."""
+    """Fetch Apple Music RSS feed data with fallback support.
 
-    # Try the new Apple Marketing Tools API first
-    try:
-        return _fetch_from_marketing_tools(storefront, genre_id, feed, kind, limit)
-    except Exception as e:
-        logger.warning(f"Apple Marketing Tools API failed: {e}")
+    Every candidate URL (Marketing Tools first, then the legacy iTunes RSS
+    feeds) is requested at once.  The most preferred candidate that returns
+    results wins, as soon as every candidate ranked above it has failed, and
+    the remaining requests are cancelled.
 
-    # Fallback to iTunes RSS API
-    try:
-        return _fetch_from_itunes_rss(storefront, genre_id, feed, kind, limit)
-    except Exception as e:
-        logger.warning(f"iTunes RSS API failed: {e}")
+    When no candidate is reachable several times in a row the ``apple_rss``
+    circuit breaker opens and the feed is skipped until it half-opens.
+    """
 
-    # Return empty list if both fail
-    logger.error("All Apple RSS APIs failed")
-    return []
+    candidates = _marketing_tools_urls(storefront, genre_id, feed, kind, limit)
+    candidates += _itunes_rss_urls(storefront, feed, limit)
 
+    try:
+        with get_breaker("apple_rss").call():
+            items = await _race(candidates)
+    except CircuitOpenError:
+        logger.debug("Apple RSS skipped while its circuit is open")
+        return []
+    except _FeedUnavailable:
+        logger.error("All Apple RSS APIs failed")
+        return []
+    if not items:
+        logger.error("All Apple RSS APIs failed")
+    return items
 
-def _fetch_from_marketing_tools(
-    storefront: str, genre_id: int, feed: str, kind: str, limit: int
-) -> List[Dict[str, object]]:
-    """Fetch from Apple Marketing Tools API."""
-    # Try different URL formats
-    urls_to_try = [
-        f"{ITUNES_RSS_BASE}/{storefront}/music/{feed}/{kind}/{limit}/explicit.json",
-        f"{ITUNES_RSS_BASE}/{storefront}/music/{feed}/{kind}/{limit}.json",
-    ]
 
-    if genre_id:
-        urls_to_try.insert(
-            0,
-            f"{ITUNES_RSS_BASE}/{storefront}/music/{feed}/{kind}/{limit}/genre={genre_id}/explicit.json",
-        )
-        urls_to_try.insert(
-            1,
-            f"{ITUNES_RSS_BASE}/{storefront}/music/{feed}/{kind}/{limit}/genre={genre_id}.json",
-        )
+class _FeedUnavailable(Exception):
+    """No Apple RSS candidate could be fetched at all."""
+
 
-    for url in urls_to_try:
+async def _race(candidates: List[tuple[str, Parser]]) -> List[Dict[str, object]]:
+    async with httpx.AsyncClient(timeout=FEED_TIMEOUT) as client:
+        tasks = [
+            asyncio.create_task(_fetch_candidate(client, url, parse))
+            for url, parse in candidates
+        ]
         try:
-            response = httpx.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            results = data.get("feed", {}).get("results", [])
-            if results:
-                return _normalize_marketing_tools_results(results)
-        except Exception:
-            continue
+            reachable = False
+            for task in tasks:
+                items = await task
+                if items:
+                    return items
+                reachable = reachable or items is not None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    if not reachable:
+        raise _FeedUnavailable()
+    return []
 
-    raise Exception("No valid Marketing Tools API endpoint found")
 
+async def _fetch_candidate(
+    client: httpx.AsyncClient, url: str, parse: Parser
+) -> Optional[List[Dict[str, object]]]:
+    """Return the parsed items, ``[]`` for an empty feed, ``None`` on failure."""
+    try:
+        response = await client.get(url)
+        response.raise_for_status()
+        return parse(response.json())
+    except Exception as exc:  # noqa: BLE001 - any failure just loses the race
+        logger.debug("Apple RSS candidate failed url=%s error=%s", url, exc)
+        return None
 
-def _fetch_from_itunes_rss(
+
+def _marketing_tools_urls(
     storefront: str, genre_id: int, feed: str, kind: str, limit: int
-) -> List[Dict[str, object]]:
-    """Fetch from iTunes RSS API."""
+) -> List[tuple[str, Parser]]:
+    """Candidate Apple Marketing Tools API URLs, most specific first."""
+    base = f"{ITUNES_RSS_BASE}/{storefront}/music/{feed}/{kind}/{limit}"
+    urls = [f"{base}/explicit.json", f"{base}.json"]
+    if genre_id:
+        urls[:0] = [
+            f"{base}/genre={genre_id}/explicit.json",
+            f"{base}/genre={genre_id}.json",
+        ]
+    return [(url, _parse_marketing_tools) for url in urls]
+
+
+def _itunes_rss_urls(storefront: str, feed: str, limit: int) -> List[tuple[str, Parser]]:
+    """Candidate iTunes RSS API URLs."""
     # Map feed types to iTunes RSS endpoints - use working endpoints
     feed_map = {
         "most-recent": "topalbums",  # newreleases doesn't work, use topalbums
@@ -82,25 +120,21 @@ def _fetch_from_itunes_rss(
     }
 
     itunes_feed = feed_map.get(feed, "topalbums")
-
-    # Try different working iTunes RSS endpoints
-    urls_to_try = [
+    urls = [
         f"https://itunes.apple.com/{storefront}/rss/{itunes_feed}/limit={limit}/json",
         f"https://itunes.apple.com/{storefront}/rss/{itunes_feed}/limit={limit}/explicit/json",
     ]
+    return [(url, _parse_itunes_rss) for url in urls]
 
-    for url in urls_to_try:
-        try:
-            response = httpx.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            entries = data.get("feed", {}).get("entry", [])
-            if entries:
-                return _normalize_itunes_results(entries)
-        except Exception:
-            continue
-
-    raise Exception("No working iTunes RSS endpoint found")
+
+def _parse_marketing_tools(data: dict) -> List[Dict[str, object]]:
+    results = data.get("feed", {}).get("results", [])
+    return _normalize_marketing_tools_results(results) if results else []
+
+
+def _parse_itunes_rss(data: dict) -> List[Dict[str, object]]:
+    entries = data.get("feed", {}).get("entry", [])
+    return _normalize_itunes_results(entries) if entries else []
 
 
 def _normalize_marketing_tools_results(results: List[Dict]) -> List[Dict[str, object]]:
@@ -12,4 +12,37 @@ CURATED = [
     {"key": "classical", "label": "Classical", "appleGenreId": 5},
 ]
 
-__all__ = ["CURATED"]
+# Slug -> MusicBrainz tag normalization for common genres.
+# Extend freely; keys are slugs you use in the UI.
+GENRE_SLUG_TO_MB_TAG: dict[str, str] = {
+    "techno": "techno",
+    "house": "house",
+    "ambient": "ambient",
+    "drum-and-bass": "drum and bass",
+    "dnb": "drum and bass",
+    "metal": "metal",
+    "rock": "rock",
+    "hip-hop": "hip hop",
+    "hiphop": "hip hop",
+    "electronic": "electronic",
+    "indie": "indie",
+    "pop": "pop",
+    "jazz": "jazz",
+    "classical": "classical",
+}
+
+
+def mb_tag_for_slug(slug: str) -> str:
+    """MusicBrainz tag for a genre key, e.g. ``"dnb"`` -> ``"drum and bass"``."""
+
+    key = slug.strip().lower()
+    return GENRE_SLUG_TO_MB_TAG.get(key, key.replace("-", " "))
+
+
+def curated_mb_tags() -> list[str]:
+    """MusicBrainz tags of the curated genres, as the discovery rails query them."""
+
+    return list(dict.fromkeys(mb_tag_for_slug(row["key"]) for row in CURATED))
+
+
+__all__ = ["CURATED", "GENRE_SLUG_TO_MB_TAG", "curated_mb_tags", "mb_tag_for_slug"]
@@ -1,10 +1,11 @@
 import datetime as dt
 import logging
-import time
 from typing import Dict, List
 
 import httpx
 
+from app.core.rate_limit import rate_limiter, retry_after_seconds
+
 logger = logging.getLogger(__name__)
 
 UA = "Phelia/1.0 (contact: admin@example.com)"
@@ -12,15 +13,19 @@ BASE = "https://musicbrainz.org/ws/2"
 
 
 def _get(path: str, params: Dict[str, str], timeout: int = 12) -> dict:
+    url = f"{BASE}/{path}"
     for attempt in range(3):
+        rate_limiter.acquire_sync(url)
         response = httpx.get(
-            f"{BASE}/{path}",
+            url,
             params=params,
             headers={"User-Agent": UA},
             timeout=timeout,
         )
         if response.status_code in (503, 429):
-            time.sleep(1.5 * (attempt + 1))
+            rate_limiter.backoff_sync(
+                url, retry_after_seconds(response, 1.5 * (attempt + 1))
+            )
             continue
         response.raise_for_status()
         return response.json()
@@ -0,0 +1,795 @@
+"""Discovery rails (/new, /top) and the route cache behind them.
+
+The rails are built from the optional providers, falling back to
+MusicBrainz, and cached in Redis stale-while-revalidate.  They live here
+rather than in :mod:`app.routes.discovery` so that the prewarm job can
+rebuild them without importing the router.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable, Generator, Iterable, Sequence
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Dict, Optional
+
+import httpx
+import redis.asyncio as redis_async
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.rate_limit import rate_limiter, retry_after_seconds
+from app.core.redis import OptionalRedis
+from app.services.discovery_genres import (
+    CURATED,
+    GENRE_SLUG_TO_MB_TAG,
+    mb_tag_for_slug,
+)
+from app.services.metadata.release_groups import artist_album_cache
+from phelia.discovery import cache as discovery_cache
+
+logger = logging.getLogger(__name__)
+
+apple_feed = None  # type: ignore[assignment]
+discovery_service = None  # type: ignore[assignment]
+
+DEFAULT_PROVIDER_STATUS = {
+    "lastfm": False,
+    "deezer": False,
+    "itunes": False,
+    "musicbrainz": False,
+    "listenbrainz": False,
+    "spotify": False,
+}
+
+try:  # pragma: no cover - optional providers might not be available in tests
+    from app.services.discovery_apple import apple_feed as _apple_feed
+except Exception:  # pragma: no cover - importer resilience
+    _apple_feed = None
+else:
+    apple_feed = _apple_feed
+
+try:  # pragma: no cover - optional providers might not be available in tests
+    from phelia.discovery import service as _phelia_discovery_service
+except Exception:  # pragma: no cover - importer resilience
+    _phelia_discovery_service = None
+else:
+
+    def _model_dump(item: Any) -> Dict[str, Any]:  # pragma: no cover - thin adapter
+        if hasattr(item, "model_dump"):
+            return item.model_dump(mode="json")  # type: ignore[no-any-return]
+        if isinstance(item, dict):
+            return dict(item)
+        data = {}
+        for key in (
+            "id",
+            "title",
+            "artist",
+            "cover_url",
+            "release_date",
+            "source",
+            "tags",
+        ):
+            value = getattr(item, key, None)
+            if value is not None:
+                data[key] = value
+        return data
+
+    class _DiscoveryServiceAdapter:  # pragma: no cover - behaviour exercised via routes
+        def __init__(self, module: Any) -> None:
+            self._module = module
+
+        async def fetch_new_releases(
+            self, *, market: str | None, limit: int
+        ) -> list[dict[str, Any]]:
+            items = await self._module.get_new_releases(market=market, limit=limit)
+            return [_model_dump(item) for item in items]
+
+        async def fetch_top(
+            self, *, kind: str, tag: str, feed: str, limit: int
+        ) -> list[dict[str, Any]]:  # noqa: ARG002 - unused params
+            items = await self._module.get_tag(tag=tag, limit=limit)
+            return [_model_dump(item) for item in items]
+
+        async def search(self, query: str, limit: int) -> list[dict[str, Any]]:
+            items = await self._module.quick_search(query=query, limit=limit)
+            return [_model_dump(item) for item in items]
+
+        async def providers_status(self) -> dict[str, bool]:
+            status = await self._module.providers_status()
+            if hasattr(status, "model_dump"):
+                return status.model_dump(exclude={"health"})
+            if isinstance(status, dict):
+                return status
+            return DEFAULT_PROVIDER_STATUS.copy()
+
+    discovery_service = _DiscoveryServiceAdapter(_phelia_discovery_service)
+#
+# If your module previously imported/defined `discovery_service` and `GENRES_BY_ID`,
+# keep them present. This file is resilient: it will use them when available,
+# and gracefully fall back to MusicBrainz/CAA when not.
+#
+
+
+# Shared ``redis.asyncio`` client behind the route caches.  While Redis is
+# unreachable the routes skip the cache instead of paying a connect timeout
+# per request.
+_redis = OptionalRedis("discovery route cache")
+
+
+async def get_redis() -> redis_async.Redis | None:
+    if not _redis.available:
+        return None
+    return _redis.async_client()
+
+
+async def close_redis() -> None:
+    await _redis.aclose()
+
+
+def _mark_redis_down(cache: Any, exc: Exception) -> None:
+    if _redis.owns(cache):
+        _redis.mark_down(exc)
+
+
+def _resolve_cache_backend(candidate: Any) -> Any:
+    """Normalize redis dependency outputs (generator, direct client, None)."""
+
+    if candidate in (None, False):
+        return None
+
+    if isinstance(candidate, Generator):
+        try:
+            value = next(candidate)
+        except StopIteration:
+            return None
+        try:  # pragma: no cover - defensive cleanup
+            candidate.close()
+        except Exception:
+            pass
+        return value
+
+    return candidate
+
+
+async def get_cache(redis: Any) -> Any:
+    cache = _resolve_cache_backend(redis)
+    if cache not in (None, False):
+        return cache
+
+    fallback: Callable[[], Any] | None = globals().get("get_redis")  # type: ignore[assignment]
+    if callable(fallback):
+        try:
+            candidate = fallback()
+        except TypeError:
+            candidate = fallback  # pragma: no cover - defensive branch
+        if inspect.isawaitable(candidate):
+            candidate = await candidate
+        cache = _resolve_cache_backend(candidate)
+        if cache not in (None, False):
+            return cache
+
+    return None
+
+
+async def _cache_command(cache: Any, name: str, *args: Any, **kwargs: Any) -> Any:
+    """Run a Redis command without blocking the event loop.
+
+    ``redis.asyncio`` clients (or any client with coroutine methods) are
+    awaited directly; a synchronous client is pushed onto a worker thread.
+    """
+
+    method = getattr(cache, name)
+    if isinstance(cache, redis_async.Redis) or inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    return await asyncio.to_thread(method, *args, **kwargs)
+
+
+def _cache_usable(cache: Any) -> bool:
+    if not cache:
+        return False
+    return not _redis.owns(cache) or _redis.available
+
+
+async def cache_get_json(cache: Any, key: str) -> Any:
+    if not _cache_usable(cache):
+        return None
+    try:
+        raw = await _cache_command(cache, "get", key)
+    except Exception as exc:  # noqa: BLE001 - the cache is best effort
+        logger.debug("discovery cache read failed key=%s error=%s", key, exc)
+        _mark_redis_down(cache, exc)
+        return None
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+async def cache_set_json(cache: Any, key: str, payload: Any, ttl: int) -> None:
+    if not _cache_usable(cache):
+        return
+    try:
+        await _cache_command(cache, "set", key, json.dumps(payload), ex=ttl)
+    except Exception as exc:  # noqa: BLE001 - the cache is best effort
+        logger.debug("discovery cache write failed key=%s error=%s", key, exc)
+        _mark_redis_down(cache, exc)
+
+
+# The /new and /top rails are cached stale-while-revalidate: an entry is fresh
+# for _RAIL_FRESH_SECONDS and served for up to DISCOVERY_CACHE_TTL in total
+# while one background rebuild per key (across processes) replaces it.
+_RAIL_FRESH_SECONDS = 3600
+_RAIL_LOCK_SECONDS = 60
+
+RailBuilder = Callable[[], Awaitable[dict[str, Any]]]
+
+
+async def _store_rail(cache: Any, key: str, payload: dict[str, Any]) -> None:
+    entry = discovery_cache.wrap_entry(payload, _RAIL_FRESH_SECONDS)
+    ttl = max(_RAIL_FRESH_SECONDS, settings.DISCOVERY_CACHE_TTL)
+    await cache_set_json(cache, key, entry, ttl)
+
+
+async def _rebuild_rail(cache: Any, key: str, build: RailBuilder) -> None:
+    await _store_rail(cache, key, await build())
+
+
+async def cached_rail(cache: Any, key: str, build: RailBuilder) -> dict[str, Any]:
+    """Serve a rail from ``cache``, building it on a miss.
+
+    A stale entry is returned as is and rebuilt in the background.  Entries
+    written before the envelope was introduced count as fresh.
+    """
+
+    entry = await cache_get_json(cache, key)
+    if entry is not None:
+        payload, fresh = discovery_cache.unwrap_entry(entry)
+        if isinstance(payload, dict) and "items" in payload:
+            if not fresh:
+                discovery_cache.schedule_refresh(
+                    key,
+                    partial(_rebuild_rail, cache, key, build),
+                    lock_ttl=_RAIL_LOCK_SECONDS,
+                )
+            return payload
+    payload = await build()
+    await _store_rail(cache, key, payload)
+    return payload
+
+
+async def call_provider(fn: Callable[..., Any], *args: Any) -> Any:
+    """Call an optional provider function, off the event loop if it is sync."""
+
+    if inspect.iscoroutinefunction(fn):
+        return await fn(*args)
+    result = await asyncio.to_thread(fn, *args)
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+def _extract_items_from_payload(data: Any) -> list[Any]:
+    if not data:
+        return []
+    if isinstance(data, dict):
+        items = data.get("items")
+        if isinstance(items, list):
+            return items
+        return []
+    if isinstance(data, list):
+        return data
+    return []
+
+
+def normalize_items(items: Iterable[Any]) -> list[dict[str, Any]]:
+    normalized: list[dict[str, Any]] = []
+    for item in items:
+        if not item:
+            continue
+        if hasattr(item, "model_dump"):
+            data = item.model_dump(mode="json")  # type: ignore[assignment]
+        elif isinstance(item, dict):
+            data = dict(item)
+        else:
+            data = {}
+            for key in (
+                "id",
+                "title",
+                "artist",
+                "cover_url",
+                "cover",
+                "artwork",
+                "release_date",
+                "releaseDate",
+                "source",
+                "source_url",
+                "url",
+            ):
+                value = getattr(item, key, None)
+                if value is not None:
+                    data[key] = value
+        if "title" not in data and "name" in data:
+            data["title"] = data.get("name")
+        if "artist" not in data and "artistName" in data:
+            data["artist"] = data.get("artistName")
+        if "artist" not in data and "creator" in data:
+            data["artist"] = data.get("creator")
+        normalized.append(data)
+    return normalized
+
+
+def iter_items(data: Any) -> Iterable[Any]:
+    items = _extract_items_from_payload(data)
+    if items:
+        return items
+    if isinstance(data, dict):
+        return [data]
+    if isinstance(data, (str, bytes)):
+        return []
+    if isinstance(data, Iterable):
+        return data
+    return []
+
+
+def _dedupe_items(items: Sequence[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
+    seen: set[str] = set()
+    out: list[dict[str, Any]] = []
+    for item in items:
+        title = str(item.get("title", "")).strip().lower()
+        artist = str(item.get("artist", "")).strip().lower()
+        identifier = str(item.get("id") or "").strip()
+        key = "::".join(filter(None, (identifier, title, artist)))
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        out.append(item)
+        if len(out) >= limit:
+            break
+    return out
+
+
+def _coerce_fields(item: dict[str, Any]) -> None:
+    if "cover_url" not in item:
+        for key in ("cover", "artwork", "artworkUrl100", "image"):
+            value = item.get(key)
+            if isinstance(value, str) and value:
+                item["cover_url"] = value
+                break
+    if "release_date" not in item:
+        for key in ("releaseDate", "firstReleaseDate", "first-release-date", "year"):
+            value = item.get(key)
+            if isinstance(value, str) and value:
+                item["release_date"] = value
+                break
+    if "source" not in item:
+        for key in ("provider", "origin", "storefront"):
+            value = item.get(key)
+            if isinstance(value, str) and value:
+                item["source"] = value
+                break
+
+
+def prepare_payload(items: Iterable[dict[str, Any]], limit: int) -> dict[str, Any]:
+    normalized = normalize_items(items)
+    for entry in normalized:
+        _coerce_fields(entry)
+    deduped = _dedupe_items(normalized, limit)
+    return {"items": deduped}
+
+
+def _safe_get_mb_tag_from_id(genre_id: Optional[int]) -> Optional[str]:
+    """Resolve a MusicBrainz tag from internal GENRES_BY_ID mapping if it exists."""
+    if genre_id is None:
+        return None
+    mapping = globals().get("GENRES_BY_ID")
+    if not mapping:
+        return None
+    # mapping may be a dict with int or str keys. Values can be objects or dicts.
+    rec = mapping.get(genre_id) or mapping.get(str(genre_id))
+    if not rec:
+        return None
+    # Try object attribute first, then dict.
+    mb_tag = getattr(rec, "musicbrainz_tag", None)
+    if not mb_tag and isinstance(rec, dict):
+        mb_tag = rec.get("musicbrainz_tag")
+    return mb_tag
+
+
+def normalize_genre(tag: Optional[str], genre_id: Optional[int]) -> str:
+    """Normalize input (?genre=slug OR ?genre_id=INT) into a MusicBrainz tag."""
+    mb_tag = _safe_get_mb_tag_from_id(genre_id)
+    if mb_tag:
+        return mb_tag
+    if tag:
+        t = GENRE_SLUG_TO_MB_TAG.get(tag.strip().lower())
+        if t:
+            return t
+    raise HTTPException(status_code=400, detail="Unknown genre/genre_id")
+
+
+def _resolve_apple_genre_id(
+    *, genre: Optional[str], genre_id: Optional[int], mb_tag: str
+) -> int:
+    if genre_id is not None:
+        return genre_id
+    normalized_input = (genre or "").strip().lower()
+    for row in CURATED:
+        apple_genre_id = row.get("appleGenreId")
+        if not isinstance(apple_genre_id, int):
+            continue
+        key = str(row.get("key") or "").strip().lower()
+        if normalized_input and key == normalized_input:
+            return apple_genre_id
+        if mb_tag_for_slug(key) == mb_tag:
+            return apple_genre_id
+    return 0
+
+
+async def mb_get_json(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    headers = {"User-Agent": "Phelia/1.0 (self-hosted)"}
+    await rate_limiter.acquire(url)
+    async with httpx.AsyncClient(timeout=15.0, headers=headers) as cx:
+        try:
+            r = await cx.get(url, params=params)
+            r.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            status_code = exc.response.status_code if exc.response else 502
+            if status_code in (429, 503):
+                await rate_limiter.backoff(url, retry_after_seconds(exc.response, 1.0))
+            detail = f"musicbrainz_error_{status_code}"
+            raise HTTPException(status_code=status_code, detail=detail) from exc
+        except httpx.HTTPError as exc:
+            raise HTTPException(
+                status_code=502, detail="musicbrainz_unreachable"
+            ) from exc
+        return r.json()
+
+
+# Artist MBIDs OR'ed into one release-group search by the top rail fallback.
+_MB_ARTIST_BATCH = 10
+# Release groups per page of that search, and the pages read at most; prolific
+# artists can fill the first page and push the others out of it.
+_MB_SEARCH_PAGE = 100
+_MB_SEARCH_MAX_PAGES = 3
+
+
+def _compact_album(rg: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": rg.get("id"),
+        "title": rg.get("title"),
+        "first-release-date": rg.get("first-release-date"),
+    }
+
+
+async def _lookup_artist_albums(artist_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Pick a representative album for each artist with one paged search.
+
+    The highest scored release group without secondary types (live,
+    compilation, ...) wins; any album is used when an artist has none.
+    Artists without a match map to ``{}`` only when the search was read to
+    the end; when it was cut short they are left out, so they are not
+    cached as having no album.
+    """
+
+    clause = " OR ".join(f"arid:{artist_id}" for artist_id in artist_ids)
+    wanted = set(artist_ids)
+    studio: Dict[str, Dict[str, Any]] = {}
+    other: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    complete = False
+    for _ in range(_MB_SEARCH_MAX_PAGES):
+        data = await mb_get_json(
+            "https://musicbrainz.org/ws/2/release-group",
+            {
+                "query": f"({clause}) AND primarytype:album",
+                "fmt": "json",
+                "limit": str(_MB_SEARCH_PAGE),
+                "offset": str(offset),
+            },
+        )
+        groups = data.get("release-groups") or []
+        for rg in groups:
+            target = other if rg.get("secondary-types") else studio
+            for credit in rg.get("artist-credit") or []:
+                artist = credit.get("artist") if isinstance(credit, dict) else None
+                artist_id = (artist or {}).get("id")
+                if artist_id in wanted and artist_id not in target:
+                    target[artist_id] = _compact_album(rg)
+        offset += len(groups)
+        total = data.get("count")
+        if len(groups) < _MB_SEARCH_PAGE or (
+            isinstance(total, int) and offset >= total
+        ):
+            complete = True
+            break
+        if wanted.issubset(studio):
+            break
+    albums = {**other, **studio}
+    if complete:
+        for artist_id in artist_ids:
+            albums.setdefault(artist_id, {})
+    return albums
+
+
+async def _resolve_artist_albums(
+    artist_ids: Sequence[str],
+) -> Dict[str, Dict[str, Any]]:
+    """Map artist MBIDs to a representative album, batching cache misses.
+
+    Results (including "no album") are kept in ``artist_album_cache`` so the
+    rail is built from cache on later requests; artists a truncated search
+    did not reach are not cached and are looked up again next time.  Batches
+    go through ``mb_get_json`` and therefore the shared MusicBrainz rate
+    limit.
+    """
+
+    keys = list(dict.fromkeys(artist_ids))
+    cached = await artist_album_cache.get_many((artist_id,) for artist_id in keys)
+    albums = {key[0]: value for key, value in cached.items()}
+    missing = [artist_id for artist_id in keys if artist_id not in albums]
+    batches = [
+        missing[i : i + _MB_ARTIST_BATCH]
+        for i in range(0, len(missing), _MB_ARTIST_BATCH)
+    ]
+    results = await asyncio.gather(
+        *(_lookup_artist_albums(batch) for batch in batches),
+        return_exceptions=True,
+    )
+    for batch, result in zip(batches, results):
+        if isinstance(result, BaseException):
+            logger.warning(
+                "discovery top: musicbrainz album batch failed artists=%d error=%s",
+                len(batch),
+                getattr(result, "detail", result),
+            )
+            continue
+        for artist_id in batch:
+            album = result.get(artist_id)
+            if album is None:
+                continue
+            albums[artist_id] = album
+            await artist_album_cache.set((artist_id,), album)
+    return {artist_id: album for artist_id, album in albums.items() if album}
+
+def new_cache_key(mb_tag: str, days: int, limit: int) -> str:
+    return f"discovery:new:{mb_tag}:{days}:{limit}"
+
+
+def top_cache_key(
+    genre: Optional[str], genre_id: Optional[int], kind: str, feed: str, limit: int
+) -> str:
+    if isinstance(genre, str) and genre.strip():
+        cache_subject = f"slug:{genre.strip().lower()}"
+    elif genre_id is not None:
+        cache_subject = f"id:{genre_id}"
+    else:
+        cache_subject = "all"
+    return f"discovery:top:{cache_subject}:{kind}:{feed}:{limit}"
+
+
+async def build_new_rail(
+    *,
+    genre: Optional[str],
+    genre_id: Optional[int],
+    mb_tag: str,
+    days: int,
+    limit: int,
+) -> dict[str, Any]:
+    since = (datetime.utcnow() - timedelta(days=days)).date().isoformat()
+
+    aggregate: list[dict[str, Any]] = []
+
+    apple_fn = globals().get("apple_feed")
+    if callable(apple_fn):
+        try:
+            storefront = getattr(settings, "APPLE_RSS_STOREFRONT", "us")
+            resolved_genre_id = _resolve_apple_genre_id(
+                genre=genre, genre_id=genre_id, mb_tag=mb_tag
+            )
+            items = await call_provider(
+                apple_fn, storefront, resolved_genre_id, "most-recent", "albums", limit
+            )
+            aggregate.extend(normalize_items(iter_items(items or [])))
+        except httpx.HTTPError:
+            pass
+        except Exception:
+            pass
+
+    # Use provider service only for actual new releases.
+    svc = globals().get("discovery_service")
+    if svc and hasattr(svc, "fetch_new_releases"):
+        try:
+            releases = await svc.fetch_new_releases(market=None, limit=limit)  # type: ignore[arg-type]
+            aggregate.extend(normalize_items(iter_items(releases)))
+        except Exception:
+            pass
+
+    # MusicBrainz fallback (no keys required)
+    if not aggregate:
+        query = (
+            f'tag:"{mb_tag}" AND primarytype:Album AND firstreleasedate:[{since} TO *]'
+        )
+        try:
+            data = await mb_get_json(
+                "https://musicbrainz.org/ws/2/release-group",
+                {"query": query, "fmt": "json", "limit": str(limit), "offset": "0"},
+            )
+        except HTTPException:
+            data = {}
+        for rg in data.get("release-groups", []):
+            aggregate.append(
+                {
+                    "id": rg.get("id"),
+                    "title": rg.get("title"),
+                    "artist": (rg.get("artist-credit") or [{}])[0].get("name"),
+                    "releaseDate": rg.get("first-release-date"),
+                    "cover": f"https://coverartarchive.org/release-group/{rg.get('id')}/front-250",
+                    "source": "musicbrainz",
+                }
+            )
+            if len(aggregate) >= limit:
+                break
+
+    return prepare_payload(aggregate, limit)
+
+
+async def build_top_rail(
+    *,
+    genre: Optional[str],
+    genre_id: Optional[int],
+    kind: str,
+    feed: str,
+    limit: int,
+) -> dict[str, Any]:
+    mb_tag: Optional[str] = None
+
+    def ensure_mb_tag() -> Optional[str]:
+        nonlocal mb_tag
+        if mb_tag is not None:
+            return mb_tag
+        try:
+            mb_tag = normalize_genre(genre, genre_id)
+        except HTTPException:
+            mb_tag = None
+        return mb_tag
+
+    aggregate: list[dict[str, Any]] = []
+
+    # Try existing provider first
+    svc = globals().get("discovery_service")
+    tag = ensure_mb_tag()
+    if svc and hasattr(svc, "fetch_top") and tag:
+        try:
+            items = await svc.fetch_top(kind=kind, tag=tag, feed=feed, limit=limit)  # type: ignore[arg-type]
+            aggregate.extend(normalize_items(iter_items(items)))
+        except Exception:
+            # continue to other providers on error
+            pass
+
+    # MusicBrainz fallback: get artists by tag, then one canonical album for each
+    # (resolved in batches and cached per artist)
+    if not tag and not aggregate:
+        raise HTTPException(status_code=400, detail="Unknown genre/genre_id")
+
+    if not aggregate and tag:
+        ar = await mb_get_json(
+            "https://musicbrainz.org/ws/2/artist",
+            {
+                "query": f'tag:"{tag}"',
+                "fmt": "json",
+                "limit": str(min(50, max(10, limit * 2))),
+            },
+        )
+        artists = [a for a in ar.get("artists", []) if a.get("id")]
+        albums = await _resolve_artist_albums([a["id"] for a in artists])
+        for a in artists:
+            rg0 = albums.get(a["id"])
+            if not rg0:
+                continue
+            aggregate.append(
+                {
+                    "id": rg0.get("id"),
+                    "title": rg0.get("title"),
+                    "artist": a.get("name"),
+                    "releaseDate": rg0.get("first-release-date"),
+                    "cover": f'https://coverartarchive.org/release-group/{rg0.get("id")}/front-250',
+                    "source": "musicbrainz",
+                }
+            )
+            if len(aggregate) >= limit:
+                break
+
+    return prepare_payload(aggregate, limit)
+
+
+# What the music page asks for per curated genre (apps/web routes/music.tsx).
+_PREWARM_RAIL_LIMIT = 30
+_PREWARM_NEW_DAYS = 30
+
+
+async def prewarm_rails() -> int:
+    """Rebuild the /new and /top entries the music page reads.
+
+    Run by the discovery prewarm job so visitors are served fresh entries
+    for every curated genre.  Returns the number of rails stored.
+    """
+
+    cache = await get_cache(None)
+    if cache is None:
+        return 0
+    limit = _PREWARM_RAIL_LIMIT
+    jobs = []
+    for row in CURATED:
+        slug = str(row["key"])
+        mb_tag = normalize_genre(slug, None)
+        new_build = partial(
+            build_new_rail,
+            genre=slug,
+            genre_id=None,
+            mb_tag=mb_tag,
+            days=_PREWARM_NEW_DAYS,
+            limit=limit,
+        )
+        top_build = partial(
+            build_top_rail,
+            genre=slug,
+            genre_id=row.get("appleGenreId"),
+            kind="albums",
+            feed="most-recent",
+            limit=limit,
+        )
+        jobs.append((new_cache_key(mb_tag, _PREWARM_NEW_DAYS, limit), new_build))
+        jobs.append(
+            (
+                top_cache_key(
+                    slug, row.get("appleGenreId"), "albums", "most-recent", limit
+                ),
+                top_build,
+            )
+        )
+
+    warmed = 0
+    results = await asyncio.gather(
+        *(_rebuild_rail(cache, key, build) for key, build in jobs),
+        return_exceptions=True,
+    )
+    for (key, _build), result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            logger.warning(
+                "discovery rail prewarm failed key=%s error=%s",
+                key,
+                getattr(result, "detail", result),
+            )
+        else:
+            warmed += 1
+    return warmed
+
+
+__all__ = [
+    "DEFAULT_PROVIDER_STATUS",
+    "build_new_rail",
+    "build_top_rail",
+    "cache_get_json",
+    "cache_set_json",
+    "cached_rail",
+    "call_provider",
+    "close_redis",
+    "get_cache",
+    "get_redis",
+    "iter_items",
+    "mb_get_json",
+    "new_cache_key",
+    "normalize_genre",
+    "normalize_items",
+    "prepare_payload",
+    "prewarm_rails",
+    "top_cache_key",
+]
@@ -0,0 +1,122 @@
+"""Archive finished downloads and page through the archive.
+
+``downloads`` only needs the rows the poller and the Downloads page work
+with.  Completed and failed downloads are moved to ``download_history`` once
+they have been finished for ``DOWNLOAD_ARCHIVE_AFTER`` seconds, by the
+``archive_downloads`` Celery beat task.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.db import models
+
+logger = logging.getLogger(__name__)
+
+_ARCHIVE_BATCH = 500
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a history cursor cannot be decoded."""
+
+
+def archive_finished(
+    db: Session,
+    *,
+    older_than: timedelta,
+    batch_size: int = _ARCHIVE_BATCH,
+    now: datetime | None = None,
+) -> int:
+    """Move downloads finished before ``now - older_than`` to the history.
+
+    Each batch is copied and deleted in its own transaction, so a large
+    backlog does not hold one long lock on ``downloads``.
+    """
+
+    cutoff = (now or datetime.utcnow()) - older_than
+    download = models.Download
+    history = models.DownloadHistory
+    archived = 0
+    while True:
+        ids = list(
+            db.scalars(
+                select(download.id)
+                .where(models.FINISHED_DOWNLOAD_FILTER)
+                .where(download.updated_at < cutoff)
+                .order_by(download.id)
+                .limit(batch_size)
+            )
+        )
+        if not ids:
+            return archived
+        try:
+            db.execute(
+                insert(history).from_select(
+                    [
+                        history.download_id,
+                        history.hash,
+                        history.name,
+                        history.magnet,
+                        history.save_path,
+                        history.status,
+                        history.progress,
+                        history.created_at,
+                        history.finished_at,
+                    ],
+                    select(
+                        download.id,
+                        download.hash,
+                        download.name,
+                        download.magnet,
+                        download.save_path,
+                        download.status,
+                        download.progress,
+                        download.created_at,
+                        download.updated_at,
+                    )
+                    .where(download.id.in_(ids))
+                    .order_by(download.id),
+                )
+            )
+            db.execute(
+                delete(download)
+                .where(download.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        archived += len(ids)
+        logger.info("Archived %d finished downloads", len(ids))
+        if len(ids) < batch_size:
+            return archived
+
+
+def history_page(
+    db: Session, *, limit: int = 50, cursor: str | None = None
+) -> tuple[list[models.DownloadHistory], str | None]:
+    """Return archived downloads newest first, continuing after ``cursor``."""
+
+    history = models.DownloadHistory
+    stmt = select(history).order_by(history.id.desc()).limit(limit + 1)
+    if cursor:
+        try:
+            before_id = int(cursor)
+        except ValueError as exc:
+            raise InvalidCursorError(cursor) from exc
+        stmt = stmt.where(history.id < before_id)
+    rows = list(db.scalars(stmt))
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = str(rows[-1].id)
+    return rows, next_cursor
+
+
+__all__ = ["InvalidCursorError", "archive_finished", "history_page"]
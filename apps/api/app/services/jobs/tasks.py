@@ -4,20 +4,27 @@ import asyncio
 import inspect
 import logging
 import shutil
+from datetime import timedelta
 from pathlib import Path
 from typing import List, Optional
 from urllib.parse import parse_qs, unquote, urlparse
 
 import httpx
 from celery import Celery
+from celery.signals import worker_process_init
 from sqlalchemy.orm import Session
 
+from app.core import settings_version
 from app.core.config import settings
 from app.core.runtime_service_settings import runtime_service_settings
-from app.db.models import Download
+from app.db.models import ACTIVE_DOWNLOAD_FILTER, Download
 from app.db.session import SessionLocal
+from app.services import discovery_rails, download_history
 from app.services.broadcast import broadcast_download
 from app.services.bt.qbittorrent import QbClient, QbittorrentLoginError
+from phelia.discovery import cache as discovery_cache
+from phelia.discovery import service as discovery_service
+from phelia.discovery.providers import http as discovery_http
 
 
 celery_app = Celery(
@@ -35,10 +42,26 @@ celery_app.conf.beat_schedule = {
         "schedule": _POLL_SECONDS,
     }
 }
+if settings.DOWNLOAD_ARCHIVE_INTERVAL > 0:
+    celery_app.conf.beat_schedule["archive-downloads"] = {
+        "task": "app.services.jobs.tasks.archive_downloads",
+        "schedule": float(settings.DOWNLOAD_ARCHIVE_INTERVAL),
+    }
+if settings.DISCOVERY_PREWARM_INTERVAL > 0:
+    celery_app.conf.beat_schedule["prewarm-discovery"] = {
+        "task": "app.services.jobs.tasks.prewarm_discovery",
+        "schedule": float(settings.DISCOVERY_PREWARM_INTERVAL),
+    }
 celery_app.conf.timezone = "UTC"
 logger = logging.getLogger(__name__)
 
 
+@worker_process_init.connect
+def _start_settings_listener(**_kwargs) -> None:
+    # Each forked pool process keeps its own settings snapshot current.
+    settings_version.start_listener()
+
+
 def _qb() -> QbClient:
     qb = runtime_service_settings.qbittorrent_snapshot()
     return QbClient(
@@ -332,24 +355,7 @@ def poll_status() -> int:
     try:
         active: List[Download] = (
             db.query(Download)
-            .filter(
-                Download.status.in_(
-                    (
-                        "queued",
-                        "submitted",
-                        "downloading",
-                        "stalled",
-                        "checking",
-                        "metaDL",
-                        "allocating",
-                        "moving",
-                        "uploading",
-                        "stalledUP",
-                        "pausedUP",
-                        "forcedUP",
-                    )
-                )
-            )
+            .filter(ACTIVE_DOWNLOAD_FILTER)
             .all()
         )
         if not active:
@@ -427,4 +433,48 @@ def poll_status() -> int:
         db.close()
 
 
-__all__ = ["celery_app", "enqueue_download", "poll_status"]
+@celery_app.task(name="app.services.jobs.tasks.archive_downloads")
+def archive_downloads() -> int:
+    """Move long-finished downloads out of the hot ``downloads`` table."""
+
+    db = _db()
+    try:
+        return download_history.archive_finished(
+            db, older_than=timedelta(seconds=settings.DOWNLOAD_ARCHIVE_AFTER)
+        )
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.services.jobs.tasks.prewarm_discovery")
+def prewarm_discovery() -> int:
+    """Refresh discovery rails so user requests are served from cache."""
+
+    async def _run() -> int:
+        try:
+            # Provider entries first, so the route rails rebuild from them.
+            warmed = await discovery_service.prewarm()
+            return warmed + await discovery_rails.prewarm_rails()
+        finally:
+            # The async Redis and HTTP clients are bound to this short-lived
+            # event loop.
+            await discovery_cache.reset_cache()
+            await discovery_http.close_clients()
+            await discovery_rails.close_redis()
+
+    try:
+        warmed = asyncio.run(_run())
+    except Exception as exc:
+        logger.warning("Discovery prewarm failed: %s", exc)
+        return 0
+    logger.info("Discovery prewarm refreshed %d rails", warmed)
+    return warmed
+
+
+__all__ = [
+    "archive_downloads",
+    "celery_app",
+    "enqueue_download",
+    "poll_status",
+    "prewarm_discovery",
+]
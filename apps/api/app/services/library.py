@@ -2,15 +2,38 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+import re
+from collections import defaultdict
+from collections.abc import Iterator, Sequence
 from datetime import datetime
-from typing import Iterable
-
+from typing import Any
+
+from sqlalchemy import (
+    Row,
+    Select,
+    and_,
+    case,
+    delete,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db import models
 from app.schemas.ui import (
     DiscoverItem,
+    LibraryListPage,
     LibraryPlaylist,
+    LibrarySearchPage,
     LibrarySummary,
     ListMutationInput,
     ListMutationItem,
@@ -29,6 +52,36 @@ class PlaylistRequiredError(LibraryError):
     """Raised when playlist mutations are missing an identifier."""
 
 
+class InvalidCursorError(LibraryError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+# Columns needed to render an entry, next to its catalog snapshot; reading
+# them directly skips the ORM identity map for what can be thousands of rows.
+_ENTRY_COLUMNS = (
+    "id",
+    "list_type",
+    "playlist_slug",
+    "item_kind",
+    "item_id",
+    "created_at",
+)
+
+
+def _with_snapshot(source: Any) -> Select[Any]:
+    """Select the entry columns of ``source`` plus the item's catalog snapshot."""
+
+    catalog = models.CatalogItem.__table__
+    return select(
+        *(source.c[name] for name in _ENTRY_COLUMNS), catalog.c.snapshot
+    ).join_from(
+        source,
+        catalog,
+        and_(catalog.c.kind == source.c.item_kind, catalog.c.id == source.c.item_id),
+        isouter=True,
+    )
+
+
 def _as_discover(item: ListMutationItem) -> DiscoverItem:
     payload = item.model_dump()
     payload.setdefault("title", item.id)
@@ -37,174 +90,523 @@ def _as_discover(item: ListMutationItem) -> DiscoverItem:
     return DiscoverItem.model_validate(payload)
 
 
-def _entry_to_discover(entry: models.LibraryEntry) -> DiscoverItem:
-    snapshot = entry.snapshot or {}
+def _entry_to_discover(entry: Row[Any]) -> DiscoverItem:
+    # Snapshots are ``DiscoverItem.model_dump()`` output, validated when they
+    # were stored, so they are not validated again on every read.
+    snapshot = dict(entry.snapshot or {})
     snapshot.setdefault("id", entry.item_id)
     snapshot.setdefault("kind", entry.item_kind)
-    snapshot.setdefault("title", snapshot.get("title") or entry.item_id)
-    return DiscoverItem.model_validate(snapshot)
+    if not snapshot.get("title"):
+        snapshot["title"] = entry.item_id
+    return DiscoverItem.model_construct(**snapshot)
 
 
-def _ensure_playlist(
-    db: Session, slug: str, title: str | None = None
-) -> models.LibraryPlaylist:
-    playlist = (
-        db.query(models.LibraryPlaylist)
-        .filter(models.LibraryPlaylist.slug == slug)
-        .one_or_none()
-    )
-    if playlist is None:
-        playlist = models.LibraryPlaylist(slug=slug, title=title or slug)
-        db.add(playlist)
-        db.commit()
-        db.refresh(playlist)
-    elif title and playlist.title != title:
-        playlist.title = title
-        playlist.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(playlist)
-    return playlist
+def encode_cursor(created_at: datetime, entry_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{entry_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
 
-def _upsert_entry(
-    db: Session,
-    *,
-    list_type: str,
-    item: DiscoverItem,
-    playlist_slug: str | None = None,
-) -> models.LibraryEntry:
-    query = (
-        db.query(models.LibraryEntry)
-        .filter(models.LibraryEntry.list_type == list_type)
-        .filter(models.LibraryEntry.item_kind == item.kind)
-        .filter(models.LibraryEntry.item_id == item.id)
-    )
-    if playlist_slug:
-        query = query.filter(models.LibraryEntry.playlist_slug == playlist_slug)
-    else:
-        query = query.filter(models.LibraryEntry.playlist_slug.is_(None))
-
-    entry = query.one_or_none()
-    snapshot = item.model_dump()
-    if entry is None:
-        entry = models.LibraryEntry(
-            list_type=list_type,
-            item_kind=item.kind,
-            item_id=item.id,
-            playlist_slug=playlist_slug,
-            snapshot=snapshot,
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, entry_id = (
+            base64.urlsafe_b64decode(padded).decode("utf-8").rsplit("|", 1)
         )
-        db.add(entry)
-    else:
-        entry.snapshot = snapshot
-        entry.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(entry)
-    return entry
+        return datetime.fromisoformat(created_at), int(entry_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError) as exc:
+        raise InvalidCursorError(cursor) from exc
 
 
-def _delete_entry(
-    db: Session,
-    *,
-    list_type: str,
-    item: ListMutationItem,
-    playlist_slug: str | None = None,
-) -> bool:
-    query = (
-        db.query(models.LibraryEntry)
-        .filter(models.LibraryEntry.list_type == list_type)
-        .filter(models.LibraryEntry.item_kind == item.kind)
-        .filter(models.LibraryEntry.item_id == item.id)
+def _page(
+    rows: Sequence[Row[Any]], limit: int | None
+) -> tuple[list[DiscoverItem], str | None]:
+    """Render ``rows`` (newest first, ``limit + 1`` at most) as one page."""
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return [_entry_to_discover(row) for row in rows], next_cursor
+
+
+# (list_type, item_kind, item_id, playlist_slug): the ``uq_library_entry`` key.
+EntryKey = tuple[str, str, str, str | None]
+
+_UNIQUE_COLUMNS = ("list_type", "item_kind", "item_id", "playlist_slug")
+# Keeps ``IN`` lists well below the bound-parameter limits of SQLite/asyncpg.
+_BATCH_CHUNK = 500
+
+
+def _chunks(values: Sequence[Any], size: int = _BATCH_CHUNK) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _insert(db: Session) -> Any:
+    """Return the dialect ``insert`` that supports ``ON CONFLICT``."""
+
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
+def _key_filter(keys: Sequence[EntryKey]) -> Any:
+    """Match ``keys`` with index lookups on ``uq_library_entry``.
+
+    Keys are grouped by (list_type, item_kind, playlist_slug) so each group is
+    an equality prefix plus ``item_id IN (...)``; a row-value ``IN`` over all
+    four columns cannot use the index (and NULL slugs never compare equal).
+    """
+
+    entry = models.LibraryEntry
+    groups: defaultdict[tuple[str, str, str | None], list[str]] = defaultdict(list)
+    for list_type, kind, item_id, slug in keys:
+        groups[(list_type, kind, slug)].append(item_id)
+    return or_(
+        *(
+            and_(
+                entry.list_type == list_type,
+                entry.item_kind == kind,
+                entry.item_id.in_(item_ids),
+                entry.playlist_slug.is_(None)
+                if slug is None
+                else entry.playlist_slug == slug,
+            )
+            for (list_type, kind, slug), item_ids in groups.items()
+        )
     )
-    if playlist_slug:
-        query = query.filter(models.LibraryEntry.playlist_slug == playlist_slug)
-    else:
-        query = query.filter(models.LibraryEntry.playlist_slug.is_(None))
-    entry = query.one_or_none()
-    if entry is None:
-        return False
-    db.delete(entry)
-    db.commit()
-    return True
 
 
-def apply_mutation(db: Session, mutation: ListMutationInput) -> None:
+def _resolve_list(mutation: ListMutationInput) -> tuple[str, str | None]:
     list_type = mutation.list
-    playlist_slug = None
     if list_type == "playlist":
         if not mutation.playlist_id:
             raise PlaylistRequiredError("playlist id required")
-        playlist_slug = mutation.playlist_id
-        _ensure_playlist(db, playlist_slug, title=mutation.playlist_title)
-        list_type = "playlist"
-    elif list_type not in {"watchlist", "favorites"}:
+        return list_type, mutation.playlist_id
+    if list_type not in {"watchlist", "favorites"}:
         raise UnknownListError(list_type)
+    return list_type, None
+
+
+def _ensure_playlists(
+    db: Session, titles: dict[str, str | None], now: datetime
+) -> None:
+    if not titles:
+        return
+    existing = {
+        playlist.slug: playlist
+        for playlist in db.query(models.LibraryPlaylist).filter(
+            models.LibraryPlaylist.slug.in_(list(titles))
+        )
+    }
+    for slug, title in titles.items():
+        playlist = existing.get(slug)
+        if playlist is None:
+            db.add(models.LibraryPlaylist(slug=slug, title=title or slug))
+        elif title and playlist.title != title:
+            playlist.title = title
+            playlist.updated_at = now
+    db.flush()
+
+
+def _search_text(snapshot: dict[str, Any]) -> str:
+    parts = [snapshot.get("title"), snapshot.get("subtitle")]
+    parts.extend(snapshot.get("genres") or [])
+    return " ".join(str(part) for part in parts if part).lower()
+
+
+def _upsert_catalog(
+    db: Session, snapshots: dict[tuple[str, str], dict[str, Any]], now: datetime
+) -> None:
+    """Store one snapshot per (kind, id), replacing the previous one."""
+
+    stmt = _insert(db)(models.CatalogItem.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["kind", "id"],
+        set_={
+            "snapshot": stmt.excluded.snapshot,
+            "search_text": stmt.excluded.search_text,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(
+        stmt,
+        [
+            {
+                "kind": kind,
+                "id": item_id,
+                "snapshot": snapshot,
+                "search_text": _search_text(snapshot),
+                "updated_at": now,
+            }
+            for (kind, item_id), snapshot in snapshots.items()
+        ],
+    )
 
-    item = _as_discover(mutation.item)
 
-    if mutation.action == "add":
-        _upsert_entry(db, list_type=list_type, item=item, playlist_slug=playlist_slug)
-    elif mutation.action == "remove":
-        _delete_entry(
-            db, list_type=list_type, item=mutation.item, playlist_slug=playlist_slug
+def _upsert_entries(db: Session, keys: Sequence[EntryKey], now: datetime) -> None:
+    """``INSERT ... ON CONFLICT (uq_library_entry) DO UPDATE`` the entries.
+
+    The constraint cannot see watchlist/favorites rows (their slug is NULL),
+    so those are matched up front and updated by primary key instead.
+    """
+
+    entry = models.LibraryEntry
+    unslugged = [key for key in keys if key[3] is None]
+    existing: dict[EntryKey, int] = {}
+    for chunk in _chunks(unslugged):
+        for row in db.execute(
+            select(entry.id, *(getattr(entry, name) for name in _UNIQUE_COLUMNS))
+            .where(_key_filter(chunk))
+        ):
+            existing[(row.list_type, row.item_kind, row.item_id, None)] = row.id
+    if existing:
+        db.execute(
+            update(entry),
+            [{"id": entry_id, "updated_at": now} for entry_id in existing.values()],
         )
-    else:
-        raise UnknownListError(mutation.action)
+    values = [
+        {
+            "list_type": list_type,
+            "item_kind": kind,
+            "item_id": item_id,
+            "playlist_slug": slug,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for list_type, kind, item_id, slug in keys
+        if (list_type, kind, item_id, slug) not in existing
+    ]
+    if not values:
+        return
+
+    stmt = _insert(db)(entry.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(_UNIQUE_COLUMNS),
+        set_={"updated_at": stmt.excluded.updated_at},
+    )
+    db.execute(stmt, values)
 
 
-def _collect_entries(entries: Iterable[models.LibraryEntry]) -> list[DiscoverItem]:
-    return [_entry_to_discover(entry) for entry in entries]
+def _delete_entries(db: Session, keys: Sequence[EntryKey]) -> int:
+    removed = 0
+    for chunk in _chunks(keys):
+        result = db.execute(
+            delete(models.LibraryEntry)
+            .where(_key_filter(chunk))
+            .execution_options(synchronize_session=False)
+        )
+        removed += result.rowcount or 0
+    return removed
+
+
+def _prune_catalog(db: Session, items: set[tuple[str, str]]) -> None:
+    """Drop the catalog rows of ``items`` that no list references any more."""
+
+    catalog = models.CatalogItem
+    entry = models.LibraryEntry
+    by_kind: defaultdict[str, list[str]] = defaultdict(list)
+    for kind, item_id in items:
+        by_kind[kind].append(item_id)
+    referenced = (
+        select(entry.id)
+        .where(entry.item_kind == catalog.kind, entry.item_id == catalog.id)
+        .exists()
+    )
+    for kind, item_ids in by_kind.items():
+        for chunk in _chunks(item_ids):
+            db.execute(
+                delete(catalog)
+                .where(catalog.kind == kind, catalog.id.in_(chunk), ~referenced)
+                .execution_options(synchronize_session=False)
+            )
 
 
-def build_summary(db: Session) -> LibrarySummary:
-    watchlist_entries = (
-        db.query(models.LibraryEntry)
-        .filter(models.LibraryEntry.list_type == "watchlist")
-        .filter(models.LibraryEntry.playlist_slug.is_(None))
-        .order_by(models.LibraryEntry.created_at.desc())
-        .all()
-    )
-    favorites_entries = (
-        db.query(models.LibraryEntry)
-        .filter(models.LibraryEntry.list_type == "favorites")
-        .filter(models.LibraryEntry.playlist_slug.is_(None))
-        .order_by(models.LibraryEntry.created_at.desc())
-        .all()
+def apply_mutations(
+    db: Session, mutations: Sequence[ListMutationInput]
+) -> dict[str, int]:
+    """Apply ``mutations`` in order, in a single transaction.
+
+    Later mutations of the same entry win, so an add followed by a remove
+    leaves the item out.  Every mutation is validated before anything is
+    written; adds become one ``INSERT ... ON CONFLICT`` upsert and removes
+    one bulk ``DELETE``.
+    """
+
+    playlist_titles: dict[str, str | None] = {}
+    pending: dict[EntryKey, DiscoverItem | None] = {}
+    for mutation in mutations:
+        list_type, playlist_slug = _resolve_list(mutation)
+        if playlist_slug is not None:
+            title = mutation.playlist_title or playlist_titles.get(playlist_slug)
+            playlist_titles[playlist_slug] = title
+        key = (list_type, mutation.item.kind, mutation.item.id, playlist_slug)
+        # Re-insert so the dict keeps the order of the last mutation.
+        pending.pop(key, None)
+        if mutation.action == "add":
+            pending[key] = _as_discover(mutation.item)
+        elif mutation.action == "remove":
+            pending[key] = None
+        else:
+            raise UnknownListError(mutation.action)
+
+    now = datetime.utcnow()
+    adds = [key for key, item in pending.items() if item is not None]
+    removes = [key for key, item in pending.items() if item is None]
+    # One snapshot per item, however many lists it is added to.
+    snapshots = {
+        (key[1], key[2]): item.model_dump()
+        for key, item in pending.items()
+        if item is not None
+    }
+    try:
+        _ensure_playlists(db, playlist_titles, now)
+        removed = _delete_entries(db, removes)
+        if adds:
+            _upsert_catalog(db, snapshots, now)
+            _upsert_entries(db, adds, now)
+        if removes:
+            _prune_catalog(db, {(key[1], key[2]) for key in removes})
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {"added": len(adds), "removed": removed}
+
+
+def apply_mutation(db: Session, mutation: ListMutationInput) -> None:
+    apply_mutations(db, [mutation])
+
+
+def build_summary(db: Session, *, limit: int | None = None) -> LibrarySummary:
+    """Load every list with one entry query and group the rows in Python.
+
+    With ``limit`` each list (watchlist, favorites, every playlist) is cut to
+    its ``limit`` newest entries inside the same query, using a per-list
+    ``row_number()`` window, and truncated lists get a ``next_cursor``.
+    """
+
+    table = models.LibraryEntry.__table__
+    if limit is None:
+        source = table
+        stmt = _with_snapshot(table)
+    else:
+        rank = (
+            func.row_number()
+            .over(
+                partition_by=(table.c.list_type, table.c.playlist_slug),
+                order_by=(table.c.created_at.desc(), table.c.id.desc()),
+            )
+            .label("list_rank")
+        )
+        source = select(
+            *(table.c[name] for name in _ENTRY_COLUMNS), rank
+        ).subquery()
+        stmt = _with_snapshot(source).where(source.c.list_rank <= limit + 1)
+    stmt = stmt.order_by(
+        source.c.list_type,
+        source.c.playlist_slug,
+        source.c.created_at.desc(),
+        source.c.id.desc(),
     )
 
+    groups: defaultdict[tuple[str, str | None], list[Row[Any]]] = defaultdict(list)
+    for row in db.execute(stmt):
+        groups[(row.list_type, row.playlist_slug)].append(row)
+
+    watchlist, watchlist_cursor = _page(groups[("watchlist", None)], limit)
+    favorites, favorites_cursor = _page(groups[("favorites", None)], limit)
     playlists: list[LibraryPlaylist] = []
     for playlist in (
         db.query(models.LibraryPlaylist)
         .order_by(models.LibraryPlaylist.created_at.asc())
         .all()
     ):
-        items = (
-            db.query(models.LibraryEntry)
-            .filter(models.LibraryEntry.list_type == "playlist")
-            .filter(models.LibraryEntry.playlist_slug == playlist.slug)
-            .order_by(models.LibraryEntry.created_at.desc())
-            .all()
-        )
+        items, cursor = _page(groups[("playlist", playlist.slug)], limit)
         playlists.append(
             LibraryPlaylist(
                 id=playlist.slug,
                 title=playlist.title,
-                items=_collect_entries(items),
+                items=items,
+                next_cursor=cursor,
             )
         )
 
     return LibrarySummary(
-        watchlist=_collect_entries(watchlist_entries),
-        favorites=_collect_entries(favorites_entries),
+        watchlist=watchlist,
+        favorites=favorites,
         playlists=playlists,
+        watchlist_next_cursor=watchlist_cursor,
+        favorites_next_cursor=favorites_cursor,
+    )
+
+
+def list_page(
+    db: Session,
+    list_type: str,
+    *,
+    playlist_slug: str | None = None,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> LibraryListPage:
+    """Return one page of a single list, continuing after ``cursor``."""
+
+    if list_type == "playlist":
+        if not playlist_slug:
+            raise PlaylistRequiredError("playlist id required")
+    elif list_type in {"watchlist", "favorites"}:
+        playlist_slug = None
+    else:
+        raise UnknownListError(list_type)
+
+    entry = models.LibraryEntry
+    stmt = _with_snapshot(entry.__table__).where(entry.list_type == list_type)
+    if playlist_slug:
+        stmt = stmt.where(entry.playlist_slug == playlist_slug)
+    else:
+        stmt = stmt.where(entry.playlist_slug.is_(None))
+    if cursor:
+        created_at, entry_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                entry.created_at < created_at,
+                (entry.created_at == created_at) & (entry.id < entry_id),
+            )
+        )
+    stmt = stmt.order_by(entry.created_at.desc(), entry.id.desc()).limit(limit + 1)
+
+    items, next_cursor = _page(db.execute(stmt).all(), limit)
+    return LibraryListPage(items=items, next_cursor=next_cursor)
+
+
+def _search_offset(cursor: str | None) -> int:
+    # Results are ranked rather than ordered by a column, so pages continue
+    # by offset.
+    if not cursor:
+        return 0
+    try:
+        offset = int(cursor)
+    except ValueError as exc:
+        raise InvalidCursorError(cursor) from exc
+    if offset < 0:
+        raise InvalidCursorError(cursor)
+    return offset
+
+
+def _search_statement(dialect: str, terms: Sequence[str], kind: str | None) -> Select[Any]:
+    catalog = models.CatalogItem
+    phrase = " ".join(terms)
+    if dialect == "postgresql":
+        # Must render as the ``ix_catalog_items_search_tsv`` expression.
+        config = literal_column(f"'{models.SEARCH_CONFIG}'")
+        vector = func.to_tsvector(config, catalog.search_text)
+        tsquery = func.to_tsquery(config, " & ".join(f"{term}:*" for term in terms))
+        match = or_(
+            vector.op("@@")(tsquery),
+            literal(phrase).op("<%")(catalog.search_text),
+        )
+        rank = func.ts_rank_cd(vector, tsquery) + func.word_similarity(
+            phrase, catalog.search_text
+        )
+    else:
+        match = and_(
+            *(catalog.search_text.contains(term, autoescape=True) for term in terms)
+        )
+        rank = case(
+            (catalog.search_text.startswith(phrase, autoescape=True), 1), else_=0
+        )
+
+    stmt = select(
+        catalog.kind.label("item_kind"),
+        catalog.id.label("item_id"),
+        catalog.snapshot,
+    ).where(match)
+    if kind:
+        stmt = stmt.where(catalog.kind == kind)
+    return stmt.order_by(rank.desc(), catalog.kind, catalog.id)
+
+
+def search(
+    db: Session,
+    query: str,
+    *,
+    kind: str | None = None,
+    limit: int = 20,
+    cursor: str | None = None,
+) -> LibrarySearchPage:
+    """Return library items whose title, subtitle or genres match ``query``.
+
+    On Postgres every word matches as a prefix through the ``tsvector``
+    index, or the whole query matches approximately through the trigram
+    index; results are ranked by ``ts_rank_cd`` plus trigram word
+    similarity.  Elsewhere (SQLite in tests) every word must appear as a
+    substring and titles starting with the query rank first.
+    """
+
+    offset = _search_offset(cursor)
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return LibrarySearchPage()
+
+    stmt = _search_statement(db.get_bind().dialect.name, terms, kind)
+    rows = db.execute(stmt.offset(offset).limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = str(offset + limit)
+    return LibrarySearchPage(
+        items=[_entry_to_discover(row) for row in rows], next_cursor=next_cursor
     )
 
 
-def get_entry(db: Session, kind: str, item_id: str) -> models.LibraryEntry | None:
-    return (
-        db.query(models.LibraryEntry)
-        .filter(models.LibraryEntry.item_kind == kind)
-        .filter(models.LibraryEntry.item_id == item_id)
-        .order_by(models.LibraryEntry.created_at.desc())
-        .first()
+def get_catalog_item(db: Session, kind: str, item_id: str) -> models.CatalogItem | None:
+    """Return the stored snapshot of an item that is in at least one list."""
+
+    return db.get(models.CatalogItem, (kind, item_id))
+
+
+# ``async def`` endpoints run the same ORM code on an ``AsyncSession`` through
+# ``run_sync``: the queries go through the async driver instead of blocking
+# the event loop.
+
+
+async def build_summary_async(
+    db: AsyncSession, *, limit: int | None = None
+) -> LibrarySummary:
+    return await db.run_sync(build_summary, limit=limit)
+
+
+async def list_page_async(
+    db: AsyncSession,
+    list_type: str,
+    *,
+    playlist_slug: str | None = None,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> LibraryListPage:
+    return await db.run_sync(
+        list_page, list_type, playlist_slug=playlist_slug, limit=limit, cursor=cursor
     )
+
+
+async def apply_mutations_async(
+    db: AsyncSession, mutations: Sequence[ListMutationInput]
+) -> dict[str, int]:
+    return await db.run_sync(apply_mutations, mutations)
+
+
+async def search_async(
+    db: AsyncSession,
+    query: str,
+    *,
+    kind: str | None = None,
+    limit: int = 20,
+    cursor: str | None = None,
+) -> LibrarySearchPage:
+    return await db.run_sync(search, query, kind=kind, limit=limit, cursor=cursor)
+
+
+async def get_catalog_item_async(
+    db: AsyncSession, kind: str, item_id: str
+) -> models.CatalogItem | None:
+    return await db.get(models.CatalogItem, (kind, item_id))
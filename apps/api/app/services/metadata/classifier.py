@@ -160,3 +160,15 @@ class Classifier:
                 confidence = max(0.0, min(best_score / total_weight, 1.0))
 
         return Classification(type=best_type, confidence=confidence, reasons=reasons)
+
+    def classify_many(self, titles: Iterable[str]) -> list[Classification]:
+        """Classify ``titles`` in one pass, scoring each distinct title once."""
+
+        seen: Dict[str, Classification] = {}
+        results: list[Classification] = []
+        for title in titles:
+            classification = seen.get(title)
+            if classification is None:
+                classification = seen[title] = self.classify_torrent(title)
+            results.append(classification)
+        return results
@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from functools import lru_cache
 from typing import Any
 
 import httpx
 
+from app.core.config import settings
+from app.core.rate_limit import PRIORITY_DEFAULT, rate_limiter, retry_after_seconds
 from app.core.runtime_integration_settings import runtime_integration_settings
+from app.services.metadata.snapshot import freeze
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
 
 
 class MetadataProxyError(Exception):
@@ -19,6 +28,86 @@ class MetadataProxyError(Exception):
         self.detail = detail
 
 
+@dataclass
+class CachedResponse:
+    """Parsed upstream payload together with its HTTP validators."""
+
+    payload: Any
+    etag: str | None
+    last_modified: str | None
+    expires_at: float
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def validator_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Bounded LRU of upstream payloads used for conditional revalidation.
+
+    Payloads are stored frozen (see :mod:`app.services.metadata.snapshot`)
+    because the same object is handed to every caller.
+    """
+
+    def __init__(self, *, ttl: float, maxsize: int) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    @staticmethod
+    def key(url: str, params: dict[str, Any]) -> str:
+        visible = sorted(
+            (name, str(value)) for name, value in params.items() if name != "api_key"
+        )
+        return str(httpx.URL(url, params=visible))
+
+    def ttl_for(self, response: httpx.Response) -> float:
+        cache_control = response.headers.get("Cache-Control") or ""
+        if "no-store" in cache_control or "no-cache" in cache_control:
+            return 0.0
+        match = _MAX_AGE_RE.search(cache_control)
+        if match:
+            return min(float(match.group(1)), self.ttl)
+        return self.ttl
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: str, response: httpx.Response, payload: Any) -> Any:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        ttl = self.ttl_for(response)
+        if ttl <= 0 and not (etag or last_modified):
+            return payload
+        frozen = freeze(payload)
+        self._entries[key] = CachedResponse(
+            payload=frozen,
+            etag=etag,
+            last_modified=last_modified,
+            expires_at=time.monotonic() + ttl,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return frozen
+
+    def revalidated(self, entry: CachedResponse, response: httpx.Response) -> Any:
+        entry.expires_at = time.monotonic() + self.ttl_for(response)
+        entry.etag = response.headers.get("ETag") or entry.etag
+        entry.last_modified = response.headers.get("Last-Modified") or entry.last_modified
+        return entry.payload
+
+
 class MetadataClient:
     """Lightweight async client for third-party metadata providers."""
 
@@ -30,6 +119,10 @@ class MetadataClient:
     def __init__(self, *, timeout: float = 10.0) -> None:
         self._timeout = httpx.Timeout(timeout, connect=3.0, read=timeout, write=timeout)
         self._limits = httpx.Limits(max_connections=10, max_keepalive_connections=5)
+        self.response_cache = ResponseCache(
+            ttl=settings.METADATA_HTTP_CACHE_TTL,
+            maxsize=settings.METADATA_HTTP_CACHE_SIZE,
+        )
 
     async def _request(
         self,
@@ -38,16 +131,34 @@ class MetadataClient:
         *,
         params: dict[str, Any] | None,
         headers: dict[str, str] | None = None,
+        priority: int = PRIORITY_DEFAULT,
+        revalidate: bool = False,
     ) -> Any:
         url = f"{base_url.rstrip('/')}/{path.lstrip('/')}"
         req_headers = {"accept": "application/json"}
         if headers:
             req_headers.update(headers)
+
+        cache_key = self.response_cache.key(url, params or {}) if revalidate else None
+        cached = self.response_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            if cached.is_fresh():
+                return cached.payload
+            req_headers.update(cached.validator_headers())
+
+        await rate_limiter.acquire(url, priority=priority)
         async with httpx.AsyncClient(timeout=self._timeout, limits=self._limits) as client:
             response = await client.get(url, params=params or {}, headers=req_headers)
+        if response.status_code == 304 and cached is not None:
+            return self.response_cache.revalidated(cached, response)
+        if response.status_code in {429, 503}:
+            await rate_limiter.backoff(url, retry_after_seconds(response, 1.0))
         if response.status_code >= 400:
             raise MetadataProxyError(response.status_code, self._extract_error(response))
-        return response.json()
+        payload = response.json()
+        if cache_key:
+            return self.response_cache.store(cache_key, response, payload)
+        return payload
 
     @staticmethod
     def _extract_error(response: httpx.Response) -> Any:
@@ -65,6 +176,7 @@ class MetadataClient:
         params: dict[str, Any] | None = None,
         *,
         request_id: str | None = None,
+        priority: int = PRIORITY_DEFAULT,
     ) -> Any:
         api_key = runtime_integration_settings.get("tmdb.api_key")
         if not api_key:
@@ -74,7 +186,14 @@ class MetadataClient:
         headers = {"accept": "application/json"}
         if request_id:
             headers["x-request-id"] = request_id
-        return await self._request(self.tmdb_base_url, path, params=payload, headers=headers)
+        return await self._request(
+            self.tmdb_base_url,
+            path,
+            params=payload,
+            headers=headers,
+            priority=priority,
+            revalidate=True,
+        )
 
     async def lastfm(
         self,
@@ -82,6 +201,7 @@ class MetadataClient:
         params: dict[str, Any] | None = None,
         *,
         request_id: str | None = None,
+        priority: int = PRIORITY_DEFAULT,
     ) -> Any:
         api_key = runtime_integration_settings.get("lastfm.api_key")
         if not api_key:
@@ -93,7 +213,14 @@ class MetadataClient:
         headers = {"accept": "application/json"}
         if request_id:
             headers["x-request-id"] = request_id
-        return await self._request(self.lastfm_base_url, "", params=payload, headers=headers)
+        return await self._request(
+            self.lastfm_base_url,
+            "",
+            params=payload,
+            headers=headers,
+            priority=priority,
+            revalidate=True,
+        )
 
     async def mb(
         self,
@@ -101,6 +228,7 @@ class MetadataClient:
         params: dict[str, Any] | None = None,
         *,
         request_id: str | None = None,
+        priority: int = PRIORITY_DEFAULT,
     ) -> Any:
         payload = dict(params or {})
         payload.setdefault("fmt", "json")
@@ -111,7 +239,13 @@ class MetadataClient:
         }
         if request_id:
             headers["x-request-id"] = request_id
-        return await self._request(self.musicbrainz_base_url, path, params=payload, headers=headers)
+        return await self._request(
+            self.musicbrainz_base_url,
+            path,
+            params=payload,
+            headers=headers,
+            priority=priority,
+        )
 
     async def fanart(
         self,
@@ -119,6 +253,7 @@ class MetadataClient:
         params: dict[str, Any] | None = None,
         *,
         request_id: str | None = None,
+        priority: int = PRIORITY_DEFAULT,
     ) -> Any:
         api_key = runtime_integration_settings.get("fanart.api_key")
         if not api_key:
@@ -126,7 +261,13 @@ class MetadataClient:
         headers = {"api-key": api_key}
         if request_id:
             headers["x-request-id"] = request_id
-        return await self._request(self.fanart_base_url, path, params=params, headers=headers)
+        return await self._request(
+            self.fanart_base_url,
+            path,
+            params=params,
+            headers=headers,
+            priority=priority,
+        )
 
 
 @lru_cache
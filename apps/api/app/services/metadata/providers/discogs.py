@@ -7,6 +7,8 @@ from typing import Any, Callable
 
 import httpx
 
+from app.core.rate_limit import rate_limiter, retry_after_seconds
+
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +55,7 @@ class DiscogsClient:
             "type": "master",
             "per_page": per_page,
         }
+        await rate_limiter.acquire(self.base_url)
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 resp = await client.get(
@@ -63,6 +66,10 @@ class DiscogsClient:
                 resp.raise_for_status()
                 data = resp.json()
         except httpx.HTTPStatusError as exc:
+            if exc.response.status_code in (429, 503):
+                await rate_limiter.backoff(
+                    self.base_url, retry_after_seconds(exc.response, 1.0)
+                )
             logger.warning(
                 "discogs http error search=%s status=%s",
                 query,
@@ -99,6 +106,7 @@ class DiscogsClient:
             params["year"] = year
         if mb_release_group_id:
             params["mbid"] = mb_release_group_id
+        await rate_limiter.acquire(self.base_url)
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 resp = await client.get(
@@ -109,6 +117,10 @@ class DiscogsClient:
                 resp.raise_for_status()
                 data = resp.json()
         except httpx.HTTPStatusError as exc:
+            if exc.response.status_code in (429, 503):
+                await rate_limiter.backoff(
+                    self.base_url, retry_after_seconds(exc.response, 1.0)
+                )
             logger.warning(
                 "discogs http error album=%s status=%s", album, exc.response.status_code
             )
@@ -151,12 +163,17 @@ class DiscogsClient:
 
         if not resource_url:
             return None
+        await rate_limiter.acquire(resource_url)
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 resp = await client.get(resource_url, headers=self._headers())
                 resp.raise_for_status()
                 return resp.json()
         except httpx.HTTPStatusError as exc:
+            if exc.response.status_code in (429, 503):
+                await rate_limiter.backoff(
+                    resource_url, retry_after_seconds(exc.response, 1.0)
+                )
             logger.warning(
                 "discogs http error resource=%s status=%s",
                 resource_url,
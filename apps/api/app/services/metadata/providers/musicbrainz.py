@@ -7,11 +7,26 @@ from typing import Any
 
 import httpx
 
+from app.core.rate_limit import rate_limiter, retry_after_seconds
 from app.services.metadata.metadata_client import MetadataClient, MetadataProxyError
 
 logger = logging.getLogger(__name__)
 
 
+class MusicBrainzUnavailableError(Exception):
+    """Raised when MusicBrainz could not answer (throttled, down, unreachable).
+
+    Distinguishes a failed search from one that found nothing, so callers do
+    not cache an outage as a miss.  ``reason`` is the HTTP status or the
+    underlying error.
+    """
+
+    def __init__(self, path: str, reason: object) -> None:
+        super().__init__(f"MusicBrainz unavailable ({reason}) for {path}")
+        self.path = path
+        self.reason = reason
+
+
 class MusicBrainzClient:
     base_url = "https://musicbrainz.org/ws/2"
 
@@ -39,29 +54,33 @@ class MusicBrainzClient:
                 logger.warning(
                     "mb proxy error path=%s status=%s", path, exc.status_code
                 )
-                return None
+                raise MusicBrainzUnavailableError(path, exc.status_code) from exc
             except Exception as exc:  # pragma: no cover - defensive
                 logger.warning("mb proxy request error path=%s error=%s", path, exc)
-                return None
+                raise MusicBrainzUnavailableError(path, exc) from exc
             return data if isinstance(data, dict) else None
 
+        url = f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+        await rate_limiter.acquire(url)
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 resp = await client.get(
-                    f"{self.base_url.rstrip('/')}/{path.lstrip('/')}",
+                    url,
                     params=params,
                     headers=self._headers(),
                 )
                 resp.raise_for_status()
                 data = resp.json()
         except httpx.HTTPStatusError as exc:
+            if exc.response.status_code in (429, 503):
+                await rate_limiter.backoff(url, retry_after_seconds(exc.response, 1.0))
             logger.warning(
                 "mb http error path=%s status=%s", path, exc.response.status_code
             )
-            return None
+            raise MusicBrainzUnavailableError(path, exc.response.status_code) from exc
         except httpx.RequestError as exc:
             logger.warning("mb request error path=%s error=%s", path, exc)
-            return None
+            raise MusicBrainzUnavailableError(path, exc) from exc
         return data if isinstance(data, dict) else None
 
     async def lookup_release_group(
@@ -70,6 +89,12 @@ class MusicBrainzClient:
         album: str,
         year: int | None = None,
     ) -> dict[str, Any] | None:
+        """Return the best release group for ``album``, or ``None`` if none matched.
+
+        Raises :class:`MusicBrainzUnavailableError` when MusicBrainz could
+        not be queried.
+        """
+
         if not album:
             return None
         query_parts = [f'release:"{album}"']
@@ -106,4 +131,4 @@ class MusicBrainzClient:
         }
 
 
-__all__ = ["MusicBrainzClient"]
+__all__ = ["MusicBrainzClient", "MusicBrainzUnavailableError"]
@@ -0,0 +1,160 @@
+"""Persistent ``(artist, album)`` → MusicBrainz release-group cache.
+
+Discovery charts repeat the same albums day after day, and MusicBrainz only
+allows about one request per second, so resolved release groups are kept in
+Redis for weeks.  Misses are cached too (for a shorter period) so albums
+MusicBrainz does not know about are not searched for on every page view.
+
+An in-process LRU sits in front of Redis, and it keeps working on its own
+when Redis is unreachable.
+
+The discovery top rail uses a second instance, keyed by artist MBID, to
+remember each artist's representative album.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from app.core.config import settings
+from app.core.redis import OptionalRedis
+
+AlbumKey = tuple[str, str]
+CacheKey = tuple[str, ...]
+
+_KEY_PREFIX = "mb:release-group"
+# Stored for albums MusicBrainz has no release group for.
+_NO_MATCH: dict[str, Any] = {}
+
+
+def album_key(artist: str | None, album: str) -> AlbumKey:
+    """Return the normalised cache key for an artist/album pair."""
+
+    return (" ".join((artist or "").lower().split()), " ".join(album.lower().split()))
+
+
+def compact_release_group(data: dict[str, Any] | None) -> dict[str, Any]:
+    """Strip a ``lookup_release_group`` result down to what is cached."""
+
+    if not isinstance(data, dict):
+        return dict(_NO_MATCH)
+    return {
+        "artist": data.get("artist") or {},
+        "release_group": data.get("release_group") or {},
+    }
+
+
+class ReleaseGroupCache:
+    """Two-level (memory + Redis) cache of release-group lookups."""
+
+    def __init__(
+        self,
+        *,
+        redis_url: str | None = None,
+        ttl: int | None = None,
+        negative_ttl: int | None = None,
+        maxsize: int = 2048,
+        key_prefix: str = _KEY_PREFIX,
+    ) -> None:
+        self._redis = OptionalRedis(f"{key_prefix} cache (memory only)", redis_url)
+        self.ttl = settings.RELEASE_GROUP_CACHE_TTL if ttl is None else ttl
+        self.negative_ttl = (
+            settings.RELEASE_GROUP_NEGATIVE_TTL if negative_ttl is None else negative_ttl
+        )
+        self.maxsize = maxsize
+        self.key_prefix = key_prefix
+        self._memory: OrderedDict[CacheKey, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def _redis_key(self, key: CacheKey) -> str:
+        digest = hashlib.sha1("\x1f".join(key).encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}:{digest}"
+
+    def _remember(self, key: CacheKey, value: dict[str, Any], ttl: int) -> None:
+        self._memory[key] = (time.monotonic() + ttl, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _recall(self, key: CacheKey) -> dict[str, Any] | None:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._memory.pop(key, None)
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    async def get_many(
+        self, keys: Iterable[CacheKey]
+    ) -> dict[CacheKey, dict[str, Any]]:
+        """Return cached entries for ``keys``; an empty dict means "no match".
+
+        Keys that were never looked up are absent from the result.
+        """
+
+        found: dict[CacheKey, dict[str, Any]] = {}
+        remote: list[CacheKey] = []
+        for key in dict.fromkeys(keys):
+            value = self._recall(key)
+            if value is not None:
+                found[key] = value
+            else:
+                remote.append(key)
+        if not remote or not self._redis.available:
+            return found
+        try:
+            raw_values = await self._redis.async_client().mget(
+                [self._redis_key(key) for key in remote]
+            )
+        except Exception as exc:  # noqa: BLE001 - any Redis failure falls back
+            self._redis.mark_down(exc)
+            return found
+        for key, raw in zip(remote, raw_values):
+            if raw is None:
+                continue
+            try:
+                value = json.loads(raw)
+            except (TypeError, ValueError):
+                continue
+            if isinstance(value, dict):
+                found[key] = value
+                self._remember(key, value, self.ttl if value else self.negative_ttl)
+        return found
+
+    async def set(self, key: CacheKey, value: dict[str, Any]) -> None:
+        """Store a compact lookup result (see :func:`compact_release_group`)."""
+
+        ttl = self.ttl if value else self.negative_ttl
+        self._remember(key, value, ttl)
+        if not self._redis.available:
+            return
+        try:
+            await self._redis.async_client().set(
+                self._redis_key(key), json.dumps(value), ex=ttl
+            )
+        except Exception as exc:  # noqa: BLE001 - any Redis failure falls back
+            self._redis.mark_down(exc)
+
+
+release_group_cache = ReleaseGroupCache()
+# (artist MBID,) -> compact representative release group, see
+# app.services.discovery_rails.build_top_rail.
+artist_album_cache = ReleaseGroupCache(key_prefix="mb:artist-album")
+
+
+__all__ = [
+    "AlbumKey",
+    "CacheKey",
+    "ReleaseGroupCache",
+    "album_key",
+    "artist_album_cache",
+    "compact_release_group",
+    "release_group_cache",
+]
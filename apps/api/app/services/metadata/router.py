@@ -2,19 +2,46 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
 import time
+from collections.abc import AsyncIterator, Sequence
 from dataclasses import dataclass
 from typing import Any, Dict, Iterable, cast
 
 from app.schemas.media import Classification, EnrichedCard, EnrichedProvider
 from app.services.metadata.constants import TMDB_IMAGE_BASE
 from app.services.metadata.metadata_client import MetadataClient, MetadataProxyError
+from app.services.metadata.snapshot import card_view, freeze, freeze_card
 
 
 logger = logging.getLogger(__name__)
 
+# Sub-resources TMDb can append to a movie/tv detail request.  ``credits``
+# alone can run to megabytes for a long-running series, so callers ask only
+# for the sections they render.
+TMDB_SECTIONS: tuple[str, ...] = ("external_ids", "credits", "recommendations", "similar")
+# Enough for ids, poster and overview (e.g. /meta/lookup).
+LOOKUP_SECTIONS: tuple[str, ...] = ("external_ids",)
+
+
+def normalise_sections(sections: Iterable[str] | None) -> tuple[str, ...]:
+    """Return ``sections`` in canonical order, defaulting to every section.
+
+    ``external_ids`` is always included because the card's ids depend on it.
+    Unknown section names raise :class:`ValueError`.
+    """
+
+    if sections is None:
+        return TMDB_SECTIONS
+    wanted = {section.strip() for section in sections if section and section.strip()}
+    unknown = wanted.difference(TMDB_SECTIONS)
+    if unknown:
+        raise ValueError(f"unknown TMDb sections: {', '.join(sorted(unknown))}")
+    wanted.add("external_ids")
+    return tuple(section for section in TMDB_SECTIONS if section in wanted)
+
 
 @dataclass
 class TTLCache:
@@ -62,29 +89,108 @@ class MetadataRouter:
         self.discogs = discogs_client
         self.threshold_low = threshold_low
         self.cache = TTLCache()
+        # TMDb detail payloads split into the base record and one entry per
+        # appended section, keyed by ``(media_type, tmdb_id, section)``.
+        self.section_cache = TTLCache(maxsize=1024)
 
-    async def enrich(self, classification: Classification, title: str) -> EnrichedCard:
-        """Return an :class:`EnrichedCard` for ``title``."""
+    async def enrich(
+        self,
+        classification: Classification,
+        title: str,
+        *,
+        sections: Iterable[str] | None = None,
+    ) -> EnrichedCard:
+        """Return an :class:`EnrichedCard` for ``title``.
 
-        cache_key = (classification.type, title.lower())
+        Cards are cached as frozen snapshots and every call returns a
+        :func:`~app.services.metadata.snapshot.card_view` over one, so cache
+        hits never copy the nested provider payloads.
+
+        ``sections`` limits which TMDb sub-resources (see
+        :data:`TMDB_SECTIONS`) are fetched for movies and series; by default
+        all of them are.
+        """
+
+        selected = normalise_sections(sections)
+        cache_key = self.cache_key(classification, title, selected)
         cached = self.cache.get(cache_key)
         if cached is not None:
             logger.debug("metadata cache hit for %s", cache_key)
-            return cached.model_copy(deep=True)
+            return card_view(cached)
 
         if classification.type == "music":
             card = await self._enrich_music(classification, title)
         elif classification.type == "movie":
-            card = await self._enrich_video(classification, title, media_type="movie")
+            card = await self._enrich_video(
+                classification, title, media_type="movie", sections=selected
+            )
         elif classification.type == "tv":
-            card = await self._enrich_video(classification, title, media_type="tv")
+            card = await self._enrich_video(
+                classification, title, media_type="tv", sections=selected
+            )
         else:
             card = self._build_base_card(classification, title)
             card.providers = []
             card.details["message"] = "No metadata providers available for this type"
 
-        self.cache.set(cache_key, card.model_copy(deep=True))
-        return card
+        snapshot = freeze_card(card)
+        self.cache.set(cache_key, snapshot)
+        return card_view(snapshot)
+
+    @staticmethod
+    def cache_key(
+        classification: Classification,
+        title: str,
+        sections: tuple[str, ...] = TMDB_SECTIONS,
+    ) -> tuple[str, str, tuple[str, ...]]:
+        if classification.type not in {"movie", "tv"}:
+            sections = ()
+        return (classification.type, title.lower(), sections)
+
+    async def enrich_many(
+        self,
+        jobs: Sequence[tuple[Classification, str]],
+        *,
+        concurrency: int = 4,
+        sections: Iterable[str] | None = None,
+    ) -> AsyncIterator[tuple[int, EnrichedCard | Exception]]:
+        """Enrich ``jobs`` concurrently, yielding ``(index, result)`` pairs.
+
+        Jobs sharing a cache key are enriched once and reported for every
+        index that requested them.  At most ``concurrency`` enrichments run
+        at a time and results are yielded in completion order; a failed
+        enrichment yields its exception instead of aborting the batch.
+        """
+
+        selected = normalise_sections(sections)
+        groups: dict[tuple[str, str, tuple[str, ...]], list[int]] = {}
+        for index, (classification, title) in enumerate(jobs):
+            key = self.cache_key(classification, title, selected)
+            groups.setdefault(key, []).append(index)
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _run(
+            indices: list[int],
+        ) -> tuple[list[int], EnrichedCard | Exception]:
+            classification, title = jobs[indices[0]]
+            async with semaphore:
+                try:
+                    card = await self.enrich(classification, title, sections=selected)
+                    return indices, card
+                except Exception as exc:
+                    logger.warning("batch enrichment failed for title=%s: %s", title, exc)
+                    return indices, exc
+
+        tasks = [asyncio.create_task(_run(indices)) for indices in groups.values()]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                indices, result = await finished
+                for index in indices:
+                    yield index, result
+        finally:
+            for task in tasks:
+                task.cancel()
 
     def _build_base_card(
         self, classification: Classification, title: str
@@ -306,8 +412,52 @@ class MetadataRouter:
                 payload["image"] = poster
         return payload, None
 
+    async def _tmdb_details(
+        self, media_type: str, tmdb_id: Any, sections: tuple[str, ...]
+    ) -> Any:
+        """Return the TMDb detail record for ``tmdb_id`` with ``sections``.
+
+        The base record and each appended section are cached separately, so
+        a follow-up call asking for more sections only downloads the ones it
+        does not have yet.
+        """
+
+        base = self.section_cache.get((media_type, tmdb_id, None))
+        parts = {
+            section: self.section_cache.get((media_type, tmdb_id, section))
+            for section in sections
+        }
+        missing = [section for section, value in parts.items() if value is None]
+        if base is None or missing:
+            params: dict[str, Any] = {"language": "en-US"}
+            if missing:
+                params["append_to_response"] = ",".join(missing)
+            details = await self.metadata.tmdb(
+                f"{media_type}/{tmdb_id}", params=params, request_id=None
+            )
+            if not isinstance(details, dict):
+                return details
+            base = freeze(
+                {key: value for key, value in details.items() if key not in TMDB_SECTIONS}
+            )
+            self.section_cache.set((media_type, tmdb_id, None), base)
+            for section in missing:
+                if details.get(section) is not None:
+                    parts[section] = freeze(details[section])
+                    self.section_cache.set((media_type, tmdb_id, section), parts[section])
+
+        merged = dict(base)
+        merged.update(
+            (section, value) for section, value in parts.items() if value is not None
+        )
+        return merged
+
     async def _tmdb_lookup(
-        self, media_type: str, title: str, year: int | None
+        self,
+        media_type: str,
+        title: str,
+        year: int | None,
+        sections: tuple[str, ...] = TMDB_SECTIONS,
     ) -> tuple[dict[str, Any] | None, str | None]:
         params: dict[str, Any] = {
             "query": title,
@@ -358,14 +508,7 @@ class MetadataRouter:
             return None, "no_result"
 
         try:
-            details = await self.metadata.tmdb(
-                f"{media_type}/{tmdb_id}",
-                params={
-                    "language": "en-US",
-                    "append_to_response": "external_ids,credits,recommendations,similar",
-                },
-                request_id=None,
-            )
+            details = await self._tmdb_details(media_type, tmdb_id, sections)
         except MetadataProxyError as exc:
             detail = exc.detail or "tmdb_error"
             return None, str(detail) if isinstance(detail, str) else "tmdb_error"
@@ -417,6 +560,7 @@ class MetadataRouter:
         title: str,
         *,
         media_type: str,
+        sections: tuple[str, ...] = TMDB_SECTIONS,
     ) -> EnrichedCard:
         card = self._build_base_card(classification, title)
         providers = {
@@ -458,7 +602,9 @@ class MetadataRouter:
             card.parsed = card.parsed or {}
             card.parsed.setdefault("year", year)
 
-        tmdb_data, tmdb_error = await self._tmdb_lookup(media_type, title, year)
+        tmdb_data, tmdb_error = await self._tmdb_lookup(
+            media_type, title, year, sections
+        )
 
         if tmdb_data:
             providers["TMDb"].used = True
@@ -503,4 +649,9 @@ class MetadataRouter:
         return card
 
 
-__all__ = ["MetadataRouter"]
+__all__ = [
+    "LOOKUP_SECTIONS",
+    "MetadataRouter",
+    "TMDB_SECTIONS",
+    "normalise_sections",
+]
@@ -0,0 +1,162 @@
+"""Immutable snapshots of enriched cards used by the metadata cache.
+
+Cached cards are frozen once when they are stored and then shared by every
+cache hit.  Readers get a lightweight :class:`EnrichedCard` shell whose
+top-level fields can be reassigned freely while the nested payloads stay
+shared and read-only.  Code that needs to edit a nested structure calls
+:func:`thaw` on just that value (copy-on-write) instead of deep-copying the
+whole card up front.
+"""
+
+from __future__ import annotations
+
+from typing import Any, NoReturn
+
+from pydantic import ConfigDict
+
+from app.schemas.media import EnrichedCard, EnrichedProvider
+
+
+def _readonly(*_args: Any, **_kwargs: Any) -> NoReturn:
+    raise TypeError("cached metadata snapshots are read-only; use thaw() to edit")
+
+
+class FrozenDict(dict):
+    """``dict`` subclass that rejects in-place mutation.
+
+    Subclassing ``dict`` keeps ``isinstance`` checks, JSON encoding and
+    pydantic serialisation working unchanged for existing readers.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> Any:
+        return thaw(self)
+
+
+class FrozenList(list):
+    """``list`` subclass that rejects in-place mutation."""
+
+    __slots__ = ()
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __iadd__ = _readonly
+    __imul__ = _readonly
+    append = _readonly
+    clear = _readonly
+    extend = _readonly
+    insert = _readonly
+    pop = _readonly
+    remove = _readonly
+    reverse = _readonly
+    sort = _readonly
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenList, (list(self),))
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> Any:
+        return thaw(self)
+
+
+class FrozenEnrichedProvider(EnrichedProvider):
+    """Provider entry shared between cache hits."""
+
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenEnrichedCard(EnrichedCard):
+    """Card snapshot stored in the metadata cache."""
+
+    model_config = ConfigDict(frozen=True)
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only copy of ``value`` built from frozen containers."""
+
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of a (possibly frozen) value."""
+
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+def freeze_card(card: EnrichedCard) -> FrozenEnrichedCard:
+    """Convert ``card`` into an immutable snapshot suitable for sharing."""
+
+    if isinstance(card, FrozenEnrichedCard):
+        return card
+    providers = FrozenList(
+        FrozenEnrichedProvider.model_construct(
+            name=provider.name,
+            used=provider.used,
+            extra=freeze(provider.extra),
+        )
+        for provider in card.providers
+    )
+    return FrozenEnrichedCard.model_construct(
+        media_type=card.media_type,
+        confidence=card.confidence,
+        title=card.title,
+        parsed=freeze(card.parsed),
+        ids=freeze(card.ids),
+        details=freeze(card.details),
+        providers=providers,
+        reasons=freeze(card.reasons),
+        needs_confirmation=card.needs_confirmation,
+    )
+
+
+def card_view(snapshot: FrozenEnrichedCard) -> EnrichedCard:
+    """Return a cheap mutable shell over ``snapshot``.
+
+    Only the top-level object is new; nested containers are shared with the
+    snapshot and remain read-only, so reassigning a field is free while
+    editing nested data requires an explicit :func:`thaw`.
+    """
+
+    return EnrichedCard.model_construct(
+        **{name: getattr(snapshot, name) for name in EnrichedCard.model_fields}
+    )
+
+
+__all__ = [
+    "FrozenDict",
+    "FrozenEnrichedCard",
+    "FrozenEnrichedProvider",
+    "FrozenList",
+    "card_view",
+    "freeze",
+    "freeze_card",
+    "thaw",
+]
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
+import logging
 import os
+import time
+from collections.abc import Awaitable, Callable, Iterable
 from typing import Any
 
 import redis.asyncio as redis
@@ -11,6 +15,10 @@ from app.core.config import settings
 
 _CACHE_PREFIX = "discovery"
 _redis_client: redis.Redis | None = None
+# Background refreshes started by schedule_refresh, keyed by cache key.
+_REFRESHING: dict[str, asyncio.Task[None]] = {}
+
+logger = logging.getLogger(__name__)
 
 
 def _ensure_client() -> redis.Redis:
@@ -27,6 +35,13 @@ def _ttl() -> int:
     return int(os.getenv("DISCOVERY_CACHE_TTL", "3600"))
 
 
+def _stale_ttl() -> int:
+    raw = os.getenv("DISCOVERY_CACHE_STALE_TTL")
+    if raw and raw.isdigit():
+        return int(raw)
+    return 86_400
+
+
 def build_cache_key(provider: str, fn: str, payload: dict[str, Any]) -> str:
     payload_json = json.dumps(payload, sort_keys=True, separators=(",", ":"))
     h = hashlib.sha256(payload_json.encode("utf-8")).hexdigest()
@@ -51,6 +66,148 @@ async def cache_set_json(key: str, value: Any, ttl: int | None = None) -> None:
     await client.set(key, payload, ex=expire)
 
 
+async def cache_get_entry(key: str) -> tuple[Any, bool] | None:
+    """Return ``(value, fresh)`` for a stale-while-revalidate entry.
+
+    Entries written by :func:`cache_set_entry` stay readable for
+    ``DISCOVERY_CACHE_STALE_TTL`` seconds after they stop being fresh so
+    callers can serve them while a refresh runs.  Plain JSON values written
+    by :func:`cache_set_json` are reported as fresh.
+    """
+
+    cached = await cache_get_json(key)
+    if cached is None:
+        return None
+    return unwrap_entry(cached)
+
+
+async def cache_set_entry(key: str, value: Any, ttl: int | None = None) -> None:
+    fresh_for = ttl if ttl is not None else _ttl()
+    await cache_set_json(key, wrap_entry(value, fresh_for), ttl=fresh_for + _stale_ttl())
+
+
+def wrap_entry(value: Any, fresh_for: float) -> dict[str, Any]:
+    """Wrap ``value`` in the envelope read back by :func:`unwrap_entry`."""
+
+    return {"fresh_until": time.time() + fresh_for, "value": value}
+
+
+def unwrap_entry(cached: Any) -> tuple[Any, bool]:
+    """Split a cached JSON value into ``(value, fresh)``.
+
+    Values stored without the envelope are reported as fresh.
+    """
+
+    if isinstance(cached, dict) and "fresh_until" in cached and "value" in cached:
+        try:
+            fresh_until = float(cached["fresh_until"])
+        except (TypeError, ValueError):
+            fresh_until = 0.0
+        return cached["value"], time.time() < fresh_until
+    return cached, True
+
+
+async def acquire_refresh_lock(key: str, ttl: int = 60) -> bool:
+    """Claim the right to refresh ``key`` across every process.
+
+    The lock is left to expire, which also throttles retries when the
+    upstream keeps failing.
+    """
+
+    client = _ensure_client()
+    return bool(await client.set(f"{key}:refresh", "1", ex=ttl, nx=True))
+
+
+async def release_refresh_lock(key: str) -> None:
+    """Release a lock taken with :func:`acquire_refresh_lock` early."""
+
+    client = _ensure_client()
+    await client.delete(f"{key}:refresh")
+
+
+def schedule_refresh(
+    key: str, refresh: Callable[[], Awaitable[Any]], *, lock_ttl: int = 60
+) -> None:
+    """Run ``refresh`` for a stale ``key`` in the background.
+
+    At most one refresh per key runs in this process, and only the process
+    holding the refresh lock runs it; without Redis every process refreshes
+    on its own.
+    """
+
+    if key in _REFRESHING:
+        return
+
+    async def _refresh() -> None:
+        try:
+            try:
+                claimed = await acquire_refresh_lock(key, ttl=lock_ttl)
+            except Exception:  # noqa: BLE001 - fall back to this process only
+                claimed = True
+            if claimed:
+                await refresh()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "discovery refresh failed key=%s error=%s",
+                key,
+                getattr(exc, "detail", exc),
+            )
+        finally:
+            _REFRESHING.pop(key, None)
+
+    _REFRESHING[key] = asyncio.create_task(_refresh())
+
+
+def _enrichment_key(canonical_key: str) -> str:
+    return f"{_CACHE_PREFIX}:enrich:{canonical_key}"
+
+
+def enrichment_ttl(found: bool) -> int:
+    """TTL for an enrichment entry; misses expire sooner than hits."""
+
+    name, default = (
+        ("DISCOVERY_ENRICH_TTL", 30 * 86_400)
+        if found
+        else ("DISCOVERY_ENRICH_NEGATIVE_TTL", 86_400)
+    )
+    raw = os.getenv(name)
+    return int(raw) if raw and raw.isdigit() else default
+
+
+async def enrichment_get_many(canonical_keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """Fetch cached enrichment for ``canonical_keys`` in a single ``MGET``.
+
+    Enrichment is best effort, so a Redis failure reads as "nothing cached".
+    """
+
+    keys = list(dict.fromkeys(canonical_keys))
+    if not keys:
+        return {}
+    try:
+        raw_values = await _ensure_client().mget([_enrichment_key(key) for key in keys])
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("discovery enrichment cache read failed: %s", exc)
+        return {}
+    found: dict[str, dict[str, Any]] = {}
+    for key, raw in zip(keys, raw_values):
+        if raw is None:
+            continue
+        try:
+            value = json.loads(raw)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(value, dict):
+            found[key] = value
+    return found
+
+
+async def enrichment_set(canonical_key: str, value: dict[str, Any], ttl: int) -> None:
+    try:
+        await _ensure_client().set(_enrichment_key(canonical_key), json.dumps(value), ex=ttl)
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("discovery enrichment cache write failed: %s", exc)
+
+
 async def reset_cache(client: redis.Redis | None = None) -> None:
     global _redis_client
     if client is None:
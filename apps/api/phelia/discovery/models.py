@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, HttpUrl
 
@@ -42,3 +42,5 @@ class ProvidersStatus(BaseModel):
     musicbrainz: bool
     listenbrainz: bool
     spotify: bool
+    # Circuit breaker state and recent latency percentiles per provider.
+    health: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
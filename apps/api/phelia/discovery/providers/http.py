@@ -0,0 +1,222 @@
+"""Shared HTTP layer for the discovery providers.
+
+Providers no longer open a client per request: one keep-alive
+``httpx.AsyncClient`` is pooled per upstream host (and event loop), and every
+request goes through the same retry policy:
+
+* transport errors and 429/5xx responses are retried with exponential
+  backoff and jitter, waiting for ``Retry-After`` when the upstream sends it;
+* 429/503 also drain the shared rate-limit bucket for hosts that have one
+  (see ``app.core.rate_limit``), so other workers back off too;
+* retries draw from a per-host budget that every call refills by
+  ``DISCOVERY_RETRY_BUDGET`` (0.2) tokens, so a failing upstream sees about
+  20% extra traffic (after a small burst) instead of every call tripled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.rate_limit import PRIORITY_DEFAULT, rate_limiter, retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_THROTTLE_STATUSES = frozenset({429, 503})
+_BASE_DELAY = 0.5
+_MAX_DELAY = 30.0
+
+_clients: Dict[str, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+_budgets: Dict[str, "RetryBudget"] = {}
+_lock = threading.Lock()
+
+
+def _retries() -> int:
+    raw = os.getenv("DISCOVERY_HTTP_RETRIES")
+    if raw and raw.isdigit():
+        return int(raw)
+    return 2
+
+
+def _budget_ratio() -> float:
+    try:
+        return max(0.0, float(os.getenv("DISCOVERY_RETRY_BUDGET", "0.2")))
+    except ValueError:
+        return 0.2
+
+
+class RetryBudget:
+    """Token bucket that caps retries to a fraction of first attempts."""
+
+    def __init__(self, ratio: float, *, burst: float = 10.0) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+def _host(url: str) -> str:
+    parsed = httpx.URL(url)
+    return f"{parsed.scheme}://{parsed.host}"
+
+
+def retry_budget(url: str) -> RetryBudget:
+    host = _host(url)
+    with _lock:
+        budget = _budgets.get(host)
+        if budget is None:
+            budget = _budgets[host] = RetryBudget(_budget_ratio())
+        return budget
+
+
+def get_client(url: str) -> httpx.AsyncClient:
+    """Return the pooled keep-alive client for ``url``'s host."""
+
+    loop = asyncio.get_running_loop()
+    host = _host(url)
+    entry = _clients.get(host)
+    if entry is None or entry[0] is not loop:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+        _clients[host] = (loop, client)
+        return client
+    return entry[1]
+
+
+async def close_clients() -> None:
+    """Close every pooled client (used before an event loop shuts down)."""
+
+    entries = list(_clients.values())
+    _clients.clear()
+    for _loop, client in entries:
+        aclose = getattr(client, "aclose", None)
+        if aclose is None:
+            continue
+        try:
+            await aclose()
+        except Exception:  # noqa: BLE001 - closing is best effort
+            pass
+
+
+def reset() -> None:
+    """Forget pooled clients and retry budgets without closing them."""
+
+    _clients.clear()
+    _budgets.clear()
+
+
+def _delay(attempt: int, response: httpx.Response | None) -> float:
+    backoff = _BASE_DELAY * (2**attempt) + random.uniform(0, 0.3)
+    if response is None:
+        return backoff
+    return retry_after_seconds(response, backoff)
+
+
+async def request(
+    method: str,
+    url: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    data: Optional[Dict[str, Any]] = None,
+    timeout: float = 8.0,
+    retries: Optional[int] = None,
+    priority: int = PRIORITY_DEFAULT,
+) -> httpx.Response:
+    """Send a request with the shared retry policy.
+
+    The final response is returned as is, whatever its status; transport
+    errors are raised once retries are exhausted.
+    """
+
+    retries = _retries() if retries is None else retries
+    budget = retry_budget(url)
+    budget.record_request()
+    attempt = 0
+    while True:
+        await rate_limiter.acquire(url, priority=priority)
+        client = get_client(url)
+        response: httpx.Response | None = None
+        try:
+            if method == "POST":
+                response = await client.post(
+                    url, params=params, data=data, headers=headers, timeout=timeout
+                )
+            else:
+                response = await client.get(
+                    url, params=params, headers=headers, timeout=timeout
+                )
+        except httpx.TransportError:
+            if attempt >= retries or not budget.try_spend():
+                raise
+            delay = _delay(attempt, None)
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            if response.status_code in _THROTTLE_STATUSES:
+                await rate_limiter.backoff(url, retry_after_seconds(response, 1.0))
+            delay = _delay(attempt, response)
+            if attempt >= retries or delay > _MAX_DELAY or not budget.try_spend():
+                return response
+        logger.debug(
+            "discovery retry url=%s attempt=%d status=%s delay=%.2f",
+            url,
+            attempt + 1,
+            response.status_code if response is not None else "error",
+            delay,
+        )
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def get_json(
+    url: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 8.0,
+    priority: int = PRIORITY_DEFAULT,
+) -> Dict[str, Any]:
+    """GET ``url`` and decode its JSON body, raising for error statuses."""
+
+    response = await request(
+        "GET",
+        url,
+        params=params,
+        headers=headers,
+        timeout=timeout,
+        priority=priority,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+__all__ = [
+    "RETRY_STATUSES",
+    "RetryBudget",
+    "close_clients",
+    "get_client",
+    "get_json",
+    "request",
+    "reset",
+    "retry_budget",
+]
@@ -1,13 +1,10 @@
 from __future__ import annotations
 
-import asyncio
 import os
-import random
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from ..models import AlbumItem, DiscoveryResponse
+from . import http
 from .base import Provider
 
 ITUNES_API_ROOT = "https://itunes.apple.com"
@@ -20,24 +17,9 @@ class ITunesProvider(Provider):
         self.timeout = float(os.getenv("DISCOVERY_HTTP_TIMEOUT", "8"))
 
     async def _get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        retries = 2
-        delay = 0.5
-        last_error: Exception | None = None
-        for attempt in range(retries + 1):
-            try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    resp = await client.get(f"{ITUNES_API_ROOT}{path}", params=params)
-                resp.raise_for_status()
-                return resp.json()
-            except Exception as exc:  # noqa: BLE001
-                last_error = exc
-                if attempt >= retries:
-                    break
-                await asyncio.sleep(delay + random.uniform(0, 0.3))
-                delay *= 2
-        if last_error:
-            raise last_error
-        return {}
+        return await http.get_json(
+            f"{ITUNES_API_ROOT}{path}", params=params, timeout=self.timeout
+        )
 
     async def charts(self, *, market: Optional[str], limit: int) -> DiscoveryResponse:
         raise NotImplementedError
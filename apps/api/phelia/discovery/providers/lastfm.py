@@ -1,14 +1,11 @@
 from __future__ import annotations
 
-import asyncio
 import os
-import random
 from collections.abc import Callable
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from ..models import AlbumItem, DiscoveryResponse
+from . import http
 from .base import Provider
 
 LASTFM_API_ROOT = "https://ws.audioscrobbler.com/2.0/"
@@ -28,25 +25,7 @@ class LastFMProvider(Provider):
         if not api_key:
             raise RuntimeError("LASTFM_API_KEY missing")
         params = {**params, "api_key": api_key, "format": "json"}
-        retries = 2
-        delay = 0.5
-        last_error: Exception | None = None
-        for attempt in range(retries + 1):
-            try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    resp = await client.get(LASTFM_API_ROOT, params=params)
-                resp.raise_for_status()
-                return resp.json()
-            except Exception as exc:  # noqa: BLE001
-                last_error = exc
-                if attempt >= retries:
-                    break
-                jitter = random.uniform(0, 0.3)
-                await asyncio.sleep(delay + jitter)
-                delay *= 2
-        if last_error:
-            raise last_error
-        return {}
+        return await http.get_json(LASTFM_API_ROOT, params=params, timeout=self.timeout)
 
     @staticmethod
     def _canonical_key(artist: str, title: str, release: str | None = None) -> str:
@@ -1,30 +1,16 @@
 from __future__ import annotations
 
-import asyncio
 import os
-import time
 from typing import Dict, List, Optional
 
-import httpx
+from app.core.rate_limit import PRIORITY_BACKGROUND, PRIORITY_DEFAULT
 
 from ..models import AlbumItem, DiscoveryResponse
+from . import http
 from .base import Provider
 
 MB_API_ROOT = "https://musicbrainz.org/ws/2"
 MB_USER_AGENT = os.getenv("MB_USER_AGENT", "Phelia/1.0 (https://example.local)")
-_RATE_LIMIT = 1.0  # one request per second
-_last_request = 0.0
-_lock = asyncio.Lock()
-
-
-async def _rate_limit_wait() -> None:
-    global _last_request
-    async with _lock:
-        now = time.monotonic()
-        delta = now - _last_request
-        if delta < 1 / _RATE_LIMIT:
-            await asyncio.sleep((1 / _RATE_LIMIT) - delta)
-        _last_request = time.monotonic()
 
 
 class MusicBrainzProvider(Provider):
@@ -33,16 +19,24 @@ class MusicBrainzProvider(Provider):
     def __init__(self) -> None:
         self.timeout = float(os.getenv("DISCOVERY_HTTP_TIMEOUT", "8"))
 
-    async def _get(self, path: str, params: Dict[str, str]) -> Dict[str, object]:
-        await _rate_limit_wait()
-        url = f"{MB_API_ROOT}{path}"
+    async def _get(
+        self,
+        path: str,
+        params: Dict[str, str],
+        *,
+        priority: int = PRIORITY_DEFAULT,
+    ) -> Dict[str, object]:
         headers = {"Accept": "application/json", "User-Agent": MB_USER_AGENT}
-        async with httpx.AsyncClient(timeout=self.timeout, headers=headers) as client:
-            resp = await client.get(url, params=params)
-        if resp.status_code == 503:
-            retry_after = resp.headers.get("Retry-After")
-            if retry_after and retry_after.isdigit():
-                await asyncio.sleep(int(retry_after))
+        resp = await http.request(
+            "GET",
+            f"{MB_API_ROOT}{path}",
+            params=params,
+            headers=headers,
+            timeout=self.timeout,
+            priority=priority,
+        )
+        if resp.status_code in (429, 503):
+            # Still throttled after the shared retry policy gave up.
             return {}
         resp.raise_for_status()
         return resp.json()
@@ -104,7 +98,7 @@ class MusicBrainzProvider(Provider):
             "limit": "1",
             "type": "release-group",
         }
-        data = await self._get("/release-group", params)
+        data = await self._get("/release-group", params, priority=PRIORITY_BACKGROUND)
         groups = data.get("release-groups", []) if isinstance(data, dict) else []
         if not groups:
             return None
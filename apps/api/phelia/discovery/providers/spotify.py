@@ -2,20 +2,41 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import hashlib
+import logging
 import os
-import random
 import time
 from collections.abc import Callable
 from typing import Any, Dict, List, Optional
 
-import httpx
-
+from .. import cache
 from ..models import AlbumItem, DiscoveryResponse
+from . import http
 from .base import Provider
 
+logger = logging.getLogger(__name__)
+
 SPOTIFY_API_ROOT = "https://api.spotify.com/v1"
 SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
+# client id -> (token, expires_at, client secret).  A copy of the token shared
+# through Redis, so most calls do not even need a Redis round-trip.
 _token_cache: dict[str, tuple[str, float, str]] = {}
+_refreshing: dict[str, asyncio.Task[None]] = {}
+# Tokens are treated as expired this long before Spotify says they are.
+_EXPIRY_MARGIN = 60
+_LOCK_TTL = 30
+
+
+def _refresh_ahead() -> int:
+    raw = os.getenv("SPOTIFY_TOKEN_REFRESH_AHEAD")
+    if raw and raw.isdigit():
+        return int(raw)
+    return 300
+
+
+def _token_key(client_id: str, client_secret: str) -> str:
+    digest = hashlib.sha256(f"{client_id}:{client_secret}".encode()).hexdigest()
+    return f"discovery:spotify:token:{digest[:32]}"
 
 
 class SpotifyProvider(Provider):
@@ -41,51 +62,133 @@ class SpotifyProvider(Provider):
         return client_id, client_secret
 
     async def _get_token(self) -> str:
+        """Return a client-credentials token shared by every process.
+
+        The token lives in Redis.  Within ``SPOTIFY_TOKEN_REFRESH_AHEAD``
+        seconds of expiry a background task renews it under a Redis lock, so
+        requests keep using the current token instead of waiting; only a cold
+        cluster (or an expired token) pays for the token request inline.
+        """
+
         client_id, client_secret = self._credentials()
+        now = time.time()
         cached = _token_cache.get(client_id)
-        if cached and cached[1] > time.time() and cached[2] == client_secret:
-            return cached[0]
+        if not (cached and cached[1] > now and cached[2] == client_secret):
+            cached = await self._shared_token(client_id, client_secret)
+        if cached is None or cached[1] <= now:
+            return await self._refresh_token(client_id, client_secret, wait=True)
+        if cached[1] - now < _refresh_ahead():
+            self._schedule_token_refresh(client_id, client_secret)
+        return cached[0]
+
+    async def _shared_token(
+        self, client_id: str, client_secret: str
+    ) -> tuple[str, float, str] | None:
+        try:
+            payload = await cache.cache_get_json(_token_key(client_id, client_secret))
+        except Exception as exc:  # noqa: BLE001 - fall back to this process only
+            logger.debug("spotify token cache read failed: %s", exc)
+            return None
+        if not isinstance(payload, dict) or not payload.get("access_token"):
+            return None
+        try:
+            expires_at = float(payload.get("expires_at", 0))
+        except (TypeError, ValueError):
+            return None
+        if expires_at <= time.time():
+            return None
+        entry = (str(payload["access_token"]), expires_at, client_secret)
+        _token_cache[client_id] = entry
+        return entry
+
+    async def _refresh_token(
+        self, client_id: str, client_secret: str, *, wait: bool
+    ) -> str | None:
+        """Fetch a new token if this process wins the Redis lock.
+
+        A loser returns ``None`` when ``wait`` is false; otherwise it waits
+        briefly for the winner's token and fetches its own if none appears.
+        """
+
+        key = _token_key(client_id, client_secret)
+        try:
+            claimed = await cache.acquire_refresh_lock(key, ttl=_LOCK_TTL)
+        except Exception:  # noqa: BLE001 - fall back to this process only
+            claimed = True
+        if not claimed:
+            if not wait:
+                return None
+            for _ in range(20):
+                await asyncio.sleep(0.1)
+                shared = await self._shared_token(client_id, client_secret)
+                if shared is not None:
+                    return shared[0]
+        try:
+            token, expires_in = await self._request_token(client_id, client_secret)
+            expires_at = time.time() + expires_in - _EXPIRY_MARGIN
+            _token_cache[client_id] = (token, expires_at, client_secret)
+            try:
+                await cache.cache_set_json(
+                    key,
+                    {"access_token": token, "expires_at": expires_at},
+                    ttl=max(1, expires_in - _EXPIRY_MARGIN),
+                )
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("spotify token cache write failed: %s", exc)
+            return token
+        finally:
+            if claimed:
+                try:
+                    await cache.release_refresh_lock(key)
+                except Exception:  # noqa: BLE001 - the lock expires anyway
+                    pass
+
+    def _schedule_token_refresh(self, client_id: str, client_secret: str) -> None:
+        task = _refreshing.get(client_id)
+        if task is not None and not task.done():
+            return
+
+        async def _refresh() -> None:
+            try:
+                # Another process may already have renewed the shared token.
+                shared = await self._shared_token(client_id, client_secret)
+                if shared and shared[1] - time.time() >= _refresh_ahead():
+                    return
+                await self._refresh_token(client_id, client_secret, wait=False)
+            except Exception:  # noqa: BLE001
+                logger.warning("spotify token refresh failed", exc_info=True)
+            finally:
+                _refreshing.pop(client_id, None)
+
+        _refreshing[client_id] = asyncio.create_task(_refresh())
+
+    async def _request_token(
+        self, client_id: str, client_secret: str
+    ) -> tuple[str, int]:
         auth_header = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
         data = {"grant_type": "client_credentials"}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            resp = await client.post(
-                SPOTIFY_TOKEN_URL,
-                data=data,
-                headers={"Authorization": f"Basic {auth_header}"},
-            )
+        resp = await http.request(
+            "POST",
+            SPOTIFY_TOKEN_URL,
+            data=data,
+            headers={"Authorization": f"Basic {auth_header}"},
+            timeout=self.timeout,
+            retries=0,
+        )
         resp.raise_for_status()
         payload = resp.json()
-        token = payload.get("access_token")
-        expires_in = int(payload.get("expires_in", 3600))
-        _token_cache[client_id] = (token, time.time() + expires_in - 60, client_secret)
-        return token
+        return payload.get("access_token"), int(payload.get("expires_in", 3600))
 
     async def _get(
         self, path: str, params: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         token = await self._get_token()
-        retries = 2
-        delay = 0.5
-        last_error: Exception | None = None
-        for attempt in range(retries + 1):
-            try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    resp = await client.get(
-                        f"{SPOTIFY_API_ROOT}{path}",
-                        params=params,
-                        headers={"Authorization": f"Bearer {token}"},
-                    )
-                resp.raise_for_status()
-                return resp.json()
-            except Exception as exc:  # noqa: BLE001
-                last_error = exc
-                if attempt >= retries:
-                    break
-                await asyncio.sleep(delay + random.uniform(0, 0.3))
-                delay *= 2
-        if last_error:
-            raise last_error
-        return {}
+        return await http.get_json(
+            f"{SPOTIFY_API_ROOT}{path}",
+            params=params,
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=self.timeout,
+        )
 
     async def charts(self, *, market: Optional[str], limit: int) -> DiscoveryResponse:
         raise NotImplementedError
@@ -1,13 +1,27 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 import os
 from collections.abc import Iterable
-from typing import Dict, List, Optional
+from functools import partial
+from typing import Any, Dict, List, Optional
 
-from app.core.runtime_settings import runtime_settings
+from pydantic import ValidationError
 
-from .cache import build_cache_key, cache_get_json, cache_set_json
+from app.core.circuit_breaker import breaker_status, get_breaker
+from app.core.runtime_settings import runtime_settings
+from app.services.discovery_genres import curated_mb_tags
+
+from .cache import (
+    build_cache_key,
+    cache_get_entry,
+    cache_set_entry,
+    enrichment_get_many,
+    enrichment_set,
+    enrichment_ttl,
+    schedule_refresh,
+)
 from .models import AlbumItem, DiscoveryResponse, ProvidersStatus
 from .providers.base import Provider
 from .providers.deezer import DeezerProvider
@@ -28,6 +42,13 @@ SOURCE_PRIORITY = {
 
 _PROVIDER_CACHE: Dict[str, Provider] = {}
 
+logger = logging.getLogger(__name__)
+
+# Items travel through caching, merging and enrichment as the plain JSON
+# dicts stored in Redis.  They were validated when the provider produced
+# them, so they are only turned back into models once, by ``_to_models``.
+ItemDict = Dict[str, Any]
+
 
 def _slugify(value: str) -> str:
     normalized = value.lower().strip()
@@ -44,11 +65,22 @@ def _slugify(value: str) -> str:
     return "".join(cleaned).strip("-")
 
 
-def _canonical_key(item: AlbumItem) -> str:
-    if item.canonical_key:
-        return item.canonical_key
-    year = (item.release_date or "")[:4]
-    return f"{_slugify(item.artist)}::{_slugify(item.title)}::{year}"
+def _canonical_key(item: ItemDict) -> str:
+    if item.get("canonical_key"):
+        return item["canonical_key"]
+    year = (item.get("release_date") or "")[:4]
+    artist = _slugify(item.get("artist") or "")
+    return f"{artist}::{_slugify(item.get('title') or '')}::{year}"
+
+
+def _to_models(items: Iterable[ItemDict]) -> List[AlbumItem]:
+    models: List[AlbumItem] = []
+    for item in items:
+        try:
+            models.append(AlbumItem.model_validate(item))
+        except ValidationError as exc:
+            logger.warning("dropping invalid discovery item %s: %s", item.get("id"), exc)
+    return models
 
 
 def _provider_enabled(name: str) -> bool:
@@ -101,30 +133,56 @@ def _get_provider(name: str) -> Optional[Provider]:
     return provider
 
 
-async def _call_provider(
-    provider: Provider, method: str, kwargs: Dict[str, object]
-) -> List[AlbumItem]:
-    cache_key = build_cache_key(provider.name, method, kwargs)
-    cached = await cache_get_json(cache_key)
-    if cached:
-        response = DiscoveryResponse(**cached)
-        return [
-            AlbumItem(**item) if not isinstance(item, AlbumItem) else item
-            for item in response.items
-        ]
+async def _fetch_provider(
+    provider: Provider, method: str, kwargs: Dict[str, object], cache_key: str
+) -> List[ItemDict]:
     try:
         fn = getattr(provider, method)
-        response: DiscoveryResponse = await fn(**kwargs)  # type: ignore[misc]
+        # An open breaker raises CircuitOpenError, skipping the provider.
+        with get_breaker(provider.name).call():
+            response: DiscoveryResponse = await fn(**kwargs)  # type: ignore[misc]
     except NotImplementedError:
         return []
     except Exception:
         return []
-    await cache_set_json(cache_key, response.model_dump(mode="json"))
-    return response.items
+    payload = response.model_dump(mode="json")
+    await cache_set_entry(cache_key, payload)
+    return payload["items"]
+
+
+async def _call_provider(
+    provider: Provider,
+    method: str,
+    kwargs: Dict[str, object],
+    *,
+    refresh: bool = False,
+) -> List[ItemDict]:
+    """Return provider items, serving cached entries stale-while-revalidate.
+
+    A stale entry is returned immediately and a single background refresh
+    (one per key across all processes) replaces it.  ``refresh=True`` skips
+    the cache and always asks the upstream, as the prewarm job does.
+
+    Items are returned as the cached JSON dicts without re-validation.
+    """
+
+    cache_key = build_cache_key(provider.name, method, kwargs)
+    entry = None if refresh else await cache_get_entry(cache_key)
+    if entry is not None:
+        cached, fresh = entry
+        if cached:
+            if not fresh:
+                schedule_refresh(
+                    cache_key,
+                    partial(_fetch_provider, provider, method, kwargs, cache_key),
+                )
+            items = cached.get("items") if isinstance(cached, dict) else None
+            return [item for item in items or [] if isinstance(item, dict)]
+    return await _fetch_provider(provider, method, kwargs, cache_key)
 
 
-def _merge_items(responses: Iterable[AlbumItem]) -> List[AlbumItem]:
-    merged: Dict[str, AlbumItem] = {}
+def _merge_items(responses: Iterable[ItemDict]) -> List[ItemDict]:
+    merged: Dict[str, ItemDict] = {}
     for item in responses:
         key = _canonical_key(item)
         existing = merged.get(key)
@@ -135,119 +193,268 @@ def _merge_items(responses: Iterable[AlbumItem]) -> List[AlbumItem]:
     return list(merged.values())
 
 
-def _prefer_item(current: AlbumItem, candidate: AlbumItem) -> AlbumItem:
+def _prefer_item(current: ItemDict, candidate: ItemDict) -> ItemDict:
     chosen = current
     if (
-        (not current.cover_url and candidate.cover_url)
+        (not current.get("cover_url") and candidate.get("cover_url"))
         or (
-            (current.release_date or "") < (candidate.release_date or "")
-            and candidate.release_date
+            (current.get("release_date") or "") < (candidate.get("release_date") or "")
+            and candidate.get("release_date")
         )
-        or ((current.score or 0.0) < (candidate.score or 0.0))
+        or ((current.get("score") or 0.0) < (candidate.get("score") or 0.0))
         or (
-            SOURCE_PRIORITY.get(candidate.source, 99)
-            < SOURCE_PRIORITY.get(current.source, 99)
+            SOURCE_PRIORITY.get(candidate.get("source"), 99)
+            < SOURCE_PRIORITY.get(current.get("source"), 99)
         )
     ):
         chosen = candidate
-    base = AlbumItem(**chosen.model_dump())
-    tags = set(current.tags)
-    tags.update(candidate.tags)
-    base.tags = list(tags)
-    if not base.cover_url:
-        base.cover_url = candidate.cover_url or current.cover_url
-    if not base.release_date:
-        base.release_date = candidate.release_date or current.release_date
-    if not base.source_url:
-        base.source_url = candidate.source_url or current.source_url
-    if not base.preview_url:
-        base.preview_url = candidate.preview_url or current.preview_url
-    base.extra = {**current.extra, **candidate.extra, **base.extra}
+    base = dict(chosen)
+    tags = set(current.get("tags") or [])
+    tags.update(candidate.get("tags") or [])
+    base["tags"] = list(tags)
+    for field in ("cover_url", "release_date", "source_url", "preview_url"):
+        if not base.get(field):
+            base[field] = candidate.get(field) or current.get(field)
+    base["extra"] = {
+        **(current.get("extra") or {}),
+        **(candidate.get("extra") or {}),
+        **(chosen.get("extra") or {}),
+    }
     return base
 
 
-async def _enrich_items(items: List[AlbumItem]) -> None:
-    need_itunes = [item for item in items if not item.cover_url][:10]
-    need_mb = [item for item in items if not item.release_date][:10]
+def _enrich_deadline() -> float:
+    return float(os.getenv("DISCOVERY_ENRICH_DEADLINE", "3"))
+
+
+def _itunes_concurrency() -> int:
+    return max(1, int(os.getenv("DISCOVERY_ITUNES_CONCURRENCY", "4")))
+
+
+def _apply_enrichment(
+    item: ItemDict,
+    *,
+    cover_url: object = None,
+    release_date: object = None,
+    source_url: object = None,
+) -> None:
+    if cover_url and not item.get("cover_url"):
+        item["cover_url"] = str(cover_url)
+    if release_date and not item.get("release_date"):
+        item["release_date"] = str(release_date)
+    if source_url and not item.get("source_url"):
+        item["source_url"] = str(source_url)
+
+
+async def _enrich_from_itunes(
+    itunes: Provider,
+    item: ItemDict,
+    semaphore: asyncio.Semaphore,
+    checked: Dict[str, set[str]],
+) -> None:
+    async with semaphore:
+        try:
+            with get_breaker("itunes").call():
+                matches = await itunes.lookup_album(item["artist"], item["title"], limit=3)  # type: ignore[attr-defined]
+        except Exception:
+            return
+    checked.setdefault(_canonical_key(item), set()).add("itunes")
+    if not matches:
+        return
+    match = matches[0]
+    _apply_enrichment(
+        item,
+        cover_url=match.cover_url,
+        release_date=match.release_date,
+        source_url=match.source_url,
+    )
+
+
+async def _enrich_from_musicbrainz(
+    musicbrainz: Provider, item: ItemDict, checked: Dict[str, set[str]]
+) -> None:
+    # Requests queue on the shared MusicBrainz rate limiter, which paces them.
+    try:
+        with get_breaker("musicbrainz").call():
+            enriched = await musicbrainz.enrich(item["artist"], item["title"])  # type: ignore[attr-defined]
+    except Exception:
+        return
+    checked.setdefault(_canonical_key(item), set()).add("musicbrainz")
+    if not enriched:
+        return
+    _apply_enrichment(
+        item,
+        cover_url=enriched.get("cover_url"),
+        release_date=enriched.get("release_date"),
+        source_url=enriched.get("source_url"),
+    )
+
+
+_ENRICHED_FIELDS = ("cover_url", "release_date", "source_url")
+
+
+async def _apply_cached_enrichment(
+    items: List[ItemDict],
+) -> Dict[str, Dict[str, object]]:
+    """Apply cached enrichment to ``items`` with one bulk read.
+
+    Returns the cache entries by canonical key.  Besides the enriched
+    fields, an entry records which providers were already asked, so a
+    cached miss stops the same lookup from being repeated.
+    """
+
+    cached = await enrichment_get_many(_canonical_key(item) for item in items)
+    if cached:
+        for item in items:
+            entry = cached.get(_canonical_key(item))
+            if entry:
+                _apply_enrichment(
+                    item,
+                    cover_url=entry.get("cover_url"),
+                    release_date=entry.get("release_date"),
+                    source_url=entry.get("source_url"),
+                )
+    return cached
+
+
+async def _store_enrichment(
+    items: List[ItemDict],
+    checked: Dict[str, set[str]],
+    cached: Dict[str, Dict[str, object]],
+) -> None:
+    writes = []
+    for item in items:
+        key = _canonical_key(item)
+        providers = checked.pop(key, None)
+        if not providers:
+            continue
+        entry = dict(cached.get(key) or {})
+        for field in _ENRICHED_FIELDS:
+            entry[field] = item.get(field) or None
+        for provider in providers:
+            entry[provider] = True
+        found = any(entry.get(field) for field in _ENRICHED_FIELDS)
+        writes.append(enrichment_set(key, entry, enrichment_ttl(found)))
+    if writes:
+        await asyncio.gather(*writes)
+
+
+async def _enrich_items(items: List[ItemDict]) -> None:
+    """Fill missing covers and release dates from iTunes and MusicBrainz.
+
+    Cached enrichment (hits and misses, keyed by canonical key) is applied
+    first in one round-trip; only the remaining gaps go upstream.  iTunes
+    lookups run concurrently (``DISCOVERY_ITUNES_CONCURRENCY`` at a time)
+    alongside the MusicBrainz ones.  After ``DISCOVERY_ENRICH_DEADLINE``
+    seconds unfinished lookups are cancelled and the items are returned as
+    enriched as they got.
+    """
+
+    cached = await _apply_cached_enrichment(items)
+
+    def _asked(item: ItemDict, provider: str) -> bool:
+        return bool((cached.get(_canonical_key(item)) or {}).get(provider))
+
+    need_itunes = [
+        item
+        for item in items
+        if not item.get("cover_url") and not _asked(item, "itunes")
+    ][:10]
+    need_mb = [
+        item
+        for item in items
+        if not item.get("release_date") and not _asked(item, "musicbrainz")
+    ][:10]
     itunes = _get_provider("itunes")
     musicbrainz = _get_provider("musicbrainz")
+    checked: Dict[str, set[str]] = {}
+    tasks: List[asyncio.Task[None]] = []
     if itunes:
-        for item in need_itunes:
-            try:
-                matches = await itunes.lookup_album(item.artist, item.title, limit=3)  # type: ignore[arg-type]
-            except Exception:
-                continue
-            if not matches:
-                continue
-            match = matches[0]
-            if match.cover_url and not item.cover_url:
-                item.cover_url = match.cover_url
-            if match.release_date and not item.release_date:
-                item.release_date = match.release_date
-            if match.source_url and not item.source_url:
-                item.source_url = match.source_url
+        semaphore = asyncio.Semaphore(_itunes_concurrency())
+        tasks.extend(
+            asyncio.create_task(_enrich_from_itunes(itunes, item, semaphore, checked))
+            for item in need_itunes
+        )
     if musicbrainz:
-        for item in need_mb:
-            try:
-                enriched = await musicbrainz.enrich(item.artist, item.title)  # type: ignore[attr-defined]
-            except Exception:
-                continue
-            if not enriched:
-                continue
-            if enriched.get("release_date") and not item.release_date:
-                item.release_date = enriched["release_date"]
-            if enriched.get("cover_url") and not item.cover_url:
-                item.cover_url = enriched["cover_url"]
-            if enriched.get("source_url") and not item.source_url:
-                item.source_url = enriched["source_url"]
+        tasks.extend(
+            asyncio.create_task(_enrich_from_musicbrainz(musicbrainz, item, checked))
+            for item in need_mb
+        )
+    if not tasks:
+        return
+    _done, pending = await asyncio.wait(tasks, timeout=_enrich_deadline())
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    await _store_enrichment(items, checked, cached)
+
+
+def _max_items() -> int:
+    return int(os.getenv("DISCOVERY_MAX_ITEMS", "50"))
 
 
 def _max_limit(limit: int) -> int:
-    max_items = int(os.getenv("DISCOVERY_MAX_ITEMS", "50"))
-    return min(limit, max_items)
+    return min(limit, _max_items())
 
 
-async def get_charts(*, market: Optional[str], limit: int) -> List[AlbumItem]:
+async def get_charts(
+    *, market: Optional[str], limit: int, refresh: bool = False
+) -> List[AlbumItem]:
     limit = _max_limit(limit)
     market = market or os.getenv("DISCOVERY_DEFAULT_MARKET", "US")
-    tasks: List[asyncio.Task[List[AlbumItem]]] = []
+    tasks: List[asyncio.Task[List[ItemDict]]] = []
     for name in ("deezer", "spotify"):
         provider = _get_provider(name)
         if not provider:
             continue
         tasks.append(
             asyncio.create_task(
-                _call_provider(provider, "charts", {"market": market, "limit": limit})
+                _call_provider(
+                    provider,
+                    "charts",
+                    {"market": market, "limit": _max_items()},
+                    refresh=refresh,
+                )
             )
         )
     results = await asyncio.gather(*tasks) if tasks else []
-    merged = _merge_items(item for group in results for item in group)
+    merged = _merge_items(item for group in results for item in group)[:limit]
     await _enrich_items(merged)
-    return merged[:limit]
+    return _to_models(merged)
 
 
-async def get_tag(*, tag: str, limit: int) -> List[AlbumItem]:
+async def get_tag(
+    *, tag: str, limit: int, refresh: bool = False
+) -> List[AlbumItem]:
     limit = _max_limit(limit)
-    tasks: List[asyncio.Task[List[AlbumItem]]] = []
+    tasks: List[asyncio.Task[List[ItemDict]]] = []
     for name in ("lastfm",):
         provider = _get_provider(name)
         if not provider:
             continue
         tasks.append(
             asyncio.create_task(
-                _call_provider(provider, "tags", {"tag": tag, "limit": limit})
+                _call_provider(
+                    provider,
+                    "tags",
+                    {"tag": tag, "limit": _max_items()},
+                    refresh=refresh,
+                )
             )
         )
     results = await asyncio.gather(*tasks) if tasks else []
-    merged = _merge_items(item for group in results for item in group)
+    merged = _merge_items(item for group in results for item in group)[:limit]
     await _enrich_items(merged)
-    return merged[:limit]
+    return _to_models(merged)
 
 
-async def get_new_releases(*, market: Optional[str], limit: int) -> List[AlbumItem]:
+async def get_new_releases(
+    *, market: Optional[str], limit: int, refresh: bool = False
+) -> List[AlbumItem]:
     limit = _max_limit(limit)
     market = market or os.getenv("DISCOVERY_DEFAULT_MARKET", "US")
-    tasks: List[asyncio.Task[List[AlbumItem]]] = []
+    tasks: List[asyncio.Task[List[ItemDict]]] = []
     for name in ("spotify", "deezer"):
         provider = _get_provider(name)
         if not provider:
@@ -255,36 +462,146 @@ async def get_new_releases(*, market: Optional[str], limit: int) -> List[AlbumIt
         tasks.append(
             asyncio.create_task(
                 _call_provider(
-                    provider, "new_releases", {"market": market, "limit": limit}
+                    provider,
+                    "new_releases",
+                    {"market": market, "limit": _max_items()},
+                    refresh=refresh,
                 )
             )
         )
     results = await asyncio.gather(*tasks) if tasks else []
-    merged = _merge_items(item for group in results for item in group)
+    merged = _merge_items(item for group in results for item in group)[:limit]
     await _enrich_items(merged)
-    return merged[:limit]
+    return _to_models(merged)
+
+
+def _provider_timeout() -> float:
+    return float(os.getenv("DISCOVERY_PROVIDER_TIMEOUT", "5"))
+
+
+def _prefix_satisfied(
+    results: List[Optional[List[ItemDict]]], limit: int
+) -> bool:
+    """Whether the completed providers, in priority order, already fill ``limit``.
+
+    Only an unbroken prefix of finished providers counts, so a result is
+    never returned ahead of a higher-priority provider that is still running.
+    """
+
+    count = 0
+    for group in results:
+        if group is None:
+            return False
+        count += len(group)
+        if count >= limit:
+            return True
+    return False
 
 
 async def quick_search(*, query: str, limit: int) -> List[AlbumItem]:
+    """Search every enabled provider concurrently.
+
+    Each provider gets ``DISCOVERY_PROVIDER_TIMEOUT`` seconds.  Results are
+    kept in provider priority order and the search returns as soon as the
+    highest-priority providers have produced ``limit`` items; providers
+    still running at that point are cancelled.
+    """
+
     limit = _max_limit(limit)
-    collected: List[AlbumItem] = []
+    timeout = _provider_timeout()
+    names: List[str] = []
+    tasks: List[asyncio.Task[List[ItemDict]]] = []
     for name in ("lastfm", "deezer", "itunes", "musicbrainz"):
         provider = _get_provider(name)
         if not provider:
             continue
-        results = await _call_provider(provider, "search_albums", {"query": query, "limit": limit})
-        collected.extend(results)
-        if len(collected) >= limit:
-            break
+        names.append(name)
+        tasks.append(
+            asyncio.create_task(
+                asyncio.wait_for(
+                    _call_provider(
+                        provider, "search_albums", {"query": query, "limit": limit}
+                    ),
+                    timeout,
+                )
+            )
+        )
 
+    results: List[Optional[List[ItemDict]]] = [None] * len(tasks)
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                index = tasks.index(task)
+                try:
+                    results[index] = task.result()
+                except asyncio.TimeoutError:
+                    # A hanging provider counts against its breaker too.
+                    get_breaker(names[index]).record_failure(timeout)
+                    results[index] = []
+                except Exception:  # noqa: BLE001
+                    results[index] = []
+            if _prefix_satisfied(results, limit):
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    collected = [item for group in results if group for item in group]
     if collected:
         merged = _merge_items(collected)
         await _enrich_items(merged)
-        return merged[:limit]
+        return _to_models(merged[:limit])
 
     return []
 
 
+def _env_list(name: str, default: str) -> List[str]:
+    raw = os.getenv(name, default)
+    return [value.strip() for value in raw.split(",") if value.strip()]
+
+
+async def prewarm(
+    *,
+    markets: Optional[Iterable[str]] = None,
+    tags: Optional[Iterable[str]] = None,
+) -> int:
+    """Refresh the new-release and tag rails the discovery routes read.
+
+    Markets default to ``DISCOVERY_PREWARM_MARKETS`` (the default market, as
+    the routes use) and tags to the curated genres' MusicBrainz tags.  The
+    page size is not part of the provider cache keys, so one refresh serves
+    every limit.  Returns the number of rails that produced items.
+    """
+
+    if markets is None:
+        markets = _env_list(
+            "DISCOVERY_PREWARM_MARKETS", os.getenv("DISCOVERY_DEFAULT_MARKET", "US")
+        )
+    if tags is None:
+        tags = curated_mb_tags()
+
+    limit = _max_items()
+    jobs = [
+        get_new_releases(market=market, limit=limit, refresh=True)
+        for market in markets
+    ]
+    jobs.extend(get_tag(tag=tag, limit=limit, refresh=True) for tag in tags)
+
+    warmed = 0
+    for result in await asyncio.gather(*jobs, return_exceptions=True):
+        if isinstance(result, BaseException):
+            logger.warning("discovery prewarm failed: %s", result)
+        elif result:
+            warmed += 1
+    return warmed
+
+
 async def providers_status() -> ProvidersStatus:
     return ProvidersStatus(
         lastfm=_provider_enabled("lastfm"),
@@ -293,4 +610,5 @@ async def providers_status() -> ProvidersStatus:
         musicbrainz=_provider_enabled("musicbrainz"),
         listenbrainz=_provider_enabled("listenbrainz"),
         spotify=_provider_enabled("spotify"),
+        health=breaker_status(list(SOURCE_PRIORITY)),
     )
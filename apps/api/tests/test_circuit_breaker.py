@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pytest
+
+from app.api.v1.endpoints import meta
+from app.core import circuit_breaker
+from app.core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+def _fail(breaker: CircuitBreaker) -> None:
+    with pytest.raises(RuntimeError):
+        with breaker.call():
+            raise RuntimeError("upstream down")
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes_once(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: clock[0])
+    breaker = CircuitBreaker("deezer", threshold=3, cooldown=30)
+
+    _fail(breaker)
+    _fail(breaker)
+    assert breaker.state == CLOSED
+    _fail(breaker)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        with breaker.call():
+            raise AssertionError("an open breaker must not call the provider")
+
+    clock[0] += 30
+    assert breaker.snapshot()["state"] == HALF_OPEN
+    assert breaker.allow() is True
+    # Only one probe is in flight while half-open.
+    assert breaker.allow() is False
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["retry_in"] == 30.0
+
+    clock[0] += 30
+    with breaker.call():
+        clock[0] += 0.25
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["consecutive_failures"] == 0
+
+
+def test_probe_without_outcome_does_not_wedge_half_open_breaker():
+    breaker = CircuitBreaker("itunes", threshold=1, cooldown=0)
+    _fail(breaker)
+
+    with pytest.raises(NotImplementedError):
+        with breaker.call():
+            raise NotImplementedError
+
+    with breaker.call():
+        pass
+    assert breaker.state == CLOSED
+
+
+def test_snapshot_reports_latency_percentiles():
+    breaker = CircuitBreaker("musicbrainz", threshold=5, cooldown=30)
+    for latency in range(1, 101):
+        breaker.record_success(latency / 1000)
+
+    latency = breaker.snapshot()["latency"]
+    assert latency["samples"] == 100
+    assert (latency["p50_ms"], latency["p95_ms"], latency["p99_ms"]) == (
+        51.0,
+        95.0,
+        99.0,
+    )
+
+
+def test_meta_providers_status_includes_breaker_health(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    circuit_breaker.get_breaker("apple_rss").record_failure(0.5)
+
+    status = meta.providers_status()
+
+    assert status["health"]["apple_rss"]["consecutive_failures"] == 1
+    assert status["health"]["deezer"]["state"] == CLOSED
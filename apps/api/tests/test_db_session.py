@@ -0,0 +1,28 @@
+import pytest
+
+from app.db import models
+from app.db.session import async_database_url, get_async_db
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("postgresql://u:secret@db:5432/phelia", "postgresql+asyncpg://u:secret@db:5432/phelia"),
+        ("postgresql+psycopg2://u@db/phelia", "postgresql+asyncpg://u@db/phelia"),
+        ("sqlite:///./test.db", "sqlite+aiosqlite:///./test.db"),
+        ("mysql://u@db/phelia", "mysql://u@db/phelia"),
+    ],
+)
+def test_async_database_url_swaps_driver(url, expected):
+    assert async_database_url(url) == expected
+
+
+@pytest.mark.anyio
+async def test_get_async_db_commits_on_success(db_session):
+    dependency = get_async_db()
+    db = await anext(dependency)
+    db.add(models.Download(magnet="magnet:?xt=urn:btih:abcd", save_path="/downloads"))
+    with pytest.raises(StopAsyncIteration):
+        await anext(dependency)
+
+    assert db_session.query(models.Download).count() == 1
@@ -3,7 +3,6 @@ from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 
 from app.api.v1.endpoints import details as details_router
-from app.db.session import get_db
 from app.schemas.media import EnrichedCard
 from app.schemas.ui import ListMutationInput, ListMutationItem
 from app.services import library as library_service
@@ -12,10 +11,12 @@ from app.services import library as library_service
 class DummyRouter:
     def __init__(self, card: EnrichedCard):
         self._card = card
+        self.sections = None
 
     async def enrich(
-        self, classification, title
+        self, classification, title, sections=None
     ):  # pragma: no cover - simple passthrough
+        self.sections = sections
         return self._card
 
 
@@ -23,7 +24,6 @@ class DummyRouter:
 async def test_details_returns_enriched_card(monkeypatch, db_session):
     app = FastAPI()
     app.include_router(details_router.router, prefix="/api/v1")
-    app.dependency_overrides[get_db] = lambda: db_session
 
     mutation = ListMutationInput(
         action="add",
@@ -112,7 +112,6 @@ async def test_details_returns_enriched_card(monkeypatch, db_session):
 async def test_details_returns_when_tmdb_missing(monkeypatch, db_session):
     app = FastAPI()
     app.include_router(details_router.router, prefix="/api/v1")
-    app.dependency_overrides[get_db] = lambda: db_session
 
     mutation = ListMutationInput(
         action="add",
@@ -193,7 +192,6 @@ async def test_details_includes_musicbrainz_ids(
 ):
     app = FastAPI()
     app.include_router(details_router.router, prefix="/api/v1")
-    app.dependency_overrides[get_db] = lambda: db_session
 
     mutation = ListMutationInput(
         action="add",
@@ -236,7 +234,6 @@ async def test_details_includes_musicbrainz_ids(
 async def test_details_handles_metadata_failure(monkeypatch, db_session):
     app = FastAPI()
     app.include_router(details_router.router, prefix="/api/v1")
-    app.dependency_overrides[get_db] = lambda: db_session
 
     mutation = ListMutationInput(
         action="add",
@@ -247,7 +244,7 @@ async def test_details_handles_metadata_failure(monkeypatch, db_session):
 
     class FailingRouter:
         async def enrich(
-            self, classification, title
+            self, classification, title, sections=None
         ):  # pragma: no cover - exercised via test
             raise RuntimeError("boom")
 
@@ -259,3 +256,32 @@ async def test_details_handles_metadata_failure(monkeypatch, db_session):
 
     assert resp.status_code == 502
     assert resp.json()["detail"] == "metadata_error"
+
+
+@pytest.mark.anyio
+async def test_details_include_limits_tmdb_sections(monkeypatch, db_session):
+    app = FastAPI()
+    app.include_router(details_router.router, prefix="/api/v1")
+
+    dummy = DummyRouter(
+        EnrichedCard(media_type="movie", confidence=0.9, title="Heat", ids={}, details={})
+    )
+    monkeypatch.setattr(details_router, "get_metadata_router", lambda: dummy)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/v1/details/movie/heat?include=")
+        assert resp.status_code == 200
+        assert dummy.sections == ("external_ids",)
+
+        resp = await client.get("/api/v1/details/movie/heat?include=similar,credits")
+        assert resp.status_code == 200
+        assert dummy.sections == ("external_ids", "credits", "similar")
+
+        resp = await client.get("/api/v1/details/movie/heat")
+        assert resp.status_code == 200
+        assert dummy.sections is None
+
+        resp = await client.get("/api/v1/details/movie/heat?include=trailers")
+        assert resp.status_code == 422
+        assert resp.json()["detail"] == "invalid_include"
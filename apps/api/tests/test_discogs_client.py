@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from app.services.metadata.providers import discogs as discogs_module
+from app.services.metadata.providers.discogs import DiscogsClient
+
+
+@pytest.fixture
+def throttled_discogs(monkeypatch):
+    real_client = httpx.AsyncClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, headers={"Retry-After": "3"})
+
+    def factory(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
+
+    backoffs: list[tuple[str, float]] = []
+
+    async def _acquire(target, **kwargs):
+        return None
+
+    async def _backoff(target, seconds):
+        backoffs.append((target, seconds))
+
+    monkeypatch.setattr(discogs_module.httpx, "AsyncClient", factory)
+    monkeypatch.setattr(discogs_module.rate_limiter, "acquire", _acquire)
+    monkeypatch.setattr(discogs_module.rate_limiter, "backoff", _backoff)
+    return backoffs
+
+
+@pytest.mark.anyio
+async def test_search_albums_backs_off_on_throttling(throttled_discogs) -> None:
+    client = DiscogsClient(token="token")
+
+    assert await client.search_albums("In Rainbows") == []
+    assert throttled_discogs == [("https://api.discogs.com", 3.0)]
+
+
+@pytest.mark.anyio
+async def test_lookup_release_backs_off_on_throttling(throttled_discogs) -> None:
+    client = DiscogsClient(token="token")
+
+    assert await client.lookup_release("Radiohead", "In Rainbows") is None
+    assert throttled_discogs == [("https://api.discogs.com", 3.0)]
+
+
+@pytest.mark.anyio
+async def test_fetch_resource_backs_off_on_throttling(throttled_discogs) -> None:
+    client = DiscogsClient(token="token")
+    url = "https://api.discogs.com/masters/21491"
+
+    assert await client.fetch_resource(url) is None
+    assert throttled_discogs == [(url, 3.0)]
@@ -1,9 +1,41 @@
+import asyncio
+
+import httpx
 import pytest
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 
 from app.api.v1.endpoints import discover
 from app.services.metadata.constants import TMDB_IMAGE_BASE
+from app.services.metadata.providers import musicbrainz as musicbrainz_module
+from app.services.metadata.providers.musicbrainz import MusicBrainzClient
+from app.services.metadata.release_groups import ReleaseGroupCache, album_key
+
+
+@pytest.fixture(autouse=True)
+def memory_release_group_cache(monkeypatch):
+    cache = ReleaseGroupCache(redis_url="redis://127.0.0.1:1/0")
+    cache._redis.down_until = float("inf")
+    monkeypatch.setattr(discover, "release_group_cache", cache)
+    return cache
+
+
+def _chart(count: int) -> dict:
+    return {
+        "chart.gettopalbums": {
+            "topalbums": {
+                "@attr": {"page": "1", "totalPages": "1"},
+                "album": [
+                    {
+                        "name": f"Album {index}",
+                        "artist": {"name": f"Artist {index}"},
+                        "@attr": {"rank": str(index + 1)},
+                    }
+                    for index in range(count)
+                ],
+            }
+        }
+    }
 
 
 class FakeMetadataClient:
@@ -199,3 +231,120 @@ async def test_discover_movie_requires_tmdb_api_key(monkeypatch):
     payload = resp.json()
     assert payload["detail"]["error"] == "missing_key"
     assert payload["detail"]["code"] == "tmdb_api_key_missing"
+
+
+class SlowMBClient:
+    def __init__(self, delay: float, slow_albums: set[str] | None = None):
+        self.delay = delay
+        self.slow_albums = slow_albums
+        self.seen: list[str] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def lookup_release_group(self, artist, album, year=None):
+        self.seen.append(album)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.slow_albums is None or album in self.slow_albums:
+                await asyncio.sleep(self.delay)
+            if album == "Album 2":
+                return None
+            return {
+                "artist": {"id": f"mb-{artist}"},
+                "release_group": {"id": f"rg-{album}", "first_release_date": "1999-01-01"},
+            }
+        finally:
+            self.active -= 1
+
+
+async def _get_albums(fake_mb, payloads) -> dict:
+    app = FastAPI()
+    app.include_router(discover.router, prefix="/api/v1")
+    app.dependency_overrides[discover.get_musicbrainz_client] = lambda: fake_mb
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        resp = await ac.get("/api/v1/discover/album")
+    assert resp.status_code == 200
+    return resp.json()
+
+
+@pytest.mark.anyio
+async def test_discover_albums_looks_up_concurrently_and_caches(monkeypatch):
+    monkeypatch.setattr(discover.settings, "DISCOVER_MB_CONCURRENCY", 3)
+    monkeypatch.setattr(discover.settings, "DISCOVER_ALBUM_DEADLINE", 5.0)
+    payloads = _chart(6)
+    monkeypatch.setattr(
+        discover, "get_metadata_client", lambda: FakeMetadataClient(payloads)
+    )
+    fake_mb = SlowMBClient(delay=0.05)
+
+    data = await _get_albums(fake_mb, payloads)
+
+    assert fake_mb.max_active == 3
+    assert [item["year"] for item in data["items"]] == [1999, 1999, None, 1999, 1999, 1999]
+    assert not any(item["meta"].get("musicbrainz_pending") for item in data["items"])
+
+    # Hits and the cached miss for "Album 2" need no further lookups.
+    await _get_albums(fake_mb, payloads)
+    assert len(fake_mb.seen) == 6
+
+
+@pytest.mark.anyio
+async def test_discover_albums_returns_at_deadline_and_fills_years_later(monkeypatch):
+    monkeypatch.setattr(discover.settings, "DISCOVER_ALBUM_DEADLINE", 0.05)
+    payloads = _chart(2)
+    monkeypatch.setattr(
+        discover, "get_metadata_client", lambda: FakeMetadataClient(payloads)
+    )
+    fake_mb = SlowMBClient(delay=0.3, slow_albums={"Album 1"})
+
+    first = await _get_albums(fake_mb, payloads)
+    assert first["items"][0]["year"] == 1999
+    assert first["items"][1]["year"] is None
+    assert first["items"][1]["meta"]["musicbrainz_pending"] is True
+
+    # Once the background lookup finishes, a follow-up request gets its year.
+    await asyncio.gather(*discover._INFLIGHT_LOOKUPS.values())
+    second = await _get_albums(fake_mb, payloads)
+    assert second["items"][1]["year"] == 1999
+    assert "musicbrainz_pending" not in second["items"][1]["meta"]
+    assert fake_mb.seen == ["Album 0", "Album 1"]
+
+
+@pytest.mark.anyio
+async def test_discover_albums_do_not_cache_musicbrainz_outages(
+    monkeypatch, memory_release_group_cache
+):
+    real_client = httpx.AsyncClient
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(503)
+
+    def factory(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
+
+    async def _no_wait(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(musicbrainz_module.httpx, "AsyncClient", factory)
+    monkeypatch.setattr(musicbrainz_module.rate_limiter, "acquire", _no_wait)
+    monkeypatch.setattr(musicbrainz_module.rate_limiter, "backoff", _no_wait)
+    monkeypatch.setattr(discover.settings, "DISCOVER_ALBUM_DEADLINE", 5.0)
+    payloads = _chart(2)
+    monkeypatch.setattr(
+        discover, "get_metadata_client", lambda: FakeMetadataClient(payloads)
+    )
+    musicbrainz = MusicBrainzClient(user_agent="TestAgent/1.0")
+
+    data = await _get_albums(musicbrainz, payloads)
+    assert [item["year"] for item in data["items"]] == [None, None]
+    keys = [album_key(f"Artist {index}", f"Album {index}") for index in range(2)]
+    assert await memory_release_group_cache.get_many(keys) == {}
+
+    # The failed lookups are retried rather than served as cached misses.
+    await _get_albums(musicbrainz, payloads)
+    assert len(requests) == 4
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from phelia.discovery.providers import http as provider_http
+
+URL = "https://api.example.test/chart"
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    provider_http.reset()
+    yield
+    provider_http.reset()
+
+
+def _install(monkeypatch, handler) -> list[int]:
+    created: list[int] = []
+    real_client = httpx.AsyncClient
+
+    def factory(*args, **kwargs):
+        created.append(1)
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
+
+    monkeypatch.setattr(provider_http.httpx, "AsyncClient", factory)
+    return created
+
+
+@pytest.mark.anyio
+async def test_retries_after_retry_after_on_a_pooled_client(monkeypatch):
+    statuses = iter([429, 200, 200])
+    delays: list[float] = []
+    real_delay = provider_http._delay
+
+    def recording_delay(attempt, response):
+        delays.append(real_delay(attempt, response))
+        return delays[-1]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses)
+        if status == 429:
+            return httpx.Response(429, headers={"Retry-After": "0.01"})
+        return httpx.Response(200, json={"ok": True})
+
+    created = _install(monkeypatch, handler)
+    monkeypatch.setattr(provider_http, "_delay", recording_delay)
+
+    assert await provider_http.get_json(URL) == {"ok": True}
+    assert await provider_http.get_json(URL) == {"ok": True}
+    assert delays == [0.01]
+    assert len(created) == 1
+
+
+@pytest.mark.anyio
+async def test_client_errors_are_not_retried(monkeypatch):
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        return httpx.Response(404)
+
+    _install(monkeypatch, handler)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await provider_http.get_json(URL)
+    assert len(calls) == 1
+
+
+@pytest.mark.anyio
+async def test_retry_budget_caps_traffic_to_failing_upstream(monkeypatch):
+    attempts: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(1)
+        return httpx.Response(503, headers={"Retry-After": "0"})
+
+    _install(monkeypatch, handler)
+    budget = provider_http.retry_budget(URL)
+    budget.tokens = budget.burst = 2.0
+
+    for _ in range(20):
+        response = await provider_http.request("GET", URL, retries=2)
+        assert response.status_code == 503
+
+    # 20 calls, 2 burst retries, then one retry per 1 / 0.2 = 5 calls.
+    assert len(attempts) <= 20 + 2 + 20 * 0.2
+    assert len(attempts) < 60
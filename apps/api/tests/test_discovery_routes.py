@@ -1,13 +1,40 @@
+import asyncio
 import datetime
+import json
+import re
+import time
 from typing import Any
 
 import httpx
 import pytest
+import redis.asyncio as redis_async
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 
+from app.core import circuit_breaker
+from app.core.redis import OptionalRedis
 from app.routes import discovery as discovery_routes
-from app.services import discovery_apple, discovery_mb
+from app.services import discovery_apple, discovery_mb, discovery_rails
+from app.services.discovery_genres import CURATED
+from app.services.metadata.release_groups import ReleaseGroupCache
+from phelia.discovery import cache as discovery_cache
+
+
+@pytest.fixture(autouse=True)
+def memory_artist_album_cache(monkeypatch: pytest.MonkeyPatch) -> ReleaseGroupCache:
+    cache = ReleaseGroupCache(
+        redis_url="redis://127.0.0.1:1/0", key_prefix="mb:artist-album"
+    )
+    cache._redis.down_until = float("inf")
+    monkeypatch.setattr(discovery_rails, "artist_album_cache", cache)
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def no_route_redis(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Route caches stay off unless a test supplies a client.
+    monkeypatch.setattr(discovery_rails._redis, "down_until", float("inf"))
 
 
 class FakeRedis:
@@ -18,9 +45,12 @@ class FakeRedis:
         return self.store.get(key)
 
     def set(
-        self, key: str, value: str, ex: int | None = None
-    ) -> None:  # noqa: ARG002 - ttl unused
+        self, key: str, value: str, ex: int | None = None, nx: bool = False
+    ) -> bool | None:  # noqa: ARG002 - ttl unused
+        if nx and key in self.store:
+            return None
         self.store[key] = value
+        return True
 
 
 @pytest.mark.anyio
@@ -111,10 +141,7 @@ async def test_discovery_new_endpoint_uses_cache(
             }
         ]
 
-    monkeypatch.setattr(discovery_routes, "apple_feed", fake_service, raising=False)
-    monkeypatch.setattr(
-        discovery_routes, "get_redis", lambda: fake_redis, raising=False
-    )
+    monkeypatch.setattr(discovery_rails, "apple_feed", fake_service, raising=False)
 
     app = FastAPI()
     app.include_router(discovery_routes.router)
@@ -153,7 +180,7 @@ async def test_discovery_new_endpoint_wraps_mb_results(
             ]
         }
 
-    monkeypatch.setattr(discovery_routes, "_mb_get_json", fake_mb_get_json)
+    monkeypatch.setattr(discovery_rails, "mb_get_json", fake_mb_get_json)
 
     app = FastAPI()
     app.include_router(discovery_routes.router)
@@ -197,8 +224,8 @@ async def test_discovery_new_endpoint_wraps_provider_results(
     ) -> dict[str, Any]:  # noqa: ARG001
         raise AssertionError("MusicBrainz fallback should not be called")
 
-    monkeypatch.setattr(discovery_routes, "discovery_service", svc, raising=False)
-    monkeypatch.setattr(discovery_routes, "_mb_get_json", fail_mb_get_json)
+    monkeypatch.setattr(discovery_rails, "discovery_service", svc, raising=False)
+    monkeypatch.setattr(discovery_rails, "mb_get_json", fail_mb_get_json)
 
     app = FastAPI()
     app.include_router(discovery_routes.router)
@@ -229,7 +256,7 @@ async def test_discovery_new_endpoint_normalizes_genre_for_apple_lookup(
         captured.append(genre_id)
         return [{"id": "apple-1", "title": "Genre Album", "artist": "Genre Artist"}]
 
-    monkeypatch.setattr(discovery_routes, "apple_feed", fake_apple_feed, raising=False)
+    monkeypatch.setattr(discovery_rails, "apple_feed", fake_apple_feed, raising=False)
 
     app = FastAPI()
     app.include_router(discovery_routes.router)
@@ -281,10 +308,7 @@ async def test_discovery_top_endpoint_caches(monkeypatch: pytest.MonkeyPatch) ->
             return [{"id": "svc-1", "title": "Fresh Album", "artist": "Service Trio"}]
 
     monkeypatch.setattr(
-        discovery_routes, "discovery_service", FakeDiscoveryService(), raising=False
-    )
-    monkeypatch.setattr(
-        discovery_routes, "get_redis", lambda: fake_redis, raising=False
+        discovery_rails, "discovery_service", FakeDiscoveryService(), raising=False
     )
 
     app = FastAPI()
@@ -318,6 +342,101 @@ async def test_discovery_top_endpoint_caches(monkeypatch: pytest.MonkeyPatch) ->
     assert calls == [("albums", "rock", "most-recent", 10)]
 
 
+@pytest.mark.anyio
+async def test_discovery_top_serves_stale_entry_and_refreshes_it(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_redis = FakeRedis()
+    cache_key = "discovery:top:slug:rock:albums:most-recent:10"
+    stale = {"items": [{"id": "old-1", "title": "Old Album", "artist": "Old Band"}]}
+    fake_redis.store[cache_key] = json.dumps({"fresh_until": 0, "value": stale})
+    locks: dict[str, str] = {}
+
+    class LockRedis:
+        async def set(
+            self, key: str, value: str, ex: int | None = None, nx: bool = False
+        ) -> bool | None:  # noqa: ARG002 - ttl unused
+            if nx and key in locks:
+                return None
+            locks[key] = value
+            return True
+
+    # The refresh lock is taken through the shared discovery cache client.
+    monkeypatch.setattr(discovery_cache, "_ensure_client", LockRedis)
+    calls: list[str] = []
+
+    class FakeDiscoveryService:
+        async def fetch_top(
+            self, *, kind: str, tag: str, feed: str, limit: int
+        ) -> list[dict[str, Any]]:
+            calls.append(tag)
+            return [{"id": "svc-1", "title": "Fresh Album", "artist": "Service Trio"}]
+
+    monkeypatch.setattr(
+        discovery_rails, "discovery_service", FakeDiscoveryService(), raising=False
+    )
+
+    app = FastAPI()
+    app.include_router(discovery_routes.router)
+    app.dependency_overrides[discovery_routes.get_redis] = lambda: fake_redis
+    params = {"genre": "rock", "feed": "most-recent", "kind": "albums", "limit": 10}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/v1/discovery/top", params=params)
+        # The stale entry is served while it is rebuilt in the background.
+        assert first.json() == stale
+        await asyncio.gather(*discovery_cache._REFRESHING.values())
+        third = await client.get("/api/v1/discovery/top", params=params)
+
+    assert calls == ["rock"]
+    assert f"{cache_key}:refresh" in locks
+    assert third.json()["items"][0]["title"] == "Fresh Album"
+    entry = json.loads(fake_redis.store[cache_key])
+    assert entry["fresh_until"] > time.time()
+    assert entry["value"] == third.json()
+
+
+@pytest.mark.anyio
+async def test_prewarm_rails_stores_the_keys_the_music_page_reads(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_redis = FakeRedis()
+    built: list[tuple[str, dict[str, Any]]] = []
+
+    async def fake_build_new(**kwargs: Any) -> dict[str, Any]:
+        built.append(("new", kwargs))
+        return {"items": [{"id": f"new-{kwargs['mb_tag']}"}]}
+
+    async def fake_build_top(**kwargs: Any) -> dict[str, Any]:
+        built.append(("top", kwargs))
+        return {"items": [{"id": f"top-{kwargs['genre']}"}]}
+
+    monkeypatch.setattr(discovery_rails, "build_new_rail", fake_build_new)
+    monkeypatch.setattr(discovery_rails, "build_top_rail", fake_build_top)
+    monkeypatch.setattr(discovery_rails, "get_redis", lambda: fake_redis)
+
+    warmed = await discovery_rails.prewarm_rails()
+
+    assert warmed == 2 * len(CURATED)
+    # Same parameters as the music page: /new?genre=<key>&limit=30&days=30 and
+    # /top?genre_id=<apple id>&genre=<key>&kind=albums&feed=most-recent&limit=30.
+    new_entry = json.loads(fake_redis.store["discovery:new:hip hop:30:30"])
+    assert new_entry["value"] == {"items": [{"id": "new-hip hop"}]}
+    top_key = "discovery:top:slug:dnb:albums:most-recent:30"
+    assert json.loads(fake_redis.store[top_key])["value"]["items"][0]["id"] == (
+        "top-dnb"
+    )
+    top_kwargs = {
+        "genre": "dnb",
+        "genre_id": 1253,
+        "kind": "albums",
+        "feed": "most-recent",
+        "limit": 30,
+    }
+    assert ("top", top_kwargs) in built
+
+
 @pytest.mark.anyio
 async def test_discovery_top_endpoint_wraps_mb_results(
     monkeypatch: pytest.MonkeyPatch,
@@ -340,11 +459,14 @@ async def test_discovery_top_endpoint_wraps_mb_results(
                     "id": "rg-1",
                     "title": "Fallback Album",
                     "first-release-date": "2023-09-01",
+                    "artist-credit": [
+                        {"name": "Fallback Artist", "artist": {"id": "artist-1"}}
+                    ],
                 }
             ]
         }
 
-    monkeypatch.setattr(discovery_routes, "_mb_get_json", fake_mb_get_json)
+    monkeypatch.setattr(discovery_rails, "mb_get_json", fake_mb_get_json)
 
     app = FastAPI()
     app.include_router(discovery_routes.router)
@@ -363,6 +485,111 @@ async def test_discovery_top_endpoint_wraps_mb_results(
     assert payload["items"][0]["artist"] == "Fallback Artist"
 
 
+@pytest.mark.anyio
+async def test_discovery_top_fallback_batches_and_caches_artist_albums(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    artists = [{"id": f"artist-{i}", "name": f"Artist {i}"} for i in range(25)]
+    queries: list[str] = []
+
+    async def fake_mb_get_json(url: str, params: dict[str, str]) -> dict[str, Any]:
+        if url.endswith("/artist"):
+            return {"artists": artists}
+        queries.append(params["query"])
+        requested = set(re.findall(r"arid:([\w-]+)", params["query"]))
+        groups = []
+        for artist in artists:
+            if artist["id"] not in requested or artist["id"] == "artist-3":
+                continue
+            credit = [{"name": artist["name"], "artist": {"id": artist["id"]}}]
+            groups.append(
+                {
+                    "id": f"live-{artist['id']}",
+                    "title": "Live",
+                    "secondary-types": ["Live"],
+                    "artist-credit": credit,
+                }
+            )
+            groups.append(
+                {"id": f"rg-{artist['id']}", "title": "Studio", "artist-credit": credit}
+            )
+        return {"release-groups": groups}
+
+    monkeypatch.setattr(discovery_rails, "discovery_service", None, raising=False)
+    monkeypatch.setattr(discovery_rails, "mb_get_json", fake_mb_get_json)
+
+    app = FastAPI()
+    app.include_router(discovery_routes.router)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get(
+            "/api/v1/discovery/top", params={"genre": "techno", "limit": 30}
+        )
+        second = await client.get(
+            "/api/v1/discovery/top", params={"genre": "techno", "limit": 30}
+        )
+
+    assert first.status_code == 200
+    items = first.json()["items"]
+    assert len(items) == 24
+    assert (items[0]["id"], items[0]["title"], items[0]["artist"]) == (
+        "rg-artist-0",
+        "Studio",
+        "Artist 0",
+    )
+    assert "Artist 3" not in {item["artist"] for item in items}
+    # 25 artists -> three OR'ed searches; the second request is served from
+    # the artist -> album cache, including the artist without an album.
+    assert len(queries) == 3
+    assert queries[0].startswith("(arid:artist-0 OR arid:artist-1 OR")
+    assert queries[0].endswith(") AND primarytype:album")
+    assert second.json() == first.json()
+
+
+@pytest.mark.anyio
+async def test_artist_album_lookup_pages_and_skips_truncated_artists(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def group(artist_id: str, index: int) -> dict[str, Any]:
+        credit = [{"name": artist_id, "artist": {"id": artist_id}}]
+        return {
+            "id": f"rg-{artist_id}-{index}",
+            "title": "Studio",
+            "artist-credit": credit,
+        }
+
+    offsets: list[str] = []
+
+    async def fake_mb_get_json(url: str, params: dict[str, str]) -> dict[str, Any]:
+        # artist-0 is prolific enough to fill every page; artist-1 only shows
+        # up on the second page and artist-2 is never reached.
+        offsets.append(params["offset"])
+        assert params["limit"] == "100"
+        groups = [group("artist-0", i) for i in range(100)]
+        if params["offset"] == "100":
+            groups[0] = group("artist-1", 0)
+        return {"count": 1000, "release-groups": groups}
+
+    monkeypatch.setattr(discovery_rails, "mb_get_json", fake_mb_get_json)
+    artist_ids = ["artist-0", "artist-1", "artist-2"]
+
+    albums = await discovery_rails._resolve_artist_albums(artist_ids)
+
+    assert offsets == ["0", "100", "200"]
+    assert albums["artist-0"]["id"] == "rg-artist-0-0"
+    assert albums["artist-1"]["id"] == "rg-artist-1-0"
+    assert "artist-2" not in albums
+    cached = await discovery_rails.artist_album_cache.get_many(
+        (artist_id,) for artist_id in artist_ids
+    )
+    assert ("artist-2",) not in cached
+
+    offsets.clear()
+    await discovery_rails._resolve_artist_albums(artist_ids)
+    assert offsets == ["0", "100", "200"]
+
+
 @pytest.mark.anyio
 async def test_discovery_top_endpoint_wraps_provider_results(
     monkeypatch: pytest.MonkeyPatch,
@@ -389,8 +616,8 @@ async def test_discovery_top_endpoint_wraps_provider_results(
     ) -> dict[str, Any]:  # noqa: ARG001
         raise AssertionError("MusicBrainz fallback should not be called")
 
-    monkeypatch.setattr(discovery_routes, "discovery_service", svc, raising=False)
-    monkeypatch.setattr(discovery_routes, "_mb_get_json", fail_mb_get_json)
+    monkeypatch.setattr(discovery_rails, "discovery_service", svc, raising=False)
+    monkeypatch.setattr(discovery_rails, "mb_get_json", fail_mb_get_json)
 
     app = FastAPI()
     app.include_router(discovery_routes.router)
@@ -419,7 +646,7 @@ async def test_discovery_providers_status_with_service(
             return {"lastfm": True, "spotify": True}
 
     monkeypatch.setattr(
-        discovery_routes, "discovery_service", FakeDiscoveryService(), raising=False
+        discovery_rails, "discovery_service", FakeDiscoveryService(), raising=False
     )
 
     app = FastAPI()
@@ -459,9 +686,9 @@ async def test_discovery_search_endpoint_uses_service(
         return {"release-groups": []}
 
     monkeypatch.setattr(
-        discovery_routes, "discovery_service", FakeDiscoveryService(), raising=False
+        discovery_rails, "discovery_service", FakeDiscoveryService(), raising=False
     )
-    monkeypatch.setattr(discovery_routes, "_mb_get_json", fake_mb_get_json)
+    monkeypatch.setattr(discovery_rails, "mb_get_json", fake_mb_get_json)
 
     app = FastAPI()
     app.include_router(discovery_routes.router)
@@ -497,8 +724,8 @@ async def test_discovery_search_endpoint_falls_back_to_mb(
             ]
         }
 
-    monkeypatch.setattr(discovery_routes, "discovery_service", None, raising=False)
-    monkeypatch.setattr(discovery_routes, "_mb_get_json", fake_mb_get_json)
+    monkeypatch.setattr(discovery_rails, "discovery_service", None, raising=False)
+    monkeypatch.setattr(discovery_rails, "mb_get_json", fake_mb_get_json)
 
     app = FastAPI()
     app.include_router(discovery_routes.router)
@@ -531,9 +758,6 @@ async def test_discovery_similar_artists_caches(
     monkeypatch.setattr(
         discovery_routes, "similar_artists", fake_similar, raising=False
     )
-    monkeypatch.setattr(
-        discovery_routes, "get_redis", lambda: fake_redis, raising=False
-    )
 
     app = FastAPI()
     app.include_router(discovery_routes.router)
@@ -556,25 +780,25 @@ async def test_discovery_similar_artists_caches(
     assert calls == [("artist-main", 5)]
 
 
-def test_apple_feed_normalises(monkeypatch: pytest.MonkeyPatch) -> None:
-    class DummyResponse:
-        def __init__(self, payload: dict[str, Any]) -> None:
-            self._payload = payload
-            self.status_code = 200
-            self.ok = True
+def _install_apple_transport(monkeypatch: pytest.MonkeyPatch, handler) -> None:
+    real_client = httpx.AsyncClient
 
-        def raise_for_status(self) -> None:
-            return None
+    def factory(*args: Any, **kwargs: Any) -> httpx.AsyncClient:
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
 
-        def json(self) -> dict[str, Any]:
-            return self._payload
+    monkeypatch.setattr(discovery_apple.httpx, "AsyncClient", factory)
 
-    captured: dict[str, object] = {}
 
-    def fake_get(url: str, timeout: int = 10):  # noqa: ARG001 - signature compatibility
-        captured["url"] = url
-        return DummyResponse(
-            {
+@pytest.mark.anyio
+async def test_apple_feed_normalises(monkeypatch: pytest.MonkeyPatch) -> None:
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        return httpx.Response(
+            200,
+            json={
                 "feed": {
                     "results": [
                         {
@@ -587,13 +811,13 @@ def test_apple_feed_normalises(monkeypatch: pytest.MonkeyPatch) -> None:
                         }
                     ]
                 }
-            }
+            },
         )
 
-    monkeypatch.setattr(discovery_apple.httpx, "get", fake_get)
+    _install_apple_transport(monkeypatch, handler)
 
-    items = discovery_apple.apple_feed("us", 21)
-    assert captured["url"] == (
+    items = await discovery_apple.apple_feed("us", 21)
+    assert requested[0] == (
         "https://rss.applemarketingtools.com/api/v2/us/music/most-recent/albums/50/genre=21/explicit.json"
     )
     assert items == [
@@ -609,29 +833,207 @@ def test_apple_feed_normalises(monkeypatch: pytest.MonkeyPatch) -> None:
     ]
 
 
-def test_apple_feed_uses_all_genre_when_missing(
+@pytest.mark.anyio
+async def test_apple_feed_uses_all_genre_when_missing(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    class DummyResponse:
-        status_code = 200
-        headers: dict[str, str] = {}
+    requested: list[str] = []
 
-        def raise_for_status(self) -> None:
-            return None
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        return httpx.Response(200, json={"feed": {"results": []}})
 
-        def json(self) -> dict[str, object]:
-            return {"feed": {"results": []}}
+    _install_apple_transport(monkeypatch, handler)
 
-    captured: dict[str, object] = {}
+    items = await discovery_apple.apple_feed("us", 0)
+    assert items == []
+    assert not any("genre=" in url for url in requested)
+    assert "https://itunes.apple.com/us/rss/topalbums/limit=50/explicit/json" in requested
 
-    def fake_get(url: str, timeout: int = 10):  # noqa: ARG001
-        captured["url"] = url
-        return DummyResponse()
 
-    monkeypatch.setattr(discovery_apple.httpx, "get", fake_get)
+@pytest.mark.anyio
+async def test_apple_feed_races_fallback_urls(monkeypatch: pytest.MonkeyPatch) -> None:
+    started: list[str] = []
+    cancelled: list[str] = []
+    release = asyncio.Event()
+
+    async def fake_get(self: httpx.AsyncClient, url: str) -> httpx.Response:
+        started.append(url)
+        request = httpx.Request("GET", url)
+        if "genre=7/explicit" in url:
+            await release.wait()
+            return httpx.Response(503, request=request)
+        if "genre=7.json" in url:
+            await asyncio.sleep(0)
+            release.set()
+            return httpx.Response(
+                200,
+                json={"feed": {"results": [{"id": "1", "name": "Genre Album"}]}},
+                request=request,
+            )
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+        raise AssertionError("lower ranked candidates must not be awaited")
+
+    monkeypatch.setattr(discovery_apple.httpx.AsyncClient, "get", fake_get)
+
+    items = await asyncio.wait_for(discovery_apple.apple_feed("us", 7), timeout=2)
+
+    assert [item["title"] for item in items] == ["Genre Album"]
+    # All six candidates were in flight together; the losers were cancelled.
+    assert len(started) == 6
+    assert len(cancelled) == 4
 
-    items = discovery_apple.apple_feed("us", 0)
-    assert items == []
-    assert captured["url"] == (
-        "https://itunes.apple.com/us/rss/topalbums/limit=50/explicit/json"
+
+@pytest.mark.anyio
+async def test_discovery_cache_awaits_async_redis(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class AsyncFakeRedis(FakeRedis):
+        async def get(self, key: str) -> str | None:  # type: ignore[override]
+            return self.store.get(key)
+
+        async def set(  # type: ignore[override]
+            self, key: str, value: str, ex: int | None = None
+        ) -> None:
+            self.store[key] = value
+
+    fake_redis = AsyncFakeRedis()
+    calls: list[str] = []
+
+    async def fake_similar(artist_mbid: str, limit: int) -> list[dict[str, Any]]:
+        calls.append(artist_mbid)
+        return [{"mbid": "artist-1", "name": "Async Artist", "score": 0.5}]
+
+    monkeypatch.setattr(
+        discovery_routes, "similar_artists", fake_similar, raising=False
     )
+
+    app = FastAPI()
+    app.include_router(discovery_routes.router)
+    app.dependency_overrides[discovery_routes.get_redis] = lambda: fake_redis
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(2):
+            resp = await client.get(
+                "/api/v1/discovery/similar-artists",
+                params={"artist_mbid": "artist-main", "limit": 5},
+            )
+            assert resp.json()["items"][0]["name"] == "Async Artist"
+
+    assert calls == ["artist-main"]
+    assert list(fake_redis.store) == ["discovery:similar:artist-main:5"]
+
+
+class MemoryAsyncRedis(redis_async.Redis):
+    """``redis.asyncio`` client answering GET/SET from memory."""
+
+    def __init__(self, fail: bool = False) -> None:
+        super().__init__()
+        self.fail = fail
+        self.store: dict[str, str] = {}
+        self.commands: list[str] = []
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        self.commands.append(args[0])
+        if self.fail:
+            raise redis_async.ConnectionError("redis down")
+        if args[0] == "GET":
+            return self.store.get(args[1])
+        if args[0] == "SET":
+            self.store[args[1]] = args[2]
+            return True
+        raise AssertionError(f"unexpected command {args[0]}")
+
+
+@pytest.mark.anyio
+async def test_route_cache_uses_the_shared_async_redis_client(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = MemoryAsyncRedis()
+    monkeypatch.setattr(redis_async.Redis, "from_url", lambda *a, **k: client)
+    monkeypatch.setattr(
+        discovery_rails, "_redis", OptionalRedis("discovery route cache")
+    )
+    calls: list[str] = []
+
+    async def fake_similar(artist_mbid: str, limit: int) -> list[dict[str, Any]]:
+        calls.append(artist_mbid)
+        return [{"mbid": "artist-1", "name": "Shared Artist", "score": 0.5}]
+
+    monkeypatch.setattr(discovery_routes, "similar_artists", fake_similar)
+
+    app = FastAPI()
+    app.include_router(discovery_routes.router)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        for _ in range(2):
+            resp = await http.get(
+                "/api/v1/discovery/similar-artists",
+                params={"artist_mbid": "artist-main", "limit": 5},
+            )
+            assert resp.json()["items"][0]["name"] == "Shared Artist"
+
+    assert calls == ["artist-main"]
+    assert list(client.store) == ["discovery:similar:artist-main:5"]
+    assert client.commands == ["GET", "SET", "GET"]
+    assert await discovery_rails.get_redis() is client
+    await discovery_rails.close_redis()
+    assert not discovery_rails._redis.owns(client)
+
+
+@pytest.mark.anyio
+async def test_route_cache_is_skipped_while_redis_is_down(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = MemoryAsyncRedis(fail=True)
+    monkeypatch.setattr(redis_async.Redis, "from_url", lambda *a, **k: client)
+    monkeypatch.setattr(
+        discovery_rails, "_redis", OptionalRedis("discovery route cache")
+    )
+
+    async def fake_similar(artist_mbid: str, limit: int) -> list[dict[str, Any]]:
+        return [{"mbid": "artist-1", "name": "Uncached Artist", "score": 0.5}]
+
+    monkeypatch.setattr(discovery_routes, "similar_artists", fake_similar)
+
+    app = FastAPI()
+    app.include_router(discovery_routes.router)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        for _ in range(2):
+            resp = await http.get(
+                "/api/v1/discovery/similar-artists",
+                params={"artist_mbid": "artist-main", "limit": 5},
+            )
+            assert resp.json()["items"][0]["name"] == "Uncached Artist"
+
+    # The failed read marked Redis down; nothing else was sent to it.
+    assert client.commands == ["GET"]
+    assert await discovery_rails.get_redis() is None
+
+
+@pytest.mark.anyio
+async def test_apple_feed_is_skipped_while_its_breaker_is_open(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(circuit_breaker.settings, "CIRCUIT_BREAKER_THRESHOLD", 1)
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        raise httpx.ConnectError("down", request=request)
+
+    _install_apple_transport(monkeypatch, handler)
+
+    assert await discovery_apple.apple_feed("us", 0) == []
+    attempted = len(requested)
+    assert attempted == 4
+
+    assert await discovery_apple.apple_feed("us", 0) == []
+    assert len(requested) == attempted
+    assert circuit_breaker.get_breaker("apple_rss").state == circuit_breaker.OPEN
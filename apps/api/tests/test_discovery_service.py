@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import time
 from typing import Dict, List, Tuple
 
 import httpx
 import pytest
 
+from app.core import circuit_breaker
 from app.core.runtime_settings import runtime_settings
 
 from phelia.discovery import cache, service
+from phelia.discovery.providers import http as provider_http
+from phelia.discovery.providers import spotify as spotify_provider
 
 
 class DummyRedis:
@@ -17,13 +23,27 @@ class DummyRedis:
     async def get(self, key: str):  # type: ignore[override]
         return self.store.get(key)
 
-    async def set(self, key: str, value: str, ex: int | None = None):  # type: ignore[override]
+    async def mget(self, keys: List[str]):  # type: ignore[override]
+        return [self.store.get(key) for key in keys]
+
+    async def set(self, key: str, value: str, ex: int | None = None, nx: bool = False):  # type: ignore[override]
+        if nx and key in self.store:
+            return None
         self.store[key] = value
+        return True
+
+    async def delete(self, key: str):  # type: ignore[override]
+        return 1 if self.store.pop(key, None) is not None else 0
+
+
+@pytest.fixture
+def dummy_redis() -> DummyRedis:
+    return DummyRedis()
 
 
 @pytest.fixture(autouse=True)
-async def reset_cache(monkeypatch):
-    dummy = DummyRedis()
+async def reset_cache(monkeypatch, dummy_redis):
+    dummy = dummy_redis
     monkeypatch.setattr(cache, "_redis_client", dummy, raising=False)
     monkeypatch.setattr(cache, "_ensure_client", lambda: dummy, raising=False)
     runtime_settings.reset_to_env()
@@ -36,8 +56,11 @@ async def reset_cache(monkeypatch):
         }
     )
     service._PROVIDER_CACHE.clear()
+    provider_http.reset()
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
     yield
     service._PROVIDER_CACHE.clear()
+    provider_http.reset()
     runtime_settings.reset_to_env()
 
 
@@ -221,3 +244,401 @@ async def test_quick_search_falls_back_to_deezer(monkeypatch):
     assert len(items) == 1
     assert items[0].source == "deezer"
     assert any("api.deezer.com" in call[0] for call in calls)
+
+
+def _deezer_chart(title: str) -> dict:
+    return {
+        "data": [
+            {
+                "id": 1,
+                "title": title,
+                "artist": {"name": "Example"},
+                "release_date": "2024-01-01",
+                "cover": "https://example.com/cover.jpg",
+            }
+        ]
+    }
+
+
+def _expire_all(store: Dict[str, str]) -> None:
+    for key, raw in store.items():
+        value = json.loads(raw)
+        if isinstance(value, dict) and "fresh_until" in value:
+            value["fresh_until"] = 0
+            store[key] = json.dumps(value)
+
+
+@pytest.mark.anyio
+async def test_stale_entry_is_served_while_one_refresh_runs(monkeypatch, dummy_redis):
+    monkeypatch.setenv("DEEZER_ENABLED", "true")
+    responses = [(200, _deezer_chart("Old Album")), (200, _deezer_chart("New Album"))]
+    calls: List[Tuple[str, dict | None]] = []
+    monkeypatch.setattr(
+        httpx,
+        "AsyncClient",
+        lambda *_args, **_kwargs: MockAsyncClient(responses, calls),
+    )
+
+    first = await service.get_charts(market="US", limit=5)
+    assert first[0].title == "Old Album"
+    _expire_all(dummy_redis.store)
+
+    stale = await asyncio.gather(
+        service.get_charts(market="US", limit=5),
+        service.get_charts(market="US", limit=5),
+    )
+    assert [items[0].title for items in stale] == ["Old Album", "Old Album"]
+    await asyncio.gather(*cache._REFRESHING.values())
+    # Both stale reads share a single upstream refresh.
+    assert len(calls) == 2
+
+    fresh = await service.get_charts(market="US", limit=5)
+    assert fresh[0].title == "New Album"
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio
+async def test_prewarm_refreshes_rails_ahead_of_expiry(monkeypatch):
+    monkeypatch.setenv("DEEZER_ENABLED", "true")
+    monkeypatch.setenv("ITUNES_ENABLED", "false")
+    monkeypatch.setenv("MUSICBRAINZ_ENABLED", "false")
+    responses = [(200, _deezer_chart("Warm Album"))]
+    calls: List[Tuple[str, dict | None]] = []
+    monkeypatch.setattr(
+        httpx,
+        "AsyncClient",
+        lambda *_args, **_kwargs: MockAsyncClient(responses, calls),
+    )
+
+    warmed = await service.prewarm(markets=["US"], tags=[])
+    assert warmed == 1
+    assert len(calls) == 1
+
+    # The route asks for the default market and its own page size; the limit
+    # is not part of the cache key, so the warmed entry serves it.
+    items = await service.get_new_releases(market=None, limit=30)
+    assert items[0].title == "Warm Album"
+    assert len(calls) == 1
+
+
+@pytest.mark.anyio
+async def test_prewarm_defaults_to_the_curated_genre_tags(monkeypatch):
+    warmed: List[Tuple[str, object]] = []
+
+    async def fake_new_releases(*, market, limit, refresh=False):
+        warmed.append(("new", market))
+        return []
+
+    async def fake_tag(*, tag, limit, refresh=False):
+        warmed.append(("tag", tag))
+        return []
+
+    monkeypatch.setattr(service, "get_new_releases", fake_new_releases)
+    monkeypatch.setattr(service, "get_tag", fake_tag)
+    monkeypatch.delenv("DISCOVERY_PREWARM_MARKETS", raising=False)
+    monkeypatch.setenv("DISCOVERY_DEFAULT_MARKET", "GB")
+
+    await service.prewarm()
+
+    tags = [value for kind, value in warmed if kind == "tag"]
+    assert ("new", "GB") in warmed
+    assert "hip hop" in tags and "drum and bass" in tags
+    assert "hip-hop" not in tags
+    assert len(tags) == len(set(tags))
+
+
+class FakeSearchProvider:
+    def __init__(self, name: str, delay: float, titles: List[str]) -> None:
+        self.name = name
+        self.delay = delay
+        self.titles = titles
+        self.cancelled = False
+
+    async def search_albums(self, *, query: str, limit: int):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return service.DiscoveryResponse(
+            provider=self.name,
+            items=[
+                service.AlbumItem(
+                    id=f"{self.name}:{title}",
+                    canonical_key=f"{self.name}::{title}",
+                    source=self.name,
+                    title=title,
+                    artist="Artist",
+                    release_date="2024-01-01",
+                    cover_url="https://example.com/cover.jpg",
+                )
+                for title in self.titles
+            ],
+        )
+
+
+@pytest.mark.anyio
+async def test_quick_search_runs_providers_concurrently(monkeypatch):
+    monkeypatch.setenv("DISCOVERY_PROVIDER_TIMEOUT", "0.2")
+    providers = {
+        "lastfm": FakeSearchProvider("lastfm", 0.5, ["Too Slow"]),
+        "deezer": FakeSearchProvider("deezer", 0.05, ["Deezer Hit"]),
+        "itunes": FakeSearchProvider("itunes", 0.01, ["iTunes Hit"]),
+        "musicbrainz": FakeSearchProvider("musicbrainz", 5.0, ["Never"]),
+    }
+    monkeypatch.setattr(service, "_get_provider", providers.get)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    items = await service.quick_search(query="ambient", limit=2)
+    elapsed = loop.time() - started
+
+    # Last.fm times out, Deezer + iTunes fill the limit, MusicBrainz is dropped.
+    assert [item.title for item in items] == ["Deezer Hit", "iTunes Hit"]
+    assert elapsed < 1.0
+    assert providers["musicbrainz"].cancelled is True
+
+
+def _bare_item(index: int) -> dict:
+    return {
+        "id": str(index),
+        "canonical_key": f"artist::album-{index}::",
+        "source": "lastfm",
+        "title": f"Album {index}",
+        "artist": "Artist",
+    }
+
+
+@pytest.mark.anyio
+async def test_enrich_items_overlaps_lookups_and_honours_deadline(monkeypatch):
+    monkeypatch.setenv("DISCOVERY_ENRICH_DEADLINE", "0.3")
+    monkeypatch.setenv("DISCOVERY_ITUNES_CONCURRENCY", "2")
+    active = {"itunes": 0, "max_itunes": 0, "mb": 0, "overlap": False}
+
+    class FakeITunes:
+        async def lookup_album(self, artist, title, limit=3):
+            active["itunes"] += 1
+            active["max_itunes"] = max(active["max_itunes"], active["itunes"])
+            active["overlap"] = active["overlap"] or active["mb"] > 0
+            try:
+                await asyncio.sleep(0.05)
+            finally:
+                active["itunes"] -= 1
+            return [
+                service.AlbumItem(
+                    id="it",
+                    canonical_key="it",
+                    source="itunes",
+                    title=title,
+                    artist=artist,
+                    cover_url=f"https://example.com/{title.replace(' ', '-')}.jpg",
+                )
+            ]
+
+    class FakeMusicBrainz:
+        async def enrich(self, artist, title):
+            active["mb"] += 1
+            try:
+                await asyncio.sleep(5.0 if title == "Album 3" else 0.02)
+            finally:
+                active["mb"] -= 1
+            return {"release_date": "2001-01-01"}
+
+    fakes = {"itunes": FakeITunes(), "musicbrainz": FakeMusicBrainz()}
+    monkeypatch.setattr(service, "_get_provider", fakes.get)
+    items = [_bare_item(index) for index in range(4)]
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await service._enrich_items(items)
+    elapsed = loop.time() - started
+
+    assert elapsed < 1.0
+    assert active["max_itunes"] == 2
+    assert active["overlap"] is True
+    assert all(item["cover_url"] for item in items)
+    assert [item.get("release_date") for item in items] == ["2001-01-01"] * 3 + [None]
+
+
+@pytest.mark.anyio
+async def test_enrichment_is_cached_by_canonical_key(monkeypatch, dummy_redis):
+    lookups: List[Tuple[str, str]] = []
+
+    class FakeITunes:
+        async def lookup_album(self, artist, title, limit=3):
+            lookups.append(("itunes", title))
+            if title == "Album 1":
+                return []
+            return [
+                service.AlbumItem(
+                    id="it",
+                    canonical_key="it",
+                    source="itunes",
+                    title=title,
+                    artist=artist,
+                    cover_url="https://example.com/cover.jpg",
+                )
+            ]
+
+    class FakeMusicBrainz:
+        async def enrich(self, artist, title):
+            lookups.append(("musicbrainz", title))
+            return {"release_date": "2001-01-01"} if title == "Album 0" else None
+
+    fakes = {"itunes": FakeITunes(), "musicbrainz": FakeMusicBrainz()}
+    monkeypatch.setattr(service, "_get_provider", fakes.get)
+
+    await service._enrich_items([_bare_item(0), _bare_item(1)])
+    assert len(lookups) == 4
+
+    again = [_bare_item(0), _bare_item(1)]
+    await service._enrich_items(again)
+
+    # Hits and misses alike are answered from the cache.
+    assert len(lookups) == 4
+    assert again[0]["cover_url"] == "https://example.com/cover.jpg"
+    assert again[0]["release_date"] == "2001-01-01"
+    assert "cover_url" not in again[1] and "release_date" not in again[1]
+    assert sum(key.startswith("discovery:enrich:") for key in dummy_redis.store) == 2
+
+
+@pytest.mark.anyio
+async def test_prefer_item_merges_plain_dicts():
+    current = {
+        "id": "1",
+        "canonical_key": "k",
+        "source": "lastfm",
+        "title": "Album",
+        "artist": "Artist",
+        "tags": ["a"],
+        "extra": {"lastfm": "1"},
+    }
+    candidate = {
+        "id": "2",
+        "canonical_key": "k",
+        "source": "deezer",
+        "title": "Album",
+        "artist": "Artist",
+        "cover_url": "https://example.com/c.jpg",
+        "tags": ["b"],
+        "extra": {"deezer": "2"},
+    }
+
+    merged = service._merge_items([current, candidate])
+
+    assert len(merged) == 1
+    assert merged[0]["source"] == "deezer"
+    assert sorted(merged[0]["tags"]) == ["a", "b"]
+    assert merged[0]["extra"] == {"lastfm": "1", "deezer": "2"}
+    assert current["tags"] == ["a"]
+
+
+@pytest.mark.anyio
+async def test_cached_rail_is_validated_once_per_returned_item(monkeypatch):
+    monkeypatch.setenv("DEEZER_ENABLED", "true")
+    monkeypatch.setenv("ITUNES_ENABLED", "false")
+    monkeypatch.setenv("MUSICBRAINZ_ENABLED", "false")
+    responses = [(200, _deezer_chart("Cached Album"))]
+    calls: List[Tuple[str, dict | None]] = []
+    monkeypatch.setattr(
+        httpx,
+        "AsyncClient",
+        lambda *_args, **_kwargs: MockAsyncClient(responses, calls),
+    )
+    await service.get_charts(market="US", limit=5)
+
+    validated: List[dict] = []
+    original = service.AlbumItem.model_validate
+
+    def counting_validate(obj, *args, **kwargs):
+        validated.append(obj)
+        return original(obj, *args, **kwargs)
+
+    monkeypatch.setattr(service.AlbumItem, "model_validate", counting_validate)
+    items = await service.get_charts(market="US", limit=5)
+
+    assert [item.title for item in items] == ["Cached Album"]
+    assert len(validated) == 1
+    assert len(calls) == 1
+
+
+def _spotify() -> spotify_provider.SpotifyProvider:
+    return spotify_provider.SpotifyProvider(
+        client_id_getter=lambda: "client",
+        client_secret_getter=lambda: "secret",
+    )
+
+
+def _install_token_endpoint(monkeypatch) -> List[str]:
+    issued: List[str] = []
+
+    async def fake_request(method: str, url: str, **_kwargs) -> httpx.Response:
+        assert (method, url) == ("POST", spotify_provider.SPOTIFY_TOKEN_URL)
+        await asyncio.sleep(0)
+        issued.append(f"token-{len(issued) + 1}")
+        return httpx.Response(
+            200,
+            json={"access_token": issued[-1], "expires_in": 3600},
+            request=httpx.Request(method, url),
+        )
+
+    monkeypatch.setattr(spotify_provider.http, "request", fake_request)
+    monkeypatch.setattr(spotify_provider, "_token_cache", {})
+    return issued
+
+
+@pytest.mark.anyio
+async def test_spotify_token_is_shared_through_redis(monkeypatch, dummy_redis):
+    issued = _install_token_endpoint(monkeypatch)
+
+    tokens = await asyncio.gather(_spotify()._get_token(), _spotify()._get_token())
+    assert tokens == ["token-1", "token-1"]
+
+    # Another process starts with an empty memory cache and reuses the token.
+    spotify_provider._token_cache.clear()
+    assert await _spotify()._get_token() == "token-1"
+    assert issued == ["token-1"]
+    assert not any(key.endswith(":refresh") for key in dummy_redis.store)
+
+
+@pytest.mark.anyio
+async def test_spotify_token_is_refreshed_ahead_of_expiry(monkeypatch, dummy_redis):
+    issued = _install_token_endpoint(monkeypatch)
+    provider = _spotify()
+    await provider._get_token()
+    # Pretend the token is about to expire everywhere.
+    expiring = time.time() + 100
+    spotify_provider._token_cache["client"] = ("token-1", expiring, "secret")
+    key = spotify_provider._token_key("client", "secret")
+    dummy_redis.store[key] = json.dumps(
+        {"access_token": "token-1", "expires_at": expiring}
+    )
+
+    # The caller is not held up by the refresh...
+    assert await provider._get_token() == "token-1"
+    await asyncio.gather(*spotify_provider._refreshing.values())
+
+    # ...which renewed the token for this and every other process.
+    assert issued == ["token-1", "token-2"]
+    assert await provider._get_token() == "token-2"
+    assert json.loads(dummy_redis.store[key])["access_token"] == "token-2"
+
+
+@pytest.mark.anyio
+async def test_failing_provider_is_skipped_once_its_breaker_opens(monkeypatch):
+    monkeypatch.setenv("DEEZER_ENABLED", "true")
+    monkeypatch.setattr(circuit_breaker.settings, "CIRCUIT_BREAKER_THRESHOLD", 2)
+    calls: List[Tuple[str, dict | None]] = []
+    monkeypatch.setattr(
+        httpx,
+        "AsyncClient",
+        lambda *_args, **_kwargs: MockAsyncClient([(404, {}), (404, {})], calls),
+    )
+
+    for _ in range(4):
+        assert await service.get_charts(market="US", limit=5) == []
+
+    assert len(calls) == 2
+    status = await service.providers_status()
+    assert status.health["deezer"]["state"] == circuit_breaker.OPEN
+    assert status.health["deezer"]["latency"]["samples"] == 2
@@ -103,7 +103,9 @@ async def test_download_lookup(db_session):
 
     assert resp_conflict.status_code == 409
     assert resp_delete.status_code == 204
-    assert db_session.get(models.Download, dl.id) is None
+    dl_id = dl.id
+    db_session.expire_all()
+    assert db_session.get(models.Download, dl_id) is None
 
 
 @pytest.mark.anyio
@@ -214,3 +216,94 @@ async def test_pause_after_candidate_hash(monkeypatch, db_session):
     assert resp_pause.status_code == 204
     assert pause_mock.await_count == 1
     assert pause_mock.await_args.args == (candidate["hash"],)
+
+
+@pytest.mark.anyio
+async def test_finished_downloads_move_to_paginated_history(db_session):
+    from datetime import datetime, timedelta
+
+    from app.services import download_history
+
+    app = FastAPI()
+    app.include_router(downloads_router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = lambda: db_session
+
+    old = datetime.utcnow() - timedelta(days=2)
+    statuses = ["completed", "error:finalize", "downloading", "completed", "error"]
+    for index, status in enumerate(statuses):
+        db_session.add(
+            models.Download(
+                magnet=f"magnet:?xt=urn:btih:{index}",
+                save_path="/music",
+                status=status,
+                created_at=old,
+            )
+        )
+    db_session.commit()
+    # The last one only just finished and stays in the hot table for now.
+    db_session.query(models.Download).filter(models.Download.id < 5).update(
+        {models.Download.updated_at: old}, synchronize_session=False
+    )
+    db_session.commit()
+
+    archived = download_history.archive_finished(
+        db_session, older_than=timedelta(days=1), batch_size=2
+    )
+    assert archived == 3
+    remaining = db_session.query(models.Download).order_by(models.Download.id).all()
+    assert [(d.id, d.status) for d in remaining] == [(3, "downloading"), (5, "error")]
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        listing = await ac.get("/api/v1/downloads")
+        first = await ac.get("/api/v1/downloads/history", params={"limit": 2})
+        second = await ac.get(
+            "/api/v1/downloads/history",
+            params={"limit": 2, "cursor": first.json()["next_cursor"]},
+        )
+        invalid = await ac.get("/api/v1/downloads/history", params={"cursor": "x"})
+
+    assert [item["id"] for item in listing.json()] == [5, 3]
+    page = first.json()
+    assert [(item["download_id"], item["status"]) for item in page["items"]] == [
+        (4, "completed"),
+        (2, "error:finalize"),
+    ]
+    assert page["items"][0]["finished_at"].startswith(old.date().isoformat())
+    assert [item["download_id"] for item in second.json()["items"]] == [1]
+    assert second.json()["next_cursor"] is None
+    assert invalid.status_code == 400
+    assert invalid.json()["detail"] == "invalid_cursor"
+
+
+def test_archiving_a_reused_download_id(db_session):
+    from datetime import datetime, timedelta
+
+    from app.services import download_history
+
+    old = datetime.utcnow() - timedelta(days=2)
+
+    def add_finished() -> int:
+        download = models.Download(
+            magnet="magnet:?xt=urn:btih:reused",
+            save_path="/music",
+            status="completed",
+            created_at=old,
+        )
+        db_session.add(download)
+        db_session.commit()
+        db_session.query(models.Download).filter(
+            models.Download.id == download.id
+        ).update({models.Download.updated_at: old}, synchronize_session=False)
+        db_session.commit()
+        return download.id
+
+    first_id = add_finished()
+    assert download_history.archive_finished(db_session, older_than=timedelta(days=1)) == 1
+    # SQLite hands the id of the deleted newest row out again.
+    second_id = add_finished()
+    assert download_history.archive_finished(db_session, older_than=timedelta(days=1)) == 1
+
+    rows = db_session.query(models.DownloadHistory).order_by(models.DownloadHistory.id).all()
+    assert [row.download_id for row in rows] == [first_id, second_id]
+    assert rows[0].id != rows[1].id
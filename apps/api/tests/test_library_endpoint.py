@@ -1,16 +1,21 @@
+import uuid
+
 import pytest
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 
 from app.api.v1.endpoints import library as library_router
-from app.db.session import get_db
+from app.db import models
+from app.db.session import async_engine
+from app.schemas.ui import ListMutationInput
+from app.services import library as library_service
 
 
 @pytest.mark.anyio
 async def test_library_add_remove_cycle(db_session):
     app = FastAPI()
     app.include_router(library_router.router, prefix="/api/v1")
-    app.dependency_overrides[get_db] = lambda: db_session
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
@@ -51,7 +56,6 @@ async def test_library_add_remove_cycle(db_session):
 async def test_library_playlist_requires_id(db_session):
     app = FastAPI()
     app.include_router(library_router.router, prefix="/api/v1")
-    app.dependency_overrides[get_db] = lambda: db_session
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
@@ -66,3 +70,277 @@ async def test_library_playlist_requires_id(db_session):
 
     assert resp.status_code == 400
     assert resp.json()["detail"] == "playlist_id_required"
+
+
+@pytest.mark.anyio
+async def test_library_summary_limit_and_list_cursor(db_session):
+    app = FastAPI()
+    app.include_router(library_router.router, prefix="/api/v1")
+
+    slug = f"paging-{uuid.uuid4().hex[:8]}"
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for index in range(5):
+            resp = await client.post(
+                "/api/v1/library/list",
+                json={
+                    "action": "add",
+                    "list": "playlist",
+                    "playlist_id": slug,
+                    "playlist_title": "Paging",
+                    "item": {"kind": "movie", "id": f"m{index}", "title": f"M{index}"},
+                },
+            )
+            assert resp.status_code == 200
+
+        resp = await client.get("/api/v1/library", params={"limit": 2})
+        assert resp.status_code == 200
+        playlist = next(p for p in resp.json()["playlists"] if p["id"] == slug)
+        assert [item["id"] for item in playlist["items"]] == ["m4", "m3"]
+        assert playlist["next_cursor"]
+
+        seen = [item["id"] for item in playlist["items"]]
+        cursor = playlist["next_cursor"]
+        while cursor:
+            resp = await client.get(
+                "/api/v1/library/list",
+                params={
+                    "list": "playlist",
+                    "playlist_id": slug,
+                    "limit": 2,
+                    "cursor": cursor,
+                },
+            )
+            assert resp.status_code == 200
+            page = resp.json()
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+        assert seen == ["m4", "m3", "m2", "m1", "m0"]
+
+        resp = await client.get("/api/v1/library")
+        playlist = next(p for p in resp.json()["playlists"] if p["id"] == slug)
+        assert len(playlist["items"]) == 5
+        assert playlist["next_cursor"] is None
+
+        resp = await client.get(
+            "/api/v1/library/list", params={"list": "watchlist", "cursor": "%%%"}
+        )
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "invalid_cursor"
+
+
+def test_library_summary_queries_do_not_grow_with_playlists(db_session):
+    for index in range(3):
+        library_service.apply_mutation(
+            db_session,
+            ListMutationInput(
+                action="add",
+                list="playlist",
+                playlist_id=f"n1-{uuid.uuid4().hex[:8]}",
+                item={"kind": "album", "id": f"a{index}", "title": f"A{index}"},
+            ),
+        )
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        library_service.build_summary(db_session)
+        library_service.build_summary(db_session, limit=1)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 4
+
+
+def test_library_items_share_one_catalog_snapshot(db_session):
+    def _mutation(action, list_name, playlist_id=None, title="Shared"):
+        return ListMutationInput(
+            action=action,
+            list=list_name,
+            playlist_id=playlist_id,
+            item={"kind": "movie", "id": "shared", "title": title},
+        )
+
+    library_service.apply_mutations(
+        db_session,
+        [
+            _mutation("add", "watchlist"),
+            _mutation("add", "favorites"),
+            _mutation("add", "playlist", "one"),
+            _mutation("add", "playlist", "two"),
+        ],
+    )
+    assert db_session.query(models.CatalogItem).count() == 1
+
+    # Updating the item in one list updates it everywhere.
+    library_service.apply_mutation(
+        db_session, _mutation("add", "favorites", title="Shared (4K)")
+    )
+    summary = library_service.build_summary(db_session)
+    titles = [item.title for item in summary.watchlist + summary.favorites]
+    titles += [item.title for playlist in summary.playlists for item in playlist.items]
+    assert titles == ["Shared (4K)"] * 4
+
+    # The snapshot is dropped with the last entry that references it.
+    library_service.apply_mutations(
+        db_session,
+        [
+            _mutation("remove", "watchlist"),
+            _mutation("remove", "favorites"),
+            _mutation("remove", "playlist", "one"),
+        ],
+    )
+    db_session.expire_all()
+    assert library_service.get_catalog_item(db_session, "movie", "shared") is not None
+    library_service.apply_mutation(db_session, _mutation("remove", "playlist", "two"))
+    db_session.expire_all()
+    assert library_service.get_catalog_item(db_session, "movie", "shared") is None
+
+
+@pytest.mark.anyio
+async def test_library_batch_mutations_share_one_transaction(db_session):
+    app = FastAPI()
+    app.include_router(library_router.router, prefix="/api/v1")
+
+    slug = f"batch-{uuid.uuid4().hex[:8]}"
+    marker = uuid.uuid4().hex[:8]
+
+    def _mutation(action, list_name, item_id, **extra):
+        return {
+            "action": action,
+            "list": list_name,
+            "item": {"kind": "movie", "id": f"{marker}-{item_id}", "title": item_id},
+            **extra,
+        }
+
+    commits = []
+
+    def _on_commit(conn):
+        commits.append(conn)
+
+    event.listen(async_engine.sync_engine, "commit", _on_commit)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post(
+            "/api/v1/library/list/batch",
+            json={
+                "mutations": [
+                    _mutation("add", "watchlist", "a"),
+                    _mutation("add", "watchlist", "b"),
+                    _mutation("add", "watchlist", "c"),
+                    _mutation("remove", "watchlist", "c"),
+                    *(
+                        _mutation("add", "playlist", f"p{i}", playlist_id=slug)
+                        for i in range(3)
+                    ),
+                ]
+            },
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {"success": True, "added": 5, "removed": 0}
+        event.remove(async_engine.sync_engine, "commit", _on_commit)
+        assert len(commits) == 1
+
+        # Re-adding updates the stored snapshot instead of duplicating rows.
+        updated = _mutation("add", "watchlist", "a")
+        updated["item"]["title"] = "A (updated)"
+        renamed = _mutation("add", "playlist", "p0", playlist_id=slug)
+        renamed["item"]["title"] = "P0 (updated)"
+        resp = await client.post(
+            "/api/v1/library/list/batch",
+            json={
+                "mutations": [
+                    updated,
+                    renamed,
+                    _mutation("remove", "watchlist", "b"),
+                    _mutation("remove", "playlist", "p2", playlist_id=slug),
+                ]
+            },
+        )
+        assert resp.json() == {"success": True, "added": 2, "removed": 2}
+
+        data = (await client.get("/api/v1/library")).json()
+        watchlist = {
+            item["id"]: item["title"]
+            for item in data["watchlist"]
+            if item["id"].startswith(marker)
+        }
+        assert watchlist == {f"{marker}-a": "A (updated)"}
+        playlist = next(p for p in data["playlists"] if p["id"] == slug)
+        assert sorted(item["title"] for item in playlist["items"]) == [
+            "P0 (updated)",
+            "p1",
+        ]
+
+        resp = await client.post(
+            "/api/v1/library/list/batch",
+            json={
+                "mutations": [
+                    _mutation("add", "watchlist", "d"),
+                    _mutation("add", "playlist", "e"),
+                ]
+            },
+        )
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "playlist_id_required"
+        data = (await client.get("/api/v1/library")).json()
+        assert f"{marker}-d" not in {item["id"] for item in data["watchlist"]}
+
+
+@pytest.mark.anyio
+async def test_library_search_ranks_and_pages(db_session):
+    items = [
+        {"kind": "movie", "id": "br", "title": "Blade Runner", "genres": ["Sci-Fi"]},
+        {"kind": "movie", "id": "br49", "title": "Blade Runner 2049", "genres": ["Sci-Fi"]},
+        {"kind": "movie", "id": "runner", "title": "The Runner", "subtitle": "Blade"},
+        {"kind": "album", "id": "ok", "title": "OK Computer", "genres": ["Rock"]},
+    ]
+    library_service.apply_mutations(
+        db_session,
+        [
+            ListMutationInput(action="add", list=list_name, item=item)
+            for item in items
+            for list_name in ("watchlist", "favorites")
+        ],
+    )
+
+    app = FastAPI()
+    app.include_router(library_router.router, prefix="/api/v1")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(
+            "/api/v1/library/search", params={"q": "blade runner", "limit": 2}
+        )
+        assert resp.status_code == 200
+        first = resp.json()
+        # Title matches rank first and every item appears once.
+        assert [item["id"] for item in first["items"]] == ["br", "br49"]
+        assert first["next_cursor"]
+
+        resp = await client.get(
+            "/api/v1/library/search",
+            params={"q": "blade runner", "limit": 2, "cursor": first["next_cursor"]},
+        )
+        second = resp.json()
+        assert [item["id"] for item in second["items"]] == ["runner"]
+        assert second["next_cursor"] is None
+
+        resp = await client.get(
+            "/api/v1/library/search", params={"q": "sci-fi", "kind": "movie"}
+        )
+        assert {item["id"] for item in resp.json()["items"]} == {"br", "br49"}
+
+        resp = await client.get("/api/v1/library/search", params={"q": "rock"})
+        assert [item["title"] for item in resp.json()["items"]] == ["OK Computer"]
+
+        resp = await client.get(
+            "/api/v1/library/search", params={"q": "blade", "cursor": "nope"}
+        )
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "invalid_cursor"
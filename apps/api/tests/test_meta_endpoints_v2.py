@@ -1,8 +1,11 @@
+import json
+
 import pytest
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 
 from app.api.v1.endpoints import meta as meta_endpoints
+from app.services.metadata.router import MetadataRouter
 
 
 class DummyMetadataClient:
@@ -218,3 +221,50 @@ async def test_meta_detail_album_includes_tracks(monkeypatch):
     assert detail["album"]["artist"] == "Vangelis"
     assert len(detail["album"]["tracklist"]) == 2
     assert detail["canonical"]["query"].startswith("Vangelis - Blade Runner")
+
+
+@pytest.mark.anyio
+async def test_meta_lookup_batch_streams_deduplicated_cards(monkeypatch):
+    class CountingMetadataClient(DummyMetadataClient):
+        def __init__(self) -> None:
+            self.paths: list[str] = []
+
+        async def tmdb(
+            self, path: str, params: dict | None = None, request_id: str | None = None
+        ):
+            self.paths.append(path)
+            return await super().tmdb(path, params=params, request_id=request_id)
+
+    metadata = CountingMetadataClient()
+    router_service = MetadataRouter(
+        metadata_client=metadata,  # type: ignore[arg-type]
+        omdb_client=None,
+        musicbrainz_client=None,
+        discogs_client=None,
+    )
+    monkeypatch.setattr(meta_endpoints, "get_metadata_router", lambda: router_service)
+
+    app = FastAPI()
+    app.include_router(meta_endpoints.router, prefix="/meta")
+
+    body = {
+        "items": [
+            {"title": "Blade Runner 1982", "hint": "movie"},
+            {"title": "blade runner 1982", "hint": "movie"},
+            {"title": "Some Release", "hint": "other"},
+        ]
+    }
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post("/meta/lookup/batch", json=body)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+    by_index = {line["index"]: line for line in lines}
+    assert by_index[0]["card"]["ids"]["tmdb_id"] == 101
+    assert by_index[1]["card"]["ids"]["tmdb_id"] == 101
+    assert by_index[2]["card"]["media_type"] == "other"
+    assert metadata.paths.count("search/movie") == 1
@@ -10,3 +10,13 @@ def test_classify_torrent_returns_classification_instance():
     assert result.type == "other"
     assert result.confidence == 0.0
     assert result.reasons == []
+
+
+def test_classify_many_preserves_order_and_reuses_duplicates():
+    classifier = Classifier()
+    titles = ["Artist - Album (2020) FLAC", "Show S01E02 1080p", "Artist - Album (2020) FLAC"]
+
+    results = classifier.classify_many(titles)
+
+    assert [result.type for result in results] == ["music", "tv", "music"]
+    assert results[0] is results[2]
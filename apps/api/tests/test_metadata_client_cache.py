@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from app.services.metadata import metadata_client as metadata_module
+from app.services.metadata.metadata_client import MetadataClient
+
+
+@pytest.fixture
+def tmdb_key(monkeypatch):
+    original = metadata_module.runtime_integration_settings.get
+
+    def fake_get(key: str):
+        if key == "tmdb.api_key":
+            return "test-key"
+        return original(key)
+
+    monkeypatch.setattr(metadata_module.runtime_integration_settings, "get", fake_get)
+
+
+def _install_transport(monkeypatch, handler) -> None:
+    real_client = httpx.AsyncClient
+
+    def factory(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
+
+    monkeypatch.setattr(metadata_module.httpx, "AsyncClient", factory)
+
+
+@pytest.mark.anyio
+async def test_tmdb_revalidates_with_etag_and_reuses_payload_on_304(monkeypatch, tmdb_key):
+    seen_headers: list[dict[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"Cache-Control": "max-age=60"})
+        return httpx.Response(
+            200,
+            json={"id": 7, "title": "Heat"},
+            headers={"ETag": '"v1"', "Cache-Control": "max-age=0"},
+        )
+
+    _install_transport(monkeypatch, handler)
+    client = MetadataClient()
+
+    first = await client.tmdb("movie/7", params={"language": "en-US"})
+    second = await client.tmdb("movie/7", params={"language": "en-US"})
+    third = await client.tmdb("movie/7", params={"language": "en-US"})
+
+    assert first == {"id": 7, "title": "Heat"}
+    assert second is first
+    assert third is first
+    assert len(seen_headers) == 2
+    assert "if-none-match" not in seen_headers[0]
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+
+
+@pytest.mark.anyio
+async def test_tmdb_refetches_when_validator_does_not_match(monkeypatch, tmdb_key):
+    versions = iter(['"v1"', '"v2"'])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        etag = next(versions)
+        return httpx.Response(
+            200,
+            json={"etag": etag},
+            headers={"ETag": etag, "Cache-Control": "no-cache"},
+        )
+
+    _install_transport(monkeypatch, handler)
+    client = MetadataClient()
+
+    first = await client.tmdb("movie/8")
+    second = await client.tmdb("movie/8")
+
+    assert first["etag"] == '"v1"'
+    assert second["etag"] == '"v2"'
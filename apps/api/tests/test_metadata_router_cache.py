@@ -0,0 +1,113 @@
+import pytest
+
+from app.schemas.media import Classification
+from app.services.metadata.router import (
+    TMDB_SECTIONS,
+    MetadataRouter,
+    normalise_sections,
+)
+from app.services.metadata.snapshot import FrozenDict, thaw
+
+
+class CountingMetadataClient:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.appended: list[str | None] = []
+
+    async def tmdb(self, path: str, params: dict | None = None, request_id: str | None = None):
+        self.calls.append(path)
+        if path == "search/movie":
+            return {"results": [{"id": 7, "title": "Heat", "release_date": "1995-12-15"}]}
+        append = (params or {}).get("append_to_response")
+        self.appended.append(append)
+        sections = {
+            "external_ids": {"imdb_id": "tt0113277"},
+            "credits": {"cast": [{"name": "Al Pacino"}]},
+            "similar": {"results": [{"id": 8, "title": "Thief"}]},
+        }
+        payload = {
+            "id": 7,
+            "title": "Heat",
+            "release_date": "1995-12-15",
+            "poster_path": "/heat.jpg",
+        }
+        for name in (append or "").split(","):
+            if name in sections:
+                payload[name] = sections[name]
+        return payload
+
+
+def _router(client: CountingMetadataClient) -> MetadataRouter:
+    return MetadataRouter(
+        metadata_client=client,  # type: ignore[arg-type]
+        omdb_client=None,
+        musicbrainz_client=None,
+        discogs_client=None,
+    )
+
+
+@pytest.mark.anyio
+async def test_enrich_cache_hit_shares_frozen_snapshot():
+    client = CountingMetadataClient()
+    router = _router(client)
+    classification = Classification(type="movie", confidence=0.9)
+
+    first = await router.enrich(classification, "Heat 1995")
+    second = await router.enrich(classification, "Heat 1995")
+
+    assert client.calls == ["search/movie", "movie/7"]
+    assert first is not second
+    assert first.details is second.details
+    assert isinstance(second.details, FrozenDict)
+    assert second.model_dump()["ids"]["imdb_id"] == "tt0113277"
+
+
+@pytest.mark.anyio
+async def test_enrich_views_do_not_leak_mutations_into_cache():
+    router = _router(CountingMetadataClient())
+    classification = Classification(type="movie", confidence=0.9)
+
+    card = await router.enrich(classification, "Heat 1995")
+    with pytest.raises(TypeError):
+        card.details["tmdb"]["title"] = "Changed"
+
+    card.title = "Edited"
+    details = thaw(card.details)
+    details["tmdb"]["title"] = "Changed"
+    card.details = details
+
+    again = await router.enrich(classification, "Heat 1995")
+    assert again.title == "Heat"
+    assert again.details["tmdb"]["title"] == "Heat"
+
+
+@pytest.mark.anyio
+async def test_enrich_fetches_only_missing_tmdb_sections():
+    client = CountingMetadataClient()
+    router = _router(client)
+    classification = Classification(type="movie", confidence=0.9)
+
+    light = await router.enrich(classification, "Heat 1995", sections=())
+    assert client.appended == ["external_ids"]
+    assert light.ids["imdb_id"] == "tt0113277"
+    assert "credits" not in light.details["tmdb"]["extra"]["tmdb"]
+
+    full = await router.enrich(
+        classification, "Heat 1995", sections=("credits", "similar")
+    )
+    assert client.appended == ["external_ids", "credits,similar"]
+    extra = full.details["tmdb"]["extra"]["tmdb"]
+    assert extra["credits"]["cast"][0]["name"] == "Al Pacino"
+    assert extra["similar"]["results"][0]["title"] == "Thief"
+
+    # Every section is cached now, so a different projection needs no detail call.
+    again = await router.enrich(classification, "Heat 1995", sections=("credits",))
+    assert client.appended == ["external_ids", "credits,similar"]
+    assert "similar" not in again.details["tmdb"]["extra"]["tmdb"]
+
+
+def test_normalise_sections_rejects_unknown_names():
+    assert normalise_sections(None) == TMDB_SECTIONS
+    assert normalise_sections(["similar", ""]) == ("external_ids", "similar")
+    with pytest.raises(ValueError):
+        normalise_sections(["trailers"])
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[1] / "alembic"
+
+
+@pytest.fixture
+def migrate(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    # No ini file: alembic.ini's logging setup would reconfigure pytest's.
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    engine = create_engine(url)
+    yield config, engine
+    engine.dispose()
+
+
+def _index_sql(engine, name: str) -> str:
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = :name"),
+            {"name": name},
+        ).scalar_one()
+
+
+def test_download_history_migration_keeps_existing_downloads(migrate):
+    config, engine = migrate
+    command.upgrade(config, "8c3e5a91d2f4")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO downloads (id, magnet, save_path, status, progress, eta) "
+                "VALUES (1, 'magnet:?xt=urn:btih:1', '/music', 'completed', 1.0, 0), "
+                "(2, 'magnet:?xt=urn:btih:2', '/music', 'downloading', 0.5, 60)"
+            )
+        )
+
+    command.upgrade(config, "5f7b2c8e41a9")
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT id, status, updated_at FROM downloads ORDER BY id")
+        ).all()
+    assert [(row.id, row.status) for row in rows] == [(1, "completed"), (2, "downloading")]
+    assert all(row.updated_at is not None for row in rows)
+    assert "download_history" in inspect(engine).get_table_names()
+    # The table rebuild keeps the partial index of 8c3e5a91d2f4.
+    assert "WHERE status IN" in _index_sql(engine, "ix_downloads_active_status")
+
+    command.downgrade(config, "8c3e5a91d2f4")
+
+    inspector = inspect(engine)
+    assert "download_history" not in inspector.get_table_names()
+    assert "updated_at" not in {col["name"] for col in inspector.get_columns("downloads")}
+    with engine.connect() as conn:
+        ids = conn.execute(text("SELECT id FROM downloads ORDER BY id")).scalars().all()
+    assert ids == [1, 2]
+
+
+def test_catalog_items_migration_keeps_library_index_order(migrate):
+    config, engine = migrate
+    expected = {
+        "ix_library_entries_list_order": "(list_type, playlist_slug, created_at DESC, id DESC)",
+        "ix_library_entries_item_recent": "(item_kind, item_id, created_at DESC)",
+    }
+
+    command.upgrade(config, "head")
+    for name, columns in expected.items():
+        assert _index_sql(engine, name).endswith(columns)
+
+    command.downgrade(config, "5f7b2c8e41a9")
+    for name, columns in expected.items():
+        assert _index_sql(engine, name).endswith(columns)
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import httpx
 import pytest
 
 from app.services.metadata.metadata_client import MetadataProxyError
-from app.services.metadata.providers.musicbrainz import MusicBrainzClient
+from app.services.metadata.providers import musicbrainz as musicbrainz_module
+from app.services.metadata.providers.musicbrainz import (
+    MusicBrainzClient,
+    MusicBrainzUnavailableError,
+)
 
 
 class DummyMetadataClient:
@@ -69,5 +74,37 @@ async def test_musicbrainz_client_handles_proxy_error() -> None:
         metadata_client=ErrorMetadataClient(),  # type: ignore[arg-type]
     )
 
-    result = await client.lookup_release_group(artist="Radiohead", album="In Rainbows")
-    assert result is None
+    with pytest.raises(MusicBrainzUnavailableError) as excinfo:
+        await client.lookup_release_group(artist="Radiohead", album="In Rainbows")
+    assert str(excinfo.value) == "MusicBrainz unavailable (503) for release-group"
+    assert excinfo.value.reason == 503
+
+
+@pytest.mark.anyio
+async def test_musicbrainz_client_backs_off_on_throttling(monkeypatch) -> None:
+    real_client = httpx.AsyncClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, headers={"Retry-After": "4"})
+
+    def factory(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
+
+    backoffs: list[tuple[str, float]] = []
+
+    async def _acquire(target, **kwargs):
+        return None
+
+    async def _backoff(target, seconds):
+        backoffs.append((target, seconds))
+
+    monkeypatch.setattr(musicbrainz_module.httpx, "AsyncClient", factory)
+    monkeypatch.setattr(musicbrainz_module.rate_limiter, "acquire", _acquire)
+    monkeypatch.setattr(musicbrainz_module.rate_limiter, "backoff", _backoff)
+
+    client = MusicBrainzClient(user_agent="TestAgent/1.0")
+    with pytest.raises(MusicBrainzUnavailableError):
+        await client.lookup_release_group(artist="Radiohead", album="In Rainbows")
+
+    assert backoffs == [("https://musicbrainz.org/ws/2/release-group", 4.0)]
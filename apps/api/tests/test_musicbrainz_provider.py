@@ -31,20 +31,16 @@ async def test_musicbrainz_provider_uses_musicbrainz_api(
         def __init__(
             self, *args, **kwargs
         ) -> None:  # noqa: D401 - mimic httpx.AsyncClient
-            calls["headers"] = kwargs.get("headers")
+            pass
 
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb):
-            return False
-
-        async def get(self, url: str, params=None):
+        async def get(self, url: str, params=None, headers=None, timeout=None):
             calls["url"] = url
             calls["params"] = params
+            calls["headers"] = headers
             return DummyResponse()
 
-    monkeypatch.setattr(module.httpx, "AsyncClient", DummyAsyncClient)
+    module.http.reset()
+    monkeypatch.setattr(module.http.httpx, "AsyncClient", DummyAsyncClient)
 
     provider = module.MusicBrainzProvider()
     await provider.search_albums(query="Test", limit=1)
@@ -52,3 +48,5 @@ async def test_musicbrainz_provider_uses_musicbrainz_api(
     assert calls["url"] == "https://musicbrainz.org/ws/2/release-group"
     assert isinstance(calls["params"], dict)
     assert calls["params"]["fmt"] == "json"
+    assert calls["headers"]["User-Agent"] == "TestAgent/1.0"
+    module.http.reset()
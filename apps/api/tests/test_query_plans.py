@@ -0,0 +1,111 @@
+"""Guard the hot queries against falling back to full table scans."""
+
+from __future__ import annotations
+
+import re
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from app.db import models
+from app.schemas.ui import ListMutationInput
+from app.services import library as library_service
+
+from ._testenv import engine
+
+# SQLite reports a full scan as "SCAN <table>" without "USING ... INDEX".
+_FULL_SCAN = re.compile(r"^SCAN (downloads|library_entries|catalog_items)$")
+
+
+def _capture(run) -> list[tuple[str, tuple]]:
+    statements: list[tuple[str, tuple]] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "DELETE")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    assert statements
+    return statements
+
+
+def _full_scans(statements: list[tuple[str, tuple]]) -> list[str]:
+    scans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            scans.extend(
+                f"{row[3]} <- {statement}" for row in plan if _FULL_SCAN.match(row[3])
+            )
+    return scans
+
+
+def test_active_downloads_use_partial_index(db_session):
+    db_session.add_all(
+        [
+            models.Download(magnet="magnet:?xt=1", save_path="/d", status="downloading"),
+            models.Download(magnet="magnet:?xt=2", save_path="/d", status="completed"),
+        ]
+    )
+    db_session.commit()
+
+    statements = _capture(
+        lambda: db_session.query(models.Download)
+        .filter(models.ACTIVE_DOWNLOAD_FILTER)
+        .all()
+    )
+    assert _full_scans(statements) == []
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statements[0][0]}").all()
+    assert any("ix_downloads_active_status" in row[3] for row in plan)
+
+
+def test_library_lookups_use_indexes(db_session):
+    mutations = [
+        ListMutationInput(
+            action="add",
+            list=list_name,
+            playlist_id="mix" if list_name == "playlist" else None,
+            item={"kind": "movie", "id": f"m{index}", "title": f"M{index}"},
+        )
+        for list_name in ("watchlist", "playlist")
+        for index in range(3)
+    ]
+    library_service.apply_mutations(db_session, mutations)
+
+    def _run() -> None:
+        library_service.get_catalog_item(db_session, "movie", "m1")
+        page = library_service.list_page(db_session, "playlist", playlist_slug="mix", limit=2)
+        library_service.list_page(
+            db_session, "playlist", playlist_slug="mix", limit=2, cursor=page.next_cursor
+        )
+        library_service.list_page(db_session, "watchlist", limit=2)
+        library_service.apply_mutations(
+            db_session,
+            [
+                mutations[0],
+                mutations[3],
+                ListMutationInput(
+                    action="remove",
+                    list="watchlist",
+                    item={"kind": "movie", "id": "m2"},
+                ),
+            ],
+        )
+
+    assert _full_scans(_capture(_run)) == []
+
+
+def test_postgres_search_uses_indexed_expressions():
+    stmt = library_service._search_statement("postgresql", ["blade", "runner"], None)
+    sql = str(stmt.compile(dialect=postgresql.dialect(paramstyle="named")))
+
+    # Postgres only uses an expression index for the same expression.
+    assert f"to_tsvector('{models.SEARCH_CONFIG}', catalog_items.search_text) @@" in sql
+    assert "<% catalog_items.search_text" in sql
+    indexes = {index.name for index in models.CatalogItem.__table__.indexes}
+    assert {"ix_catalog_items_search_tsv", "ix_catalog_items_search_trgm"} <= indexes
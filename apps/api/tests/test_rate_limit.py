@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.rate_limit import (
+    _BACKOFF_SCRIPT,
+    _TAKE_SCRIPT,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    RateLimitBudget,
+    RateLimiter,
+)
+
+
+def _limiter(rate: float = 20.0, burst: int = 1) -> RateLimiter:
+    budget = RateLimitBudget("musicbrainz.org", rate, burst=burst)
+    limiter = RateLimiter(
+        {budget.host: budget}, redis_url="redis://127.0.0.1:1/0", enabled=True
+    )
+    # Skip the Redis round-trip entirely; the in-process bucket is under test.
+    limiter._redis.down_until = float("inf")
+    return limiter
+
+
+def test_budget_lookup_accepts_urls_and_hosts():
+    limiter = _limiter()
+    assert limiter.budget_for("https://musicbrainz.org/ws/2/release-group") is not None
+    assert limiter.budget_for("musicbrainz.org") is not None
+    assert limiter.budget_for("https://api.deezer.com/chart") is None
+
+
+@pytest.mark.anyio
+async def test_acquire_spaces_requests_by_rate():
+    limiter = _limiter(rate=20.0)
+    started = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire("https://musicbrainz.org/ws/2/artist")
+    assert time.monotonic() - started >= 0.09
+
+
+@pytest.mark.anyio
+async def test_waiters_are_served_by_priority():
+    limiter = _limiter(rate=50.0)
+    await limiter.acquire("musicbrainz.org")
+    order: list[str] = []
+
+    async def worker(name: str, priority: int) -> None:
+        await limiter.acquire("musicbrainz.org", priority=priority)
+        order.append(name)
+
+    first = asyncio.create_task(worker("first", PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+    await asyncio.gather(
+        first,
+        worker("background", PRIORITY_BACKGROUND),
+        worker("interactive", PRIORITY_INTERACTIVE),
+    )
+    assert order == ["first", "interactive", "background"]
+
+
+@pytest.mark.anyio
+async def test_backoff_delays_subsequent_requests():
+    limiter = _limiter(rate=100.0, burst=5)
+    await limiter.backoff("musicbrainz.org", 0.1)
+    started = time.monotonic()
+    await limiter.acquire("musicbrainz.org")
+    assert time.monotonic() - started >= 0.09
+
+
+def test_disabled_limiter_is_a_no_op():
+    limiter = _limiter(rate=0.5)
+    limiter.enabled = False
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire_sync("musicbrainz.org")
+    assert time.monotonic() - started < 0.1
+
+
+@pytest.fixture
+def lua_redis():
+    """In-memory Redis that runs the token bucket scripts (needs ``lupa``)."""
+
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeRedis()
+    yield client
+    client.close()
+
+
+def _take(client, budget: RateLimitBudget) -> float:
+    return float(client.eval(_TAKE_SCRIPT, 1, budget.key, budget.rate, budget.burst))
+
+
+def test_take_script_grants_the_burst_then_returns_the_wait(lua_redis):
+    budget = RateLimitBudget("musicbrainz.org", 10.0, burst=2)
+
+    assert _take(lua_redis, budget) == 0
+    assert _take(lua_redis, budget) == 0
+    wait = _take(lua_redis, budget)
+
+    # One token refills every 0.1s; a few ms may have passed since the burst.
+    assert 0.05 < wait <= 0.1
+    # Expires once the bucket would have refilled: ceil(2 / 10) + 1 seconds.
+    assert 0 < lua_redis.ttl(budget.key) <= 2
+
+
+def test_backoff_script_drains_the_bucket_for_every_caller(lua_redis):
+    budget = RateLimitBudget("musicbrainz.org", 10.0, burst=5)
+
+    tokens = float(
+        lua_redis.eval(_BACKOFF_SCRIPT, 1, budget.key, budget.rate, budget.burst, 2)
+    )
+
+    assert tokens == pytest.approx(-20.0)
+    assert float(lua_redis.hget(budget.key, "tokens")) == pytest.approx(-20.0)
+    # Refilling 25 tokens at 10/s takes 2.5s: ceil(2.5) + 1 seconds.
+    assert 3 <= lua_redis.ttl(budget.key) <= 4
+    # The full burst is gone, and the next token is ~2.1s away.
+    assert _take(lua_redis, budget) == pytest.approx(2.1, abs=0.05)
+
+
+def test_backoff_script_keeps_a_longer_drain(lua_redis):
+    budget = RateLimitBudget("musicbrainz.org", 10.0, burst=5)
+    args = (1, budget.key, budget.rate, budget.burst)
+
+    lua_redis.eval(_BACKOFF_SCRIPT, *args, 5)
+    tokens = float(lua_redis.eval(_BACKOFF_SCRIPT, *args, 1))
+
+    assert tokens == pytest.approx(-50.0, abs=0.5)
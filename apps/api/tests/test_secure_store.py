@@ -63,3 +63,71 @@ def test_store_path_env_fallback(monkeypatch, tmp_path):
 
     reloaded = secure_store.SecretsStore(secure_store.EncryptedKeyStore(secret="test-secret", path=secure_store._default_store_path()))
     assert reloaded.get("tmdb.api_key") == "abc1234567890123"
+
+
+def _count_calls(monkeypatch, name):
+    calls = []
+    original = getattr(EncryptedKeyStore, name)
+
+    def wrapper(self, *args, **kwargs):
+        calls.append(args)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(EncryptedKeyStore, name, wrapper)
+    return calls
+
+
+def test_secrets_store_reuses_decrypted_snapshot(monkeypatch, tmp_path):
+    path = tmp_path / "secrets.json.enc"
+    store = SecretsStore(EncryptedKeyStore(secret="test-secret", path=path))
+    store.set("lastfm", "abc123")
+    loads = _count_calls(monkeypatch, "load")
+
+    for _ in range(5):
+        assert store.get("lastfm") == "abc123"
+    assert store.list_configured() == ["lastfm"]
+    assert loads == []
+
+    # A write through another instance (or process) replaces the file.
+    other = SecretsStore(EncryptedKeyStore(secret="test-secret", path=path))
+    other.set("lastfm", "changed")
+    assert store.get("lastfm") == "changed"
+    assert len(loads) == 2
+
+
+def test_secrets_store_batches_writes(monkeypatch, tmp_path):
+    path = tmp_path / "secrets.json.enc"
+    store = SecretsStore(EncryptedKeyStore(secret="test-secret", path=path))
+    saves = _count_calls(monkeypatch, "save")
+
+    with store.batch():
+        store.set("a", "1")
+        store.set("b", "2")
+        store.set_many({"c": "3", "a": None})
+        store.save_section("integrations", {"tmdb": "x"})
+        assert store.get("c") == "3"
+    assert len(saves) == 1
+
+    store.set("b", "2")
+    store.set_many({"missing": None})
+    assert len(saves) == 1
+
+    reloaded = SecretsStore(EncryptedKeyStore(secret="test-secret", path=path))
+    assert reloaded.get("a") is None
+    assert reloaded.get("b") == "2"
+    assert reloaded.load_section("integrations") == {"tmdb": "x"}
+
+
+def test_secrets_store_batch_discards_changes_on_error(tmp_path):
+    path = tmp_path / "secrets.json.enc"
+    store = SecretsStore(EncryptedKeyStore(secret="test-secret", path=path))
+    store.set("a", "1")
+
+    try:
+        with store.batch():
+            store.set("a", "2")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert store.get("a") == "1"
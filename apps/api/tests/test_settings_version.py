@@ -0,0 +1,216 @@
+import queue
+import threading
+
+from app.core import settings_version
+from app.core.redis import OptionalRedis
+from app.core.runtime_service_settings import RuntimeServiceSettings
+from app.core.runtime_settings import RuntimeProviderSettings
+from app.core.secure_store import EncryptedKeyStore, SecretsStore
+
+
+def _store(path):
+    return SecretsStore(EncryptedKeyStore(secret="secret", path=path))
+
+
+class _FakePubSub:
+    def __init__(self, messages: "queue.Queue[dict]") -> None:
+        self._messages = messages
+        self.channels: list[str] = []
+
+    def subscribe(self, channel: str) -> None:
+        self.channels.append(channel)
+
+    def get_message(self, timeout: float = 0.0):
+        try:
+            return self._messages.get(timeout=min(timeout, 0.05))
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        return None
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.version = 0
+        self.messages: "queue.Queue[dict]" = queue.Queue()
+
+    def incr(self, key: str) -> int:
+        assert key == settings_version.VERSION_KEY
+        self.version += 1
+        return self.version
+
+    def publish(self, channel: str, version: int) -> None:
+        assert channel == settings_version.CHANNEL
+        self.messages.put({"type": "message", "data": str(version).encode()})
+
+    def get(self, key: str):
+        return str(self.version).encode()
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> _FakePubSub:
+        return _FakePubSub(self.messages)
+
+    def close(self) -> None:
+        return None
+
+
+def _publisher(client) -> OptionalRedis:
+    publisher = OptionalRedis("settings publisher", "redis://unused")
+    publisher.sync_client = lambda: client  # type: ignore[method-assign]
+    return publisher
+
+
+def test_listener_reloads_once_per_bump(monkeypatch):
+    reloads: list[int] = []
+    monkeypatch.setattr(settings_version, "_reloaders", [lambda: reloads.append(1)])
+    listener = settings_version.SettingsVersionListener(redis_url="redis://unused")
+
+    assert listener.handle_version(b"3") is True
+    assert listener.handle_version(b"3") is False
+    assert listener.handle_version("garbage") is False
+    assert listener.handle_version(4) is True
+    assert len(reloads) == 2
+    # A resubscribe reloads even when nothing was published meanwhile.
+    assert listener.handle_version(4, force=True) is True
+    assert len(reloads) == 3
+
+
+def test_published_bumps_reach_the_listener(monkeypatch):
+    fake = _FakeRedis()
+    fake.version = 7
+    reloaded = threading.Event()
+    calls: list[int] = []
+
+    def _reload() -> None:
+        calls.append(1)
+        if len(calls) == 2:
+            reloaded.set()
+
+    monkeypatch.setattr(settings_version, "_reloaders", [_reload])
+    monkeypatch.setattr(settings_version, "connect", lambda *a, **k: fake)
+    monkeypatch.setattr(settings_version, "_publisher", _publisher(fake))
+    monkeypatch.setattr(settings_version, "_pending_publish", False)
+
+    listener = settings_version.SettingsVersionListener(redis_url="redis://unused")
+    listener.start()
+    try:
+        # The catch-up read on subscribe applies version 7 once...
+        for _ in range(100):
+            if listener.subscribed and calls:
+                break
+            threading.Event().wait(0.01)
+        assert listener.subscribed
+        # ...and every later bump triggers exactly one more reload.
+        assert settings_version.publish_change() == 8
+        assert reloaded.wait(2)
+    finally:
+        listener.stop()
+    assert len(calls) == 2
+    assert not listener.subscribed
+
+
+def test_publish_change_is_best_effort(monkeypatch):
+    class _Down:
+        def __init__(self) -> None:
+            self.attempts = 0
+
+        def incr(self, key):
+            self.attempts += 1
+            raise ConnectionError("redis down")
+
+    down = _Down()
+    monkeypatch.setattr(settings_version, "_publisher", _publisher(down))
+    monkeypatch.setattr(settings_version, "_pending_publish", False)
+
+    assert settings_version.publish_change() is None
+    # Further writes skip Redis until the retry window passes...
+    assert settings_version.publish_change() is None
+    assert down.attempts == 1
+
+    # ...but the bump is kept and sent once Redis answers again.
+    fake = _FakeRedis()
+    monkeypatch.setattr(settings_version, "_publisher", _publisher(fake))
+    assert settings_version._flush_pending_publish() == 1
+    assert settings_version._flush_pending_publish() is None
+    assert fake.messages.get_nowait()["data"] == b"1"
+    assert fake.messages.empty()
+
+
+def test_listener_flushes_pending_bump_and_reloads_on_subscribe(monkeypatch):
+    fake = _FakeRedis()
+    fake.version = 7
+    calls: list[int] = []
+    reloaded = threading.Event()
+
+    def _reload() -> None:
+        calls.append(1)
+        reloaded.set()
+
+    monkeypatch.setattr(settings_version, "_reloaders", [_reload])
+    monkeypatch.setattr(settings_version, "connect", lambda *a, **k: fake)
+    monkeypatch.setattr(settings_version, "_publisher", _publisher(fake))
+    # A write made while Redis was unreachable left its bump unpublished.
+    monkeypatch.setattr(settings_version, "_pending_publish", True)
+
+    listener = settings_version.SettingsVersionListener(redis_url="redis://unused")
+    listener._version = 7
+    listener.start()
+    try:
+        assert reloaded.wait(2)
+        for _ in range(20):
+            threading.Event().wait(0.01)
+    finally:
+        listener.stop()
+    assert fake.version == 8
+    assert not settings_version._pending_publish
+    # The forced catch-up applied version 8; its message does not reload again.
+    assert len(calls) == 1
+
+
+def test_writers_publish_and_readers_reload(monkeypatch, tmp_path):
+    published: list[int] = []
+    monkeypatch.setattr(
+        settings_version, "publish_change", lambda: published.append(1) or len(published)
+    )
+    path = tmp_path / "secrets.json.enc"
+
+    writer = RuntimeProviderSettings(store=_store(path))
+    reader = RuntimeProviderSettings(store=_store(path))
+    assert writer.update_many({"lastfm": "alpha", "discogs": "beta"}) is True
+    assert writer.update_many({"lastfm": "alpha"}) is False
+    assert published == [1]
+
+    assert reader.get("lastfm") != "alpha"
+    reader.reload_from_store()
+    assert reader.get("lastfm") == "alpha"
+    assert reader.get("discogs") == "beta"
+
+    service_writer = RuntimeServiceSettings(store=_store(path))
+    service_reader = RuntimeServiceSettings(store=_store(path))
+    assert service_writer.update_qbittorrent(url="http://qb:9090", password="pw") is True
+    assert service_writer.update_prowlarr(api_key="new-key") is True
+    assert len(published) == 3
+
+    service_reader.reload_from_store()
+    assert service_reader.qbittorrent_snapshot().url == "http://qb:9090"
+    assert service_reader.prowlarr_snapshot().api_key == "new-key"
+
+
+def test_hot_paths_skip_the_store_while_listening(monkeypatch, tmp_path):
+    runtime = RuntimeServiceSettings(store=_store(tmp_path / "secrets.json.enc"))
+    reads: list[str] = []
+    original_get = SecretsStore.get
+
+    def _counting_get(self, key):
+        reads.append(key)
+        return original_get(self, key)
+
+    monkeypatch.setattr(SecretsStore, "get", _counting_get)
+    monkeypatch.setattr(settings_version, "is_listening", lambda: True)
+    runtime.qbittorrent_snapshot()
+    runtime.prowlarr_settings()
+    assert reads == []
+
+    monkeypatch.setattr(settings_version, "is_listening", lambda: False)
+    runtime.qbittorrent_snapshot()
+    assert reads